@@ -0,0 +1,77 @@
+"""
+Análisis de features: importancia por permutación y eliminación hacia atrás en paralelo.
+
+Uso: python scripts/analyze_features.py --workers 4 --candidates 8
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.evaluation.feature_analysis import FeatureAnalyzer, SCORES
+from src.features.matrix_cache import load_training_matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ranking de features y subconjunto mínimo recomendado")
+    parser.add_argument("--data", default="data/processed/games_with_features.parquet", help="Histórico con features")
+    parser.add_argument("--test-size", type=float, default=0.2, help="Fracción final (temporal) de holdout (default: 0.2)")
+    parser.add_argument("--repeats", type=int, default=5, help="Permutaciones por feature (default: 5)")
+    parser.add_argument("--tolerance", type=float, default=0.002,
+                        help="Empeoramiento relativo medio admitido al eliminar (default: 0.002 = 0.2%%)")
+    parser.add_argument("--min-features", type=int, default=1, help="Mínimo de features a conservar (default: 1)")
+    parser.add_argument("--candidates", type=int, default=None,
+                        help="Por paso, probar solo las N features menos importantes (default: todas)")
+    parser.add_argument("--rounds", type=int, default=None, help="Árboles por modelo durante el análisis (default: los del predictor)")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos en paralelo (default: todos los núcleos)")
+    parser.add_argument("--cache-dir", default="data/cache/matrices",
+                        help="Caché de matrices de entrenamiento (default: data/cache/matrices)")
+    parser.add_argument("--no-cache", action="store_true", help="Preparar la matriz en memoria sin usar la caché")
+    parser.add_argument("--work-dir", default=None,
+                        help="Directorio para la matriz compartida si no se usa la caché (default: temporal)")
+    parser.add_argument("--report", default="data/processed/feature_analysis.parquet", help="Ranking de features (Parquet)")
+    parser.add_argument("--output", default="models/recommended_features.json", help="Lista recomendada (JSON)")
+    args = parser.parse_args()
+
+    if not Path(args.data).exists():
+        print(f"❌ No se encontró: {args.data}")
+        return 1
+
+    print("=" * 60)
+    print("🔬 ANÁLISIS DE FEATURES")
+    print("=" * 60)
+
+    matrix = load_training_matrix(args.data, cache_dir=None if args.no_cache else args.cache_dir)
+    analyzer = FeatureAnalyzer(
+        test_size=args.test_size,
+        n_repeats=args.repeats,
+        tolerance=args.tolerance,
+        min_features=args.min_features,
+        candidates=args.candidates,
+        n_estimators=args.rounds,
+        n_workers=args.workers,
+        work_dir=args.work_dir
+    )
+    report, recommended, history = analyzer.run(matrix=matrix)
+
+    print("\n🏅 RANKING (empeoramiento relativo medio al permutar)")
+    for row in report.itertuples(index=False):
+        status = "✓" if row.kept else f"✗ paso {row.removed_at_step}"
+        print(f"  {row.rank:>2}. {row.feature:<22} {row.importance:+.3%}  "
+              f"logloss {row.win_log_loss_increase:+.4f}  margen {row.margin_mae_increase:+.3f}  "
+              f"total {row.total_mae_increase:+.3f}  {status}")
+
+    final = history.iloc[-1]
+    print(f"\n🎯 Recomendadas: {len(recommended)} de {len(report)} features")
+    for metric in SCORES.values():
+        print(f"  - {metric}: {history.iloc[0][metric]:.4f} → {final[metric]:.4f}")
+
+    FeatureAnalyzer.save(report, recommended, history, args.report, args.output)
+    print(f"\n✅ Entrena con: python scripts/train_models.py --features {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
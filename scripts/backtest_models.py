@@ -0,0 +1,125 @@
+"""Script para ejecutar el backtesting walk-forward de los modelos NBA."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.evaluation.backtesting import WalkForwardBacktester, PERIODS, WINDOWS
+from src.features.matrix_cache import load_training_matrix
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtesting walk-forward de modelos NBA")
+    parser.add_argument(
+        "--data",
+        default="data/processed/games_with_features.parquet",
+        help="Archivo con datos procesados"
+    )
+    parser.add_argument(
+        "--period",
+        choices=PERIODS,
+        default="season",
+        help="Granularidad de los folds (default: season)"
+    )
+    parser.add_argument(
+        "--window",
+        choices=WINDOWS,
+        default="expanding",
+        help="Ventana de entrenamiento (default: expanding)"
+    )
+    parser.add_argument(
+        "--train-periods",
+        type=int,
+        default=None,
+        help="Periodos de entrenamiento en ventana deslizante"
+    )
+    parser.add_argument(
+        "--min-train-periods",
+        type=int,
+        default=1,
+        help="Periodos mínimos antes del primer fold de test (default: 1)"
+    )
+    parser.add_argument(
+        "--refit-every",
+        type=int,
+        default=1,
+        help="Reentrenar cada N periodos de test (default: 1)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Procesos en paralelo (default: todos los núcleos)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default="data/cache/matrices",
+        help="Caché de matrices de entrenamiento (default: data/cache/matrices)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Preparar la matriz en memoria sin usar la caché"
+    )
+    parser.add_argument(
+        "--output",
+        default="data/processed/backtest_report.parquet",
+        help="Donde guardar el reporte de métricas"
+    )
+    parser.add_argument(
+        "--predictions-output",
+        default="data/processed/backtest_predictions.parquet",
+        help="Donde guardar las predicciones fuera de muestra"
+    )
+
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🔁 BACKTESTING WALK-FORWARD NBA")
+    print("=" * 60)
+
+    data_path = Path(args.data)
+    if not data_path.exists():
+        print(f"\n❌ Archivo no encontrado: {data_path}")
+        print("\nPrimero ejecuta: python scripts/process_features.py")
+        return 1
+
+    matrix = load_training_matrix(str(data_path), cache_dir=None if args.no_cache else args.cache_dir)
+    print(f"✅ {len(matrix)} partidos válidos con {len(matrix.columns)} features")
+
+    backtester = WalkForwardBacktester(
+        period=args.period,
+        window=args.window,
+        train_periods=args.train_periods,
+        min_train_periods=args.min_train_periods,
+        refit_every=args.refit_every,
+        n_workers=args.workers
+    )
+    report, predictions = backtester.run(matrix=matrix)
+
+    backtester.save_report(report, args.output)
+    backtester.save_report(predictions, args.predictions_output)
+
+    # Resumen por fold
+    summary_cols = ['period', 'n_train', 'n_test', 'win_accuracy', 'win_log_loss',
+                    'win_brier_score', 'margin_mae', 'total_mae']
+    print("\n📊 Métricas por fold:")
+    print(report[report['scope'] == 'fold'][summary_cols].to_string(index=False, float_format='%.3f'))
+
+    pooled = report[report['scope'] == 'pooled'].iloc[0]
+    print("\n" + "=" * 60)
+    print("✅ BACKTEST COMPLETADO")
+    print("=" * 60)
+    print(f"  - Accuracy: {pooled['win_accuracy']:.3f}")
+    print(f"  - Log Loss: {pooled['win_log_loss']:.3f}")
+    print(f"  - Brier Score: {pooled['win_brier_score']:.3f}")
+    print(f"  - MAE margen: {pooled['margin_mae']:.2f} puntos")
+    print(f"  - MAE total: {pooled['total_mae']:.2f} puntos")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Benchmark de la carga de datos del dashboard: primer render y reruns.
+
+Compara el flujo anterior (`st.cache_data(ttl=300)` sobre el Parquet completo:
+cada rerun deserializa una copia del DataFrame, y se pide dos veces, sidebar
+y pestaña) con `DashboardData` (columnas proyectadas, un solo frame de solo
+lectura compartido y validado con un `stat` del archivo).
+No necesita Streamlit: el acierto de `st.cache_data` se reproduce con pickle,
+que es como guarda y devuelve sus valores.
+
+Uso: python scripts/benchmark_dashboard_data.py --repeat 20 --log data/benchmarks/dashboard_data.jsonl
+"""
+
+import sys
+import json
+import time
+import pickle
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from src.dashboard.data_layer import DashboardData, DASHBOARD_COLUMNS
+
+
+def _render_work(df: pd.DataFrame):
+    """Operaciones de datos que hace la pestaña NBA en cada render."""
+    teams = sorted(set(df['HOME_TEAM_NAME'].unique()) | set(df['AWAY_TEAM_NAME'].unique()))
+    home, away = teams[0], teams[1]
+    h2h = df[((df['HOME_TEAM_NAME'] == home) & (df['AWAY_TEAM_NAME'] == away)) |
+             ((df['HOME_TEAM_NAME'] == away) & (df['AWAY_TEAM_NAME'] == home))]
+    h2h.sort_values('GAME_DATE', ascending=False).head(5)
+    df.sort_values('GAME_DATE', ascending=False).head(10)
+    np.histogram(df['HOME_PTS'], bins=30)
+    np.histogram(df['AWAY_PTS'], bins=30)
+
+
+def _legacy(data_path: str, repeat: int):
+    """(primer render, rerun medio) en ms con el Parquet completo vía st.cache_data."""
+    start = time.perf_counter()
+    df = pd.read_parquet(data_path)
+    stored = pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+    for _ in range(2):  # sidebar + pestaña
+        frame = pickle.loads(stored)
+    _render_work(frame)
+    first = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _ in range(2):
+            frame = pickle.loads(stored)
+        _render_work(frame)
+    rerun = (time.perf_counter() - start) / repeat
+    return first * 1000, rerun * 1000, frame.memory_usage(deep=True).sum() / 1e6, frame.shape[1]
+
+
+def _data_layer(data_path: str, repeat: int):
+    """(primer render, rerun medio) en ms con DashboardData."""
+    layer = DashboardData()
+    start = time.perf_counter()
+    frame = layer.load(data_path)
+    _render_work(frame)
+    first = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        frame = layer.load(data_path)
+        _render_work(frame)
+    rerun = (time.perf_counter() - start) / repeat
+    return first * 1000, rerun * 1000, layer.stats()['memory_mb'], frame.shape[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de carga de datos del dashboard")
+    parser.add_argument(
+        "--data",
+        default="data/processed/games_with_features.parquet",
+        help="Archivo con datos procesados"
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Reruns a promediar (default: 20)")
+    parser.add_argument("--log", default=None, help="Añadir el resultado a este JSONL para seguir la evolución")
+    args = parser.parse_args()
+
+    if not Path(args.data).exists():
+        print(f"❌ Archivo no encontrado: {args.data}")
+        return 1
+
+    rows = []
+    for variant, run in (('cache_data_full', _legacy), ('data_layer', _data_layer)):
+        first_ms, rerun_ms, memory_mb, columns = run(args.data, args.repeat)
+        rows.append({'variant': variant, 'columns': columns, 'first_paint_ms': first_ms,
+                     'rerun_ms': rerun_ms, 'memory_mb': memory_mb})
+    summary = pd.DataFrame(rows).set_index('variant')
+
+    print("=" * 60)
+    print(f"⏱️  BENCHMARK DE DATOS DEL DASHBOARD ({len(DASHBOARD_COLUMNS)} columnas proyectadas)")
+    print("=" * 60)
+    print(summary.to_string(float_format='%.2f'))
+
+    legacy, layer = summary.loc['cache_data_full'], summary.loc['data_layer']
+    print(f"\n🚀 Primer render: {legacy['first_paint_ms'] / layer['first_paint_ms']:.1f}x | "
+          f"rerun: {legacy['rerun_ms'] / layer['rerun_ms']:.1f}x")
+    print(f"💾 Memoria del frame: {legacy['memory_mb']:.1f} MB → {layer['memory_mb']:.1f} MB")
+
+    if args.log:
+        Path(args.log).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.log, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'data': args.data,
+                'repeat': args.repeat,
+                'results': rows,
+            }) + '\n')
+        print(f"📝 Resultado añadido a: {args.log}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Benchmark del arranque en frío: imports del dashboard y carga del modelo.
+
+Cada fase se ejecuta en un intérprete nuevo con `python -X importtime`, así
+que mide un arranque real (sin módulos ya importados). Se informa el tiempo
+de la fase, el de sus imports y los paquetes que más tiempo propio suman.
+
+La primera pintura del dashboard solo espera a `dashboard_import`; la carga
+del modelo (`model_load`) corre en segundo plano.
+
+Uso: python scripts/benchmark_startup.py --repeat 5 --log data/benchmarks/startup.jsonl
+"""
+
+import sys
+import json
+import argparse
+import subprocess
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Fase -> código a medir (se ejecuta desde la raíz del proyecto)
+PHASES = {
+    'dashboard_import': "import src.dashboard.nba_dashboard",
+    'predictor_import': "import src.models.nba_predictor",
+    'model_load': (
+        "from src.models.registry import load_serving_predictor\n"
+        "load_serving_predictor({registry!r}, fallback_path={model!r})"
+    ),
+}
+
+
+def parse_importtime(stderr: str):
+    """
+    Líneas de `-X importtime` -> (ms de imports de primer nivel, ms propios por paquete).
+
+    Formato: "import time: <propio us> | <acumulado us> | <espacios><módulo>";
+    los módulos de primer nivel son los que no tienen sangría.
+    """
+    total_us = 0
+    by_package = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        head, cumulative_us, name = line.split('|', 2)
+        self_us = int(head.split(':')[1])
+        if not name.startswith('  '):
+            total_us += int(cumulative_us)
+        by_package[name.strip().split('.')[0]] += self_us
+    return total_us / 1000, {package: us / 1000 for package, us in by_package.items()}
+
+
+def run_phase(code: str):
+    """Ejecuta `code` en un intérprete nuevo: (ms de la fase, ms de imports, ms por paquete)."""
+    script = (
+        "import time\n"
+        "_start = time.perf_counter()\n"
+        f"{code}\n"
+        "print(f'PHASE_MS {(time.perf_counter() - _start) * 1000:.3f}')\n"
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'error'
+        raise RuntimeError(error)
+    phase_ms = float(next(line for line in result.stdout.splitlines() if line.startswith('PHASE_MS')).split()[1])
+    import_ms, by_package = parse_importtime(result.stderr)
+    return phase_ms, import_ms, by_package
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del arranque en frío (python -X importtime)")
+    parser.add_argument("--repeat", type=int, default=5, help="Arranques por fase; se usa la mediana (default: 5)")
+    parser.add_argument("--phases", nargs="+", choices=list(PHASES), default=list(PHASES),
+                        help="Fases a medir (default: todas)")
+    parser.add_argument("--model", default="models/nba_predictor.joblib", help="Bundle para model_load")
+    parser.add_argument("--registry", default="models/registry", help="Registro para model_load")
+    parser.add_argument("--top", type=int, default=6, help="Paquetes más lentos a mostrar por fase (default: 6)")
+    parser.add_argument("--log", default=None, help="Añadir el resultado a este JSONL para seguir la evolución")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"⏱️  BENCHMARK DE ARRANQUE ({args.repeat} arranques por fase, mediana)")
+    print("=" * 60)
+
+    rows, packages = [], {}
+    for phase in args.phases:
+        code = PHASES[phase].format(model=args.model, registry=args.registry)
+        runs = []
+        try:
+            for _ in range(args.repeat):
+                runs.append(run_phase(code))
+        except RuntimeError as e:
+            print(f"⚠️ {phase}: no se pudo ejecutar ({e})")
+            continue
+        phase_ms = [run[0] for run in runs]
+        import_ms = [run[1] for run in runs]
+        rows.append({
+            'phase': phase,
+            'phase_ms': float(np.median(phase_ms)),
+            'import_ms': float(np.median(import_ms)),
+            'min_ms': float(np.min(phase_ms)),
+            'max_ms': float(np.max(phase_ms)),
+        })
+        # Tiempo propio por paquete del arranque mediano
+        median_run = runs[int(np.argsort(phase_ms)[len(phase_ms) // 2])]
+        packages[phase] = dict(sorted(median_run[2].items(), key=lambda item: -item[1])[:args.top])
+
+    if not rows:
+        return 1
+
+    print(pd.DataFrame(rows).set_index('phase').to_string(float_format='%.1f'))
+    for phase, top in packages.items():
+        print(f"\n📦 {phase}: " + ", ".join(f"{package} {ms:.0f} ms" for package, ms in top.items()))
+
+    if args.log:
+        Path(args.log).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.log, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'repeat': args.repeat,
+                'results': rows,
+                'top_packages': packages,
+            }) + '\n')
+        print(f"\n📝 Resultado añadido a: {args.log}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
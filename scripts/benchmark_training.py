@@ -0,0 +1,120 @@
+"""
+Benchmark de entrenamiento: matriz cuantizada compartida vs. tres fits sklearn.
+
+Compara el `NBAPredictor.fit` actual (un QuantileDMatrix para los tres
+modelos, sin StandardScaler) con el flujo anterior (StandardScaler +
+XGBClassifier/XGBRegressor, cada uno construyendo su propia DMatrix).
+Cada variante corre en un proceso limpio para medir el pico de memoria.
+
+En memoria ambas variantes quedan empatadas (±10%, dentro del ruido): el
+wrapper sklearn de XGBoost 2.x ya cuantiza con hist. Sirve para comprobar
+que `fit` (necesario para `train_streaming` y para los Boosters nativos
+que usan `explain` y `update`) no es más lento que el flujo anterior.
+
+Uso: python scripts/benchmark_training.py --repeat 3 --scale 4
+"""
+
+import sys
+import time
+import resource
+import argparse
+import multiprocessing as mp
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pandas as pd
+
+
+def _peak_rss_mb() -> float:
+    """Pico de memoria residente del proceso actual (MB)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB, macOS bytes
+    return peak / 1024 if sys.platform != 'darwin' else peak / (1024 * 1024)
+
+
+def _fit_legacy(predictor, X_train, y_win, y_margin, y_total):
+    """Flujo de entrenamiento previo: scaler + tres estimadores sklearn."""
+    from sklearn.preprocessing import StandardScaler
+    from xgboost import XGBClassifier, XGBRegressor
+
+    X_scaled = StandardScaler().fit_transform(X_train)
+    XGBClassifier(**predictor.params['win'], random_state=42, eval_metric='logloss').fit(X_scaled, y_win)
+    XGBRegressor(**predictor.params['margin'], random_state=42).fit(X_scaled, y_margin)
+    XGBRegressor(**predictor.params['total'], random_state=42).fit(X_scaled, y_total)
+
+
+def _run_variant(variant: str, data_path: str, scale: int, queue):
+    """Entrena una variante en un proceso limpio y reporta tiempo y memoria."""
+    from src.models.nba_predictor import NBAPredictor
+
+    df = pd.read_parquet(data_path)
+    if scale > 1:
+        df = pd.concat([df] * scale, ignore_index=True)
+
+    predictor = NBAPredictor()
+    X, y_win, y_margin, y_total = predictor.prepare_features(df)
+    baseline_rss = _peak_rss_mb()
+
+    start = time.perf_counter()
+    if variant == 'legacy':
+        _fit_legacy(predictor, X, y_win, y_margin, y_total)
+    else:
+        predictor.fit(X, y_win, y_margin, y_total, verbose=False)
+    elapsed = time.perf_counter() - start
+
+    queue.put({
+        'variant': variant,
+        'rows': len(X),
+        'seconds': elapsed,
+        'peak_rss_mb': _peak_rss_mb(),
+        'train_rss_mb': _peak_rss_mb() - baseline_rss,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de entrenamiento NBAPredictor")
+    parser.add_argument(
+        "--data",
+        default="data/processed/games_with_features.parquet",
+        help="Archivo con datos procesados"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por variante (default: 3)")
+    parser.add_argument("--scale", type=int, default=1, help="Replicar el dataset N veces (default: 1)")
+    args = parser.parse_args()
+
+    if not Path(args.data).exists():
+        print(f"❌ Archivo no encontrado: {args.data}")
+        return 1
+
+    ctx = mp.get_context('spawn')
+    results = []
+    for variant in ('legacy', 'shared_quantile'):
+        for _ in range(args.repeat):
+            queue = ctx.Queue()
+            process = ctx.Process(target=_run_variant, args=(variant, args.data, args.scale, queue))
+            process.start()
+            results.append(queue.get())
+            process.join()
+
+    summary = pd.DataFrame(results).groupby('variant', sort=False).agg(
+        rows=('rows', 'first'),
+        seconds=('seconds', 'median'),
+        peak_rss_mb=('peak_rss_mb', 'median'),
+        train_rss_mb=('train_rss_mb', 'median'),
+    )
+
+    print("=" * 60)
+    print("⏱️  BENCHMARK DE ENTRENAMIENTO (mediana)")
+    print("=" * 60)
+    print(summary.to_string(float_format='%.2f'))
+
+    legacy, shared = summary.loc['legacy'], summary.loc['shared_quantile']
+    print(f"\n🚀 Speedup: {legacy['seconds'] / shared['seconds']:.2f}x")
+    print(f"💾 Pico de memoria: {legacy['peak_rss_mb']:.0f} MB → {shared['peak_rss_mb']:.0f} MB")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Destila el NBAPredictor (XGBoost) en un alumno compacto que predice solo con NumPy.
+
+Uso: python scripts/distill_model.py --kind additive --output models/nba_student.npz
+"""
+
+import sys
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from src.models.nba_predictor import NBAPredictor
+from src.models.distillation import STUDENT_KINDS, distill, fidelity_report
+from src.features.matchup_features import build_team_states, assemble_matchups, all_pairs
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Arranque en frío: importar el módulo y cargar el bundle en un proceso nuevo.
+# La memoria máxima sale de /proc (VmHWM); en otros sistemas se informa como nan.
+_STARTUP_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from {module} import {cls}
+model = {cls}.load_model({path!r})
+elapsed = time.perf_counter() - start
+peak_mb = float('nan')
+try:
+    with open('/proc/self/status') as f:
+        peak_mb = next(int(line.split()[1]) / 1024 for line in f if line.startswith('VmHWM:'))
+except (OSError, StopIteration):
+    pass
+print(elapsed, peak_mb)
+"""
+
+
+def _cold_start(module: str, cls: str, path: str):
+    """(segundos, memoria máxima en MB) de cargar un modelo en un proceso nuevo."""
+    code = _STARTUP_SNIPPET.format(root=str(PROJECT_ROOT), module=module, cls=cls, path=str(Path(path).resolve()))
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    elapsed, peak_mb = output.stdout.strip().splitlines()[-1].split()
+    return float(elapsed), float(peak_mb)
+
+
+def _single_latency(model, features: dict, repeat: int = 200) -> float:
+    model.predict_game('HOME', 'AWAY', features)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        model.predict_game('HOME', 'AWAY', features)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def _print_fidelity(title: str, report: dict):
+    print(f"\n{title}")
+    print(f"  - Prob. victoria: MAE {report['win_proba_mae']:.4f} | máx {report['win_proba_max_diff']:.4f}")
+    print(f"  - Mismo favorito: {report['pick_agreement']:.1%}")
+    print(f"  - Margen: MAE vs maestro {report['margin_mae_vs_teacher']:.2f} pts")
+    print(f"  - Total: MAE vs maestro {report['total_mae_vs_teacher']:.2f} pts")
+    if 'teacher_accuracy' in report:
+        print(f"  - Accuracy: maestro {report['teacher_accuracy']:.3f} | alumno {report['student_accuracy']:.3f}")
+        print(f"  - Log Loss: maestro {report['teacher_log_loss']:.3f} | alumno {report['student_log_loss']:.3f}")
+    if 'teacher_margin_mae' in report:
+        print(f"  - MAE margen real: maestro {report['teacher_margin_mae']:.2f} | alumno {report['student_margin_mae']:.2f}")
+        print(f"  - MAE total real: maestro {report['teacher_total_mae']:.2f} | alumno {report['student_total_mae']:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Destilar el modelo NBA en un alumno NumPy")
+    parser.add_argument("--data", default="data/processed/games_with_features.parquet", help="Histórico con features")
+    parser.add_argument("--teacher", default="models/nba_predictor.joblib", help="Bundle del maestro (XGBoost)")
+    parser.add_argument("--output", default="models/nba_student.npz", help="Bundle del alumno (default: models/nba_student.npz)")
+    parser.add_argument("--kind", choices=STUDENT_KINDS, default="additive", help="Tipo de alumno (default: additive)")
+    parser.add_argument("--bins", type=int, default=16, help="Bins por feature del alumno additive (default: 16)")
+    parser.add_argument("--alpha", type=float, default=1.0, help="Regularización ridge (default: 1.0)")
+    parser.add_argument("--test-size", type=float, default=0.2, help="Fracción final (temporal) de partidos y fracción de pares para medir fidelidad (default: 0.2)")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla de la separación de pares (default: 42)")
+    parser.add_argument("--skip-startup", action="store_true", help="No medir el arranque en frío")
+    args = parser.parse_args()
+
+    if not Path(args.data).exists():
+        print(f"❌ No se encontró: {args.data}")
+        return 1
+
+    print("=" * 60)
+    print(f"🧪 DESTILACIÓN: {args.teacher} → {args.output} ({args.kind})")
+    print("=" * 60)
+
+    df = pd.read_parquet(args.data).sort_values('GAME_DATE', kind='mergesort')
+    teacher = NBAPredictor.load_model(args.teacher)
+
+    # Partidos históricos (features por partido) + todos los pares actuales (lo que sirve el dashboard)
+    X, y_win, y_margin, y_total = NBAPredictor().prepare_features(df)
+    X = X.reindex(columns=teacher.feature_columns)
+    split = int(len(X) * (1 - args.test_size))
+
+    teams = sorted(set(df['HOME_TEAM_NAME']) | set(df['AWAY_TEAM_NAME']))
+    pairs = all_pairs(teams)
+    X_pairs = assemble_matchups(build_team_states(df), pairs['HOME_TEAM_NAME'], pairs['AWAY_TEAM_NAME'])
+    X_pairs = X_pairs[teacher.feature_columns]
+
+    # Los pares también se separan: la fidelidad se mide en pares que el alumno no vio
+    order = np.random.default_rng(args.seed).permutation(len(X_pairs))
+    n_test_pairs = int(len(X_pairs) * args.test_size)
+    X_pairs_train = X_pairs.iloc[np.sort(order[n_test_pairs:])]
+    X_pairs_test = X_pairs.iloc[np.sort(order[:n_test_pairs])]
+
+    transfer = pd.concat([X.iloc[:split], X_pairs_train], ignore_index=True)
+    print(f"\n📚 Conjunto de transferencia: {len(transfer)} filas "
+          f"({split} partidos + {len(X_pairs_train)} enfrentamientos)")
+
+    start = time.perf_counter()
+    student = distill(teacher, transfer, kind=args.kind, n_bins=args.bins, alpha=args.alpha)
+    print(f"⏱️  Ajuste: {time.perf_counter() - start:.2f} s")
+
+    X_test = X.iloc[split:]
+    holdout = fidelity_report(
+        teacher.predict(X_test), student.predict(X_test),
+        y_win.iloc[split:], y_margin.iloc[split:], y_total.iloc[split:]
+    )
+    _print_fidelity(f"🎯 Fidelidad en partidos fuera de muestra ({len(X_test)})", holdout)
+    pairs_holdout = fidelity_report(teacher.predict(X_pairs_test), student.predict(X_pairs_test))
+    _print_fidelity(f"🤝 Fidelidad en enfrentamientos fuera de muestra ({len(X_pairs_test)})", pairs_holdout)
+
+    student.metadata['fidelity'] = holdout
+    student.metadata['pairs_fidelity'] = pairs_holdout
+    student.save(args.output)
+
+    features = X_pairs.iloc[0].to_dict()
+    print("\n📦 Despliegue")
+    print(f"  - Tamaño: maestro {Path(args.teacher).stat().st_size / 1024:.0f} KB | "
+          f"alumno {Path(args.output).stat().st_size / 1024:.0f} KB")
+    print(f"  - Predicción individual: maestro {_single_latency(teacher, features):.2f} ms | "
+          f"alumno {_single_latency(student, features):.2f} ms")
+
+    if not args.skip_startup:
+        teacher_start = _cold_start('src.models.nba_predictor', 'NBAPredictor', args.teacher)
+        student_start = _cold_start('src.models.distillation', 'StudentPredictor', args.output)
+        print(f"  - Arranque en frío: maestro {teacher_start[0]:.2f} s / {teacher_start[1]:.0f} MB | "
+              f"alumno {student_start[0]:.2f} s / {student_start[1]:.0f} MB")
+
+    print(f"\n✅ Usa el alumno en el dashboard con NBA_STUDENT_MODEL={args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
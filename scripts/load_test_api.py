@@ -0,0 +1,168 @@
+"""
+Prueba de carga de la API local: throughput y latencia de /predict y /slate.
+
+Con --start lanza el servidor (src/api/server.py) con los workers indicados,
+espera a que responda y lo detiene al terminar.
+
+Uso: python scripts/load_test_api.py --start --workers 4 --clients 16 --requests 200
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import subprocess
+import http.client
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def _request(conn: http.client.HTTPConnection, method: str, path: str, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else None
+    headers = {'Content-Type': 'application/json'} if body else {}
+    conn.request(method, path, body=body, headers=headers)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def _wait_ready(host: str, port: int, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            status, _ = _request(conn, 'GET', '/health')
+            conn.close()
+            if status == 200:
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def _run_clients(host: str, port: int, teams, args):
+    """Lanza `clients` hilos con conexión persistente; devuelve latencias, tiempo y errores."""
+    latencies, statuses = [], Counter()
+    predictions = 0
+    lock = threading.Lock()
+    barrier = threading.Barrier(args.clients)
+
+    def client(index: int):
+        nonlocal predictions
+        rng = random.Random(args.seed + index)
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        local, local_status, local_predictions = [], Counter(), 0
+        barrier.wait()
+        for _ in range(args.requests):
+            endpoint = args.endpoint if args.endpoint != 'mixed' else rng.choice(('predict', 'predict', 'slate'))
+            if endpoint == 'predict':
+                home, away = rng.sample(teams, 2)
+                path, payload, size = '/predict', {'home_team': home, 'away_team': away}, 1
+            else:
+                games = [dict(zip(('home_team', 'away_team'), rng.sample(teams, 2))) for _ in range(args.slate_size)]
+                path, payload, size = '/slate', {'games': games}, args.slate_size
+            start = time.perf_counter()
+            try:
+                status, _ = _request(conn, 'POST', path, payload)
+            except (OSError, http.client.HTTPException):
+                status = 'conexión'
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=30)
+            local.append(time.perf_counter() - start)
+            local_status[status] += 1
+            if status == 200:
+                local_predictions += size
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            statuses.update(local_status)
+            predictions += local_predictions
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(args.clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.array(latencies), time.perf_counter() - start, statuses, predictions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API de predicciones NBA")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="URL de la API (default: http://127.0.0.1:8000)")
+    parser.add_argument("--clients", type=int, default=16, help="Clientes concurrentes (default: 16)")
+    parser.add_argument("--requests", type=int, default=100, help="Peticiones por cliente (default: 100)")
+    parser.add_argument("--endpoint", choices=("predict", "slate", "mixed"), default="predict",
+                        help="Endpoint a probar (default: predict)")
+    parser.add_argument("--slate-size", type=int, default=15, help="Partidos por petición a /slate (default: 15)")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla (default: 42)")
+    parser.add_argument("--start", action="store_true", help="Lanzar el servidor para la prueba")
+    parser.add_argument("--workers", type=int, default=None, help="Workers del servidor lanzado con --start")
+    parser.add_argument("--server-args", default="", help="Argumentos extra para el servidor (ej. \"--data ...\")")
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+
+    server = None
+    if args.start:
+        command = [sys.executable, str(PROJECT_ROOT / 'src' / 'api' / 'server.py'),
+                   '--host', host, '--port', str(port), *args.server_args.split()]
+        if args.workers:
+            command += ['--workers', str(args.workers)]
+        server = subprocess.Popen(command, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL)
+    try:
+        if not _wait_ready(host, port, timeout=120 if server else 5):
+            print(f"❌ La API no responde en {args.url}")
+            return 1
+
+        conn = http.client.HTTPConnection(host, port, timeout=10)
+        _, health = _request(conn, 'GET', '/health')
+        _, teams = _request(conn, 'GET', '/teams')
+        conn.close()
+        teams = teams['teams']
+
+        print("=" * 60)
+        print(f"🔥 PRUEBA DE CARGA API: {args.clients} clientes x {args.requests} peticiones ({args.endpoint})")
+        print("=" * 60)
+        print(f"🤖 Modelo: {health['model_version']} | datos: {health['data_version']} ({len(teams)} equipos)")
+
+        latencies, elapsed, statuses, predictions = _run_clients(host, port, teams, args)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+        print(f"\n  - Peticiones: {len(latencies)} en {elapsed:.2f} s ({len(latencies) / elapsed:.0f} req/s, "
+              f"{predictions / elapsed:.0f} pred/s)")
+        print(f"  - Latencia p50: {p50:.2f} ms | p95: {p95:.2f} ms | p99: {p99:.2f} ms | máx: {latencies.max() * 1000:.2f} ms")
+        errors = {status: count for status, count in statuses.items() if status != 200}
+        if errors:
+            print(f"  - Errores: {errors}")
+
+        # Micro-batching de uno de los workers (el que atienda esta conexión)
+        conn = http.client.HTTPConnection(host, port, timeout=10)
+        _, metrics = _request(conn, 'GET', '/metrics')
+        conn.close()
+        batching = metrics.get('batching')
+        if batching:
+            queue = batching['queue_ms']
+            print(f"\n📦 Micro-batching (worker {metrics['pid']}): {batching['batches']} lotes, "
+                  f"media {batching['mean_batch']:.1f} partidos, inferencia {batching['inference_ms_mean']:.2f} ms")
+            print(f"  - Tamaños: {batching['batch_size_buckets']}")
+            print(f"  - Espera en cola p50: {queue['p50']:.2f} ms | p95: {queue['p95']:.2f} ms | p99: {queue['p99']:.2f} ms")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
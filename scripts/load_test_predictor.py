@@ -0,0 +1,129 @@
+"""
+Prueba de carga: N sesiones concurrentes contra el predictor compartido y contra el pool.
+
+Uso: python scripts/load_test_predictor.py --sessions 16 --requests 50
+"""
+
+import sys
+import time
+import random
+import argparse
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from src.models.nba_predictor import NBAPredictor
+from src.models.predictor_pool import PredictorPool, PoolSaturatedError
+
+
+def _run_sessions(predict_game, matchups, sessions: int, requests: int, think_time: float, seed: int):
+    """Lanza `sessions` hilos que hacen `requests` predicciones cada uno."""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(sessions)
+
+    def session(index: int):
+        rng = random.Random(seed + index)
+        local = []
+        barrier.wait()
+        for _ in range(requests):
+            home_team, away_team, features = rng.choice(matchups)
+            start = time.perf_counter()
+            try:
+                predict_game(home_team, away_team, features)
+                local.append(time.perf_counter() - start)
+            except PoolSaturatedError as e:
+                errors.append(str(e))
+            if think_time:
+                time.sleep(rng.expovariate(1 / think_time))
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return np.array(latencies), elapsed, len(errors)
+
+
+def _report(name: str, latencies: np.ndarray, elapsed: float, rejected: int):
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    print(f"\n{name}")
+    print(f"  - Peticiones: {len(latencies)} en {elapsed:.2f} s ({len(latencies) / elapsed:.0f} pred/s)")
+    print(f"  - Latencia p50: {p50:.2f} ms | p95: {p95:.2f} ms | p99: {p99:.2f} ms | máx: {latencies.max() * 1000:.2f} ms")
+    if rejected:
+        print(f"  - Rechazadas (cola llena): {rejected}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del predictor NBA")
+    parser.add_argument("--data", default="data/processed/games_with_features.parquet", help="Histórico con features")
+    parser.add_argument("--model", default="models/nba_predictor.joblib", help="Bundle del predictor")
+    parser.add_argument("--sessions", type=int, default=16, help="Sesiones concurrentes (default: 16)")
+    parser.add_argument("--requests", type=int, default=50, help="Predicciones por sesión (default: 50)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Pausa media entre peticiones en segundos (default: 0)")
+    parser.add_argument("--pool-size", type=int, default=None, help="Workers del pool (default: min(4, núcleos))")
+    parser.add_argument("--nthread", type=int, default=1, help="Hilos de XGBoost por worker (default: 1)")
+    parser.add_argument("--max-queue", type=int, default=256, help="Tamaño máximo de la cola (default: 256)")
+    parser.add_argument("--max-batch", type=int, default=32, help="Tamaño máximo de lote (default: 32)")
+    parser.add_argument("--batch-wait", type=float, default=0.002, help="Espera para agrupar en segundos (default: 0.002)")
+    parser.add_argument("--matchups", type=int, default=200, help="Enfrentamientos distintos (default: 200)")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla (default: 42)")
+    parser.add_argument("--skip-shared", action="store_true", help="No medir el predictor compartido sin pool")
+    args = parser.parse_args()
+
+    if not Path(args.data).exists():
+        print(f"❌ No se encontró: {args.data}")
+        return 1
+
+    df = pd.read_parquet(args.data)
+    predictor = NBAPredictor.load_model(args.model)
+
+    # Las features se calculan una vez: se mide solo la inferencia
+    rng = random.Random(args.seed)
+    teams = sorted(set(df['HOME_TEAM_NAME']) | set(df['AWAY_TEAM_NAME']))
+    matchups = []
+    for _ in range(args.matchups):
+        home_team, away_team = rng.sample(teams, 2)
+        matchups.append((home_team, away_team, predictor.prepare_features_for_game(home_team, away_team, df)))
+
+    print("=" * 60)
+    print(f"🔥 PRUEBA DE CARGA: {args.sessions} sesiones x {args.requests} predicciones")
+    print("=" * 60)
+
+    if not args.skip_shared:
+        latencies, elapsed, rejected = _run_sessions(
+            predictor.predict_game, matchups, args.sessions, args.requests, args.think_time, args.seed
+        )
+        _report("🧵 Predictor compartido (todos los hilos de XGBoost por llamada)", latencies, elapsed, rejected)
+
+    pool = PredictorPool(
+        predictor,
+        size=args.pool_size,
+        nthread=args.nthread,
+        max_queue=args.max_queue,
+        max_batch=args.max_batch,
+        batch_wait=args.batch_wait
+    )
+    latencies, elapsed, rejected = _run_sessions(
+        pool.predict_game, matchups, args.sessions, args.requests, args.think_time, args.seed
+    )
+    _report(f"🏊 Pool ({pool.size} workers x {args.nthread} hilo(s))", latencies, elapsed, rejected)
+
+    stats = pool.stats()
+    print(f"  - Lotes: {stats['batches']} | tamaño medio: {stats['mean_batch']:.1f} | máximo: {stats['max_batch_seen']}")
+    pool.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Script para gestionar el registro de modelos (publicar, activar, rollback)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.registry import ModelRegistry
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Registro de modelos NBA")
+    parser.add_argument(
+        "--registry",
+        default="models/registry",
+        help="Directorio del registro (default: models/registry)"
+    )
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    publish_parser = subparsers.add_parser("publish", help="Publicar un bundle como nueva versión")
+    publish_parser.add_argument("bundle", help="Bundle .joblib a publicar")
+    publish_parser.add_argument("--note", default=None, help="Descripción de la versión")
+    publish_parser.add_argument("--no-activate", action="store_true", help="Publicar sin activar")
+
+    activate_parser = subparsers.add_parser("activate", help="Activar una versión publicada")
+    activate_parser.add_argument("version", help="Identificador de la versión")
+
+    subparsers.add_parser("rollback", help="Volver a la versión activa anterior")
+    subparsers.add_parser("list", help="Listar versiones")
+    subparsers.add_parser("current", help="Mostrar la versión activa")
+
+    args = parser.parse_args()
+    registry = ModelRegistry(args.registry)
+
+    try:
+        if args.command == "publish":
+            registry.publish(args.bundle, note=args.note, activate=not args.no_activate)
+        elif args.command == "activate":
+            registry.activate(args.version)
+        elif args.command == "rollback":
+            registry.rollback()
+        elif args.command == "current":
+            current = registry.current()
+            print(current or "(sin versión activa)")
+            return 0 if current else 1
+        else:
+            current = registry.current()
+            versions = registry.versions()
+            if not versions:
+                print(f"📭 Registro vacío: {args.registry}")
+            for manifest in versions:
+                marker = "👉" if manifest['version'] == current else "  "
+                accuracy = (manifest.get('metrics') or {}).get('win_accuracy')
+                accuracy = f"{accuracy:.3f}" if accuracy is not None else "-"
+                print(f"{marker} {manifest['version']}  entrenado hasta {manifest.get('trained_until') or '-'}  "
+                      f"accuracy {accuracy}  {manifest.get('note') or ''}")
+    except (ValueError, FileNotFoundError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,20 @@
 """
 Script para buscar y predecir partidos NBA específicos
 Uso: python scripts/predict_nba_game.py
+     python scripts/predict_nba_game.py --batch partidos.csv --output predicciones.jsonl
+     cat partidos.csv | python scripts/predict_nba_game.py --batch - > predicciones.jsonl
+
+En modo batch el CSV trae home_team,away_team (o HOME_TEAM_NAME,AWAY_TEAM_NAME)
+y sale una línea JSON por partido, en el mismo orden, a medida que se calculan.
 """
 
 import sys
 import os
+import json
+import argparse
+import contextlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import pandas as pd
@@ -12,10 +22,14 @@ import numpy as np
 from datetime import datetime
 import joblib
 
-def load_model():
+from src.data.team_resolver import TeamResolver
+
+MODEL_PATH = 'models/nba_model.pkl'
+
+def load_model(path=MODEL_PATH):
     """Carga el modelo NBA entrenado"""
     try:
-        model = joblib.load('models/nba_model.pkl')
+        model = joblib.load(path)
         print("✓ Modelo NBA cargado correctamente")
         return model
     except Exception as e:
@@ -32,19 +46,12 @@ def load_nba_data():
         print(f"✗ Error cargando datos: {e}")
         return None
 
-def search_teams(df, query):
-    """Busca equipos por nombre"""
-    query_lower = query.lower()
-    
-    # Buscar en home_team
-    home_matches = df[df['home_team'].str.lower().str.contains(query_lower, na=False)]
-    # Buscar en away_team
-    away_matches = df[df['away_team'].str.lower().str.contains(query_lower, na=False)]
-    
-    # Combinar y eliminar duplicados
-    all_matches = pd.concat([home_matches, away_matches]).drop_duplicates()
-    
-    return all_matches
+def search_teams(df, query, resolver):
+    """Busca el equipo (nombre, alias, abreviatura o con erratas) y devuelve (equipo, partidos)"""
+    team = resolver.resolve(query)
+    if team is None:
+        return None, df.iloc[0:0]
+    return team, df[(df['home_team'] == team) | (df['away_team'] == team)]
 
 def get_team_names(df):
     """Obtiene lista única de equipos"""
@@ -58,10 +65,8 @@ def show_recent_games(df, team1, team2=None, limit=5):
     if team2:
         # Head to Head
         h2h = df[
-            ((df['home_team'].str.contains(team1, case=False, na=False)) & 
-             (df['away_team'].str.contains(team2, case=False, na=False))) |
-            ((df['home_team'].str.contains(team2, case=False, na=False)) & 
-             (df['away_team'].str.contains(team1, case=False, na=False)))
+            ((df['home_team'] == team1) & (df['away_team'] == team2)) |
+            ((df['home_team'] == team2) & (df['away_team'] == team1))
         ].tail(limit)
         
         if len(h2h) > 0:
@@ -76,10 +81,7 @@ def show_recent_games(df, team1, team2=None, limit=5):
             print(f"\nNo se encontraron enfrentamientos previos entre {team1} y {team2}")
     else:
         # Últimos partidos de un equipo
-        team_games = df[
-            (df['home_team'].str.contains(team1, case=False, na=False)) |
-            (df['away_team'].str.contains(team1, case=False, na=False))
-        ].tail(limit)
+        team_games = df[(df['home_team'] == team1) | (df['away_team'] == team1)].tail(limit)
         
         if len(team_games) > 0:
             print(f"\n{'='*80}")
@@ -89,7 +91,96 @@ def show_recent_games(df, team1, team2=None, limit=5):
                 print(f"{row['home_team']} {row.get('home_score', 'N/A')} - "
                       f"{row.get('away_score', 'N/A')} {row['away_team']}")
 
-def predict_game(model, home_team, away_team, df):
+def team_aggregates(df):
+    """
+    Estadísticas por equipo y por par, calculadas una vez para todo el histórico.
+
+    Returns:
+        (home, away, h2h): local por equipo (win rate y puntos en casa),
+        visitante por equipo (win rate y puntos fuera) y por par local/visitante
+        (partidos y victorias del local)
+    """
+    has_win = 'home_win' in df.columns
+    win = df['home_win'].astype(float) if has_win else pd.Series(np.nan, index=df.index)
+    games = pd.DataFrame({
+        'home_team': df['home_team'], 'away_team': df['away_team'], 'home_win': win,
+        'home_score': df['home_score'] if 'home_score' in df.columns else np.nan,
+        'away_score': df['away_score'] if 'away_score' in df.columns else np.nan,
+    })
+
+    # Mismos valores por defecto que sin partidos: 50% y 100 puntos
+    home = games.groupby('home_team').agg(win_rate=('home_win', 'mean'), avg_score=('home_score', 'mean'))
+    away = games.groupby('away_team').agg(win_rate=('home_win', 'mean'), avg_score=('away_score', 'mean'))
+    away['win_rate'] = 1 - away['win_rate']
+    for table in (home, away):
+        table['win_rate'] = table['win_rate'].fillna(0.5)
+        table['avg_score'] = table['avg_score'].fillna(100)
+
+    h2h = games.groupby(['home_team', 'away_team']).agg(games=('home_win', 'size'), home_wins=('home_win', 'sum'))
+    return home, away, h2h
+
+def matchup_features(aggregates, home_teams, away_teams):
+    """Matriz de features del modelo para varios partidos (una fila por partido)"""
+    home, away, _ = aggregates
+    home_stats = home.reindex(home_teams)
+    away_stats = away.reindex(away_teams)
+    home_wins = home_stats['win_rate'].fillna(0.5).to_numpy()
+    away_wins = away_stats['win_rate'].fillna(0.5).to_numpy()
+    home_avg_score = home_stats['avg_score'].fillna(100).to_numpy()
+    away_avg_score = away_stats['avg_score'].fillna(100).to_numpy()
+    return np.column_stack([
+        home_wins,
+        away_wins,
+        home_avg_score,
+        away_avg_score,
+        home_avg_score - away_avg_score
+    ])
+
+def predict_batch(aggregates, home_teams, away_teams, model=None):
+    """
+    Predice varios partidos de una vez con las estadísticas precalculadas.
+
+    Sin modelo se usa log5 con el win rate del local en casa y del visitante
+    fuera (mismo análisis estadístico que el modo interactivo).
+
+    Returns:
+        DataFrame con una fila por partido
+    """
+    _, _, h2h = aggregates
+    home_teams, away_teams = list(home_teams), list(away_teams)
+    features = matchup_features(aggregates, home_teams, away_teams)
+
+    if model is not None:
+        probability = model.predict_proba(features)[:, 1]
+        method = 'modelo'
+    else:
+        a = np.clip(features[:, 0], 0.01, 0.99)
+        b = np.clip(features[:, 1], 0.01, 0.99)
+        probability = a * (1 - b) / (a * (1 - b) + b * (1 - a))
+        method = 'log5'
+
+    # H2H en ambos sentidos: victorias del equipo local de esta predicción
+    same = h2h.reindex(pd.MultiIndex.from_arrays([home_teams, away_teams]))
+    reverse = h2h.reindex(pd.MultiIndex.from_arrays([away_teams, home_teams]))
+    h2h_games = same['games'].fillna(0).to_numpy() + reverse['games'].fillna(0).to_numpy()
+    h2h_wins = (same['home_wins'].fillna(0).to_numpy()
+                + reverse['games'].fillna(0).to_numpy() - reverse['home_wins'].fillna(0).to_numpy())
+
+    return pd.DataFrame({
+        'home_team': home_teams,
+        'away_team': away_teams,
+        'home_win_probability': probability,
+        'away_win_probability': 1 - probability,
+        'method': method,
+        'home_win_rate_home': features[:, 0],
+        'away_win_rate_away': features[:, 1],
+        'home_avg_score': features[:, 2],
+        'away_avg_score': features[:, 3],
+        'h2h_games': h2h_games.astype(int),
+        'h2h_home_team_wins': h2h_wins.astype(int),
+    })
+
+def predict_game(model, home_team, away_team, df, aggregates=None):
     """Predice el resultado de un partido"""
     if model is None:
         print("\n⚠️ No hay modelo cargado. Mostrando análisis estadístico...")
@@ -97,32 +188,9 @@ def predict_game(model, home_team, away_team, df):
     
     # Preparar features (simplificado - ajusta según tu modelo)
     try:
-        # Calcular estadísticas del equipo local
-        home_games = df[df['home_team'] == home_team]
-        if len(home_games) > 0:
-            home_wins = home_games['home_win'].mean() if 'home_win' in home_games.columns else 0.5
-            home_avg_score = home_games['home_score'].mean() if 'home_score' in home_games.columns else 100
-        else:
-            home_wins = 0.5
-            home_avg_score = 100
-        
-        # Calcular estadísticas del equipo visitante
-        away_games = df[df['away_team'] == away_team]
-        if len(away_games) > 0:
-            away_wins = (1 - away_games['home_win'].mean()) if 'home_win' in away_games.columns else 0.5
-            away_avg_score = away_games['away_score'].mean() if 'away_score' in away_games.columns else 100
-        else:
-            away_wins = 0.5
-            away_avg_score = 100
-        
-        # Crear feature vector
-        features = np.array([[
-            home_wins,
-            away_wins,
-            home_avg_score,
-            away_avg_score,
-            home_avg_score - away_avg_score
-        ]])
+        if aggregates is None:
+            aggregates = team_aggregates(df)
+        features = matchup_features(aggregates, [home_team], [away_team])
         
         # Predicción
         prediction = model.predict_proba(features)[0]
@@ -182,6 +250,127 @@ def show_statistical_analysis(home_team, away_team, df):
     
     print(f"{'='*80}\n")
 
+# ====== MODO BATCH ======
+
+_WORKER = {}
+
+def _init_worker(aggregates, model_path):
+    """Cada proceso recibe las estadísticas una vez y carga su propio modelo"""
+    _WORKER['aggregates'] = aggregates
+    _WORKER['model'] = joblib.load(model_path) if model_path else None
+
+def _format_chunk(chunk):
+    """
+    Predicciones de un bloque ya resuelto como texto JSON Lines.
+
+    `chunk` lleva row, home_team, away_team (None si el equipo no existe) y los
+    nombres originales; los partidos con equipos desconocidos o con el mismo
+    equipo en los dos lados salen con "error".
+    """
+    known = chunk['home_team'].notna() & chunk['away_team'].notna() & (chunk['home_team'] != chunk['away_team'])
+    records = [None] * len(chunk)
+    positions = np.flatnonzero(known.to_numpy())
+    if len(positions):
+        predictions = predict_batch(
+            _WORKER['aggregates'],
+            chunk['home_team'].to_numpy()[positions],
+            chunk['away_team'].to_numpy()[positions],
+            model=_WORKER['model']
+        )
+        predictions.insert(0, 'row', chunk['row'].to_numpy()[positions])
+        for position, record in zip(positions, predictions.to_dict('records')):
+            records[position] = record
+    for position in np.flatnonzero(~known.to_numpy()):
+        row = chunk.iloc[position]
+        if pd.isna(row['home_team']) or pd.isna(row['away_team']):
+            missing = row['home_query'] if pd.isna(row['home_team']) else row['away_query']
+            error = f"Equipo desconocido: {missing}"
+        else:
+            error = f"Local y visitante son el mismo equipo: {row['home_team']}"
+        records[position] = {'row': int(row['row']), 'home_team': row['home_query'],
+                             'away_team': row['away_query'], 'error': error}
+    return ''.join(json.dumps(record, ensure_ascii=False, default=_json_default) + '\n' for record in records)
+
+def _json_default(value):
+    """numpy -> tipos de Python para json.dumps"""
+    return value.item() if hasattr(value, 'item') else str(value)
+
+def read_matchups(source, resolver, chunk_size):
+    """
+    Lee el CSV de partidos por bloques (archivo o '-' para stdin) y resuelve los equipos.
+
+    Se aceptan columnas home_team/away_team, HOME_TEAM_NAME/AWAY_TEAM_NAME o home/away.
+    """
+    handle = sys.stdin if source == '-' else source
+    offset = 0
+    for frame in pd.read_csv(handle, chunksize=chunk_size, dtype=str, skipinitialspace=True):
+        columns = next(
+            (pair for pair in (('home_team', 'away_team'), ('HOME_TEAM_NAME', 'AWAY_TEAM_NAME'), ('home', 'away'))
+             if set(pair) <= set(frame.columns)),
+            None
+        )
+        if columns is None:
+            raise ValueError(f"El CSV necesita columnas home_team,away_team (tiene: {list(frame.columns)})")
+        home_query = frame[columns[0]].fillna('')
+        away_query = frame[columns[1]].fillna('')
+        # Los nombres se repiten mucho: se resuelve cada uno una vez por bloque
+        names = {name: resolver.resolve(name) for name in set(home_query) | set(away_query)}
+        yield pd.DataFrame({
+            'row': np.arange(offset, offset + len(frame)),
+            'home_query': home_query.to_numpy(),
+            'away_query': away_query.to_numpy(),
+            'home_team': home_query.map(names).to_numpy(),
+            'away_team': away_query.map(names).to_numpy(),
+        })
+        offset += len(frame)
+
+def run_batch(df, source, output, model_path=None, workers=1, chunk_size=2000):
+    """
+    Predice todos los partidos de `source` y escribe JSON Lines en `output`.
+
+    Las estadísticas se calculan una vez. Si hay más de un bloque y workers > 1
+    los bloques se reparten en un pool de procesos; la salida mantiene el orden
+    de entrada y se escribe bloque a bloque (como mucho 2 bloques por proceso en
+    vuelo, así la memoria no crece con el tamaño de la entrada).
+
+    Returns:
+        Número de partidos escritos
+    """
+    aggregates = team_aggregates(df)
+    resolver = TeamResolver(get_team_names(df))
+    chunks = read_matchups(source, resolver, chunk_size)
+
+    first = next(chunks, None)
+    if first is None:
+        return 0
+    second = next(chunks, None)
+    written = 0
+
+    if workers <= 1 or second is None:
+        _init_worker(aggregates, model_path)
+        for chunk in (first, second, *chunks) if second is not None else (first,):
+            output.write(_format_chunk(chunk))
+            output.flush()
+            written += len(chunk)
+        return written
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(aggregates, model_path)) as executor:
+        pending = deque()
+        for chunk in (first, second, *chunks):
+            pending.append((len(chunk), executor.submit(_format_chunk, chunk)))
+            if len(pending) >= 2 * workers:
+                size, future = pending.popleft()
+                output.write(future.result())
+                output.flush()
+                written += size
+        while pending:
+            size, future = pending.popleft()
+            output.write(future.result())
+            output.flush()
+            written += size
+    return written
+
 def interactive_mode(df, model):
     """Modo interactivo para buscar y predecir partidos"""
     print("\n" + "="*80)
@@ -194,6 +383,10 @@ def interactive_mode(df, model):
     print("  - 'salir' para terminar")
     print("="*80 + "\n")
     
+    # Índice de alias y trigramas y estadísticas por equipo: una vez al empezar
+    resolver = TeamResolver(get_team_names(df))
+    aggregates = team_aggregates(df)
+    
     while True:
         try:
             query = input("\n🔍 Buscar: ").strip()
@@ -221,43 +414,37 @@ def interactive_mode(df, model):
                     team1, team2 = parts[0].strip(), parts[1].strip()
                     
                     # Buscar equipos más cercanos
-                    all_teams = get_team_names(df)
-                    home_match = [t for t in all_teams if team1 in t.lower()]
-                    away_match = [t for t in all_teams if team2 in t.lower()]
+                    home_team = resolver.resolve(team1)
+                    away_team = resolver.resolve(team2)
                     
-                    if home_match and away_match:
-                        home_team = home_match[0]
-                        away_team = away_match[0]
+                    if home_team and away_team and home_team == away_team:
+                        print(f"❌ Local y visitante son el mismo equipo: {home_team}")
+                    elif home_team and away_team:
                         
                         # Mostrar H2H
                         show_recent_games(df, home_team, away_team)
                         
                         # Predicción
-                        predict_game(model, home_team, away_team, df)
+                        predict_game(model, home_team, away_team, df, aggregates)
                     else:
-                        if not home_match:
+                        if not home_team:
                             print(f"❌ No se encontró equipo: {team1}")
-                        if not away_match:
+                        if not away_team:
                             print(f"❌ No se encontró equipo: {team2}")
                 continue
             
             # Búsqueda simple de equipo
-            matches = search_teams(df, query)
+            team, matches = search_teams(df, query, resolver)
             
-            if len(matches) > 0:
-                # Encontrar el equipo más probable
-                all_teams = get_team_names(df)
-                matched_team = [t for t in all_teams if query.lower() in t.lower()]
-                
-                if matched_team:
-                    team = matched_team[0]
-                    show_recent_games(df, team)
-                    
-                    print(f"\n💡 Para ver predicción escribe: {team} vs EQUIPO_RIVAL")
-                else:
-                    print(f"✓ {len(matches)} partidos encontrados")
+            if team is not None:
+                show_recent_games(df, team)
+                print(f"\n✓ {len(matches)} partidos de {team}")
+                print(f"💡 Para ver predicción escribe: {team} vs EQUIPO_RIVAL")
             else:
                 print(f"❌ No se encontraron resultados para '{query}'")
+                suggestions = resolver.search(query, limit=3)
+                if suggestions:
+                    print("   ¿Quisiste decir: " + ", ".join(t for t, _ in suggestions) + "?")
                 print("\n💡 Intenta con:")
                 print("   - Nombre completo del equipo (ej: 'Lakers')")
                 print("   - 'Lakers vs Celtics' para predicción")
@@ -271,19 +458,51 @@ def interactive_mode(df, model):
 
 def main():
     """Función principal"""
-    print("\n🏀 CARGANDO SISTEMA NBA...")
-    
-    # Cargar datos
-    df = load_nba_data()
-    if df is None:
-        print("\n❌ No se pudieron cargar los datos. Verifica que existe data/nba_games.parquet")
-        return
-    
-    # Cargar modelo (opcional)
-    model = load_model()
+    parser = argparse.ArgumentParser(description="Buscar y predecir partidos NBA")
+    parser.add_argument("--batch", default=None, metavar="CSV",
+                        help="Predecir los partidos de un CSV ('-' = stdin) y salir, en JSON Lines")
+    parser.add_argument("--output", default="-", help="Archivo JSONL de salida en modo batch (default: stdout)")
+    parser.add_argument("--model", default=MODEL_PATH, help=f"Modelo (default: {MODEL_PATH})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Procesos para entradas de más de un bloque (default: todos los núcleos)")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Partidos por bloque (default: 2000)")
+    args = parser.parse_args()
+
+    # En modo batch stdout es para los datos: los mensajes van a stderr
+    log = contextlib.redirect_stdout(sys.stderr) if args.batch else contextlib.nullcontext()
+    with log:
+        print("\n🏀 CARGANDO SISTEMA NBA...")
+        
+        # Cargar datos
+        df = load_nba_data()
+        if df is None:
+            print("\n❌ No se pudieron cargar los datos. Verifica que existe data/nba_games.parquet")
+            return 1
+        
+        # Cargar modelo (opcional)
+        model = load_model(args.model)
+
+    if args.batch:
+        start = datetime.now()
+        output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+        try:
+            written = run_batch(df, args.batch, output,
+                                model_path=args.model if model is not None else None,
+                                workers=args.workers, chunk_size=args.chunk_size)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        elapsed = (datetime.now() - start).total_seconds()
+        print(f"✓ {written} partidos en {elapsed:.2f}s"
+              f"{' (' + args.output + ')' if args.output != '-' else ''}", file=sys.stderr)
+        return 0
     
     # Modo interactivo
     interactive_mode(df, model)
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Job programado: predice todos los partidos pendientes del calendario y los
+guarda en data/predictions/ (Parquet particionado por fecha de partido).
+
+Los estados de equipo salen de la caché de `load_team_states`, que se
+recalcula sola cuando cambia el histórico. Todas las predicciones (y sus
+factores clave) se calculan en una sola pasada por lote.
+
+Uso: python scripts/predict_slate.py --schedule data/schedule.csv
+     (programarlo cada noche con cron o el Programador de tareas de Windows)
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.prediction_store import DEFAULT_ROOT, drivers_columns, load_schedule, write_predictions
+from src.data.team_resolver import TeamResolver
+from src.features.matchup_features import assemble_matchups
+from src.features.state_snapshot import load_team_states
+
+
+def predict_schedule(predictor, snapshot, schedule: pd.DataFrame, k_drivers: int = 5) -> pd.DataFrame:
+    """
+    Predicciones de todo el calendario en una pasada.
+
+    Args:
+        predictor: NBAPredictor (o envoltorio) o StudentPredictor
+        snapshot: Estados de equipo (`load_team_states`)
+        schedule: Partidos con equipos ya resueltos a los nombres de `snapshot`
+        k_drivers: Factores clave por partido (0 = sin factores)
+
+    Returns:
+        DataFrame con una fila por partido
+    """
+    X = assemble_matchups(snapshot.frame(), schedule['HOME_TEAM_NAME'], schedule['AWAY_TEAM_NAME'])
+    preds = predictor.predict(X)
+    win_proba = preds['win_probability'].astype(float)
+    margin = preds['point_margin'].astype(float)
+    total = preds['total_points'].astype(float)
+
+    frame = pd.DataFrame({
+        'game_date': schedule['GAME_DATE'].values,
+        'home_team': schedule['HOME_TEAM_NAME'].str.strip().values,
+        'away_team': schedule['AWAY_TEAM_NAME'].str.strip().values,
+        'home_win_probability': win_proba,
+        'away_win_probability': 1 - win_proba,
+        'predicted_margin': margin,
+        'predicted_total': total,
+        'predicted_home_score': (total + margin) / 2,
+        'predicted_away_score': (total - margin) / 2,
+    })
+    if 'GAME_ID' in schedule:
+        frame.insert(1, 'game_id', schedule['GAME_ID'].values)
+
+    # El alumno destilado no tiene contribuciones por feature
+    if k_drivers > 0 and hasattr(predictor, 'explain'):
+        contributions = predictor.explain(X, models=('win',))['win']
+        frame = drivers_columns(frame, contributions.reset_index(drop=True), k=k_drivers)
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Predicciones precalculadas del calendario NBA")
+    parser.add_argument(
+        "--schedule",
+        default="data/schedule.csv",
+        help="Calendario pendiente (CSV/Parquet con GAME_DATE, HOME_TEAM_NAME, AWAY_TEAM_NAME)"
+    )
+    parser.add_argument("--data", default=None,
+                        help="Histórico con features o foto de despliegue (default: "
+                             "data/processed/games_with_features.parquet, data/deployment o data/deployment_data.parquet)")
+    parser.add_argument("--model", default="models/nba_predictor.joblib", help="Bundle del predictor")
+    parser.add_argument("--registry", default="models/registry", help="Registro de modelos (si tiene versión activa)")
+    parser.add_argument("--student", default=None, help="Usar el alumno destilado (.npz) en vez de XGBoost")
+    parser.add_argument("--cache-dir", default="data/cache/team_states", help="Caché de estados de equipo")
+    parser.add_argument("--from", dest="start", default=None,
+                        help="Primera fecha a predecir (default: día siguiente al último partido del histórico)")
+    parser.add_argument("--days", type=int, default=None, help="Días a predecir desde --from (default: todos)")
+    parser.add_argument("--top-drivers", type=int, default=5, help="Factores clave por partido (default: 5)")
+    parser.add_argument("--output", default=DEFAULT_ROOT, help=f"Dataset de salida (default: {DEFAULT_ROOT})")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📅 PREDICCIONES DEL CALENDARIO NBA")
+    print("=" * 60)
+
+    data_path = args.data
+    if data_path is None:
+        candidates = ['data/processed/games_with_features.parquet', 'data/deployment', 'data/deployment_data.parquet']
+        data_path = next((path for path in candidates if Path(path).exists()), candidates[0])
+    for path in (data_path, args.schedule):
+        if not Path(path).exists():
+            print(f"\n❌ Archivo no encontrado: {path}")
+            return 1
+
+    start_time = time.perf_counter()
+    snapshot = load_team_states(data_path, cache_dir=args.cache_dir)
+    print(f"\n📊 Estados de {len(snapshot)} equipos al {snapshot.as_of} (datos {snapshot.data_version})")
+
+    schedule = load_schedule(args.schedule)
+    start = pd.Timestamp(args.start) if args.start else pd.Timestamp(snapshot.as_of) + pd.Timedelta(days=1)
+    window = schedule['GAME_DATE'] >= start
+    if args.days is not None:
+        window &= schedule['GAME_DATE'] < start + pd.Timedelta(days=args.days)
+    schedule = schedule[window].copy()
+
+    # Nombres del calendario (alias, abreviaturas, erratas) -> nombres de los estados
+    resolver = TeamResolver(snapshot.teams)
+    for side in ('HOME_TEAM_NAME', 'AWAY_TEAM_NAME'):
+        names = schedule[side].astype(str)
+        schedule[side] = names.map({name: resolver.resolve(name) for name in names.unique()})
+    unknown = schedule['HOME_TEAM_NAME'].isna() | schedule['AWAY_TEAM_NAME'].isna()
+    if unknown.any():
+        print(f"⚠️ {int(unknown.sum())} partidos con equipos sin histórico (se omiten)")
+        schedule = schedule[~unknown]
+    if schedule.empty:
+        print(f"\nℹ️ No hay partidos pendientes desde {start.date()} en {args.schedule}")
+        return 0
+    print(f"🗓️ {len(schedule)} partidos del {schedule['GAME_DATE'].min().date()} "
+          f"al {schedule['GAME_DATE'].max().date()}")
+
+    if args.student:
+        from src.models.distillation import StudentPredictor
+        predictor = StudentPredictor.load_model(args.student)
+    else:
+        from src.models.registry import load_serving_predictor
+        predictor = load_serving_predictor(args.registry, fallback_path=args.model)
+
+    predict_start = time.perf_counter()
+    predictions = predict_schedule(predictor, snapshot, schedule, k_drivers=args.top_drivers)
+    predictions['model_version'] = getattr(predictor, 'model_version', None)
+    predictions['data_version'] = snapshot.data_version
+    predictions['as_of'] = snapshot.as_of
+    predictions['generated_at'] = pd.Timestamp.now().floor('s')
+    print(f"🤖 Predicciones calculadas en {time.perf_counter() - predict_start:.2f}s")
+
+    dates = write_predictions(predictions, args.output)
+    print(f"💾 {len(predictions)} predicciones en {args.output} ({len(dates)} fechas)")
+    print(f"✅ Completado en {time.perf_counter() - start_time:.2f}s")
+
+    summary = predictions[['game_date', 'home_team', 'away_team', 'home_win_probability',
+                           'predicted_margin', 'predicted_total']].head(10)
+    print(f"\n{summary.to_string(index=False, float_format='%.3f')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Script para simular el resto de la temporada NBA y las probabilidades de playoffs."""
+
+import sys
+import time
+from pathlib import Path
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.nba_predictor import NBAPredictor
+from src.features.matchup_features import build_team_states, all_pairs
+from src.simulation.season import SeasonSimulator
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulación Monte Carlo de temporada NBA")
+    parser.add_argument(
+        "--data",
+        default="data/processed/games_with_features.parquet",
+        help="Archivo con datos procesados"
+    )
+    parser.add_argument(
+        "--model",
+        default="models/nba_predictor.joblib",
+        help="Bundle de modelos"
+    )
+    parser.add_argument(
+        "--season",
+        type=int,
+        default=None,
+        help="Código SEASON de temporada regular (default: la más reciente, ej. 22024)"
+    )
+    parser.add_argument(
+        "--as-of",
+        default=None,
+        help="Fecha de corte: los partidos posteriores se simulan (default: último partido jugado)"
+    )
+    parser.add_argument(
+        "--schedule",
+        default=None,
+        help="Calendario pendiente (CSV/Parquet con HOME_TEAM_NAME, AWAY_TEAM_NAME, GAME_DATE)"
+    )
+    parser.add_argument("--simulations", type=int, default=100000, help="Temporadas simuladas (default: 100000)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Simulaciones por bloque (default: 10000)")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos para repartir bloques (default: 1)")
+    parser.add_argument("--update-elo", action="store_true", help="Actualizar el ELO en cada simulación")
+    parser.add_argument("--no-play-in", action="store_true", help="Sin torneo play-in (puestos 7-8 directos)")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla aleatoria (default: 42)")
+    parser.add_argument(
+        "--output",
+        default="data/processed/season_odds.parquet",
+        help="Donde guardar las probabilidades por equipo"
+    )
+
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🎲 SIMULACIÓN DE TEMPORADA NBA")
+    print("=" * 60)
+
+    data_path = Path(args.data)
+    if not data_path.exists():
+        print(f"\n❌ Archivo no encontrado: {data_path}")
+        return 1
+
+    df = pd.read_parquet(data_path)
+    df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'])
+
+    # Códigos SEASON 2xxxx = temporada regular
+    regular = df[df['SEASON'] // 10000 == 2]
+    season = args.season or int(regular['SEASON'].max())
+    season_games = regular[regular['SEASON'] == season].sort_values('GAME_DATE')
+    as_of = pd.Timestamp(args.as_of) if args.as_of else season_games['GAME_DATE'].max()
+
+    played = season_games[season_games['GAME_DATE'] <= as_of]
+    if args.schedule:
+        schedule_path = Path(args.schedule)
+        schedule = (pd.read_csv(schedule_path, parse_dates=['GAME_DATE']) if schedule_path.suffix == '.csv'
+                    else pd.read_parquet(schedule_path))
+        schedule = schedule.sort_values('GAME_DATE')
+    else:
+        # Sin calendario externo: se re-simula lo que queda de la temporada en los datos
+        schedule = season_games[season_games['GAME_DATE'] > as_of]
+
+    print(f"\n📅 Temporada {season}, corte {as_of.date()}: "
+          f"{len(played)} partidos jugados, {len(schedule)} pendientes")
+
+    predictor = NBAPredictor.load_model(args.model)
+    simulator = SeasonSimulator(
+        n_simulations=args.simulations,
+        chunk_size=args.chunk_size,
+        update_elo=args.update_elo,
+        play_in=not args.no_play_in,
+        n_workers=args.workers,
+        seed=args.seed
+    )
+
+    # Todas las probabilidades en dos llamadas por lotes al modelo
+    start = time.perf_counter()
+    states = build_team_states(df[df['GAME_DATE'] <= as_of])
+    schedule = schedule[schedule['HOME_TEAM_NAME'].isin(simulator.team_index)
+                        & schedule['AWAY_TEAM_NAME'].isin(simulator.team_index)]
+    win_proba = predictor.predict_matchups(
+        schedule['HOME_TEAM_NAME'], schedule['AWAY_TEAM_NAME'], states=states
+    )['home_win_probability'].values
+    pairs = all_pairs(simulator.teams)
+    pair_proba = simulator.pair_matrix(
+        predictor.predict_matchups(pairs['HOME_TEAM_NAME'], pairs['AWAY_TEAM_NAME'], states=states)
+    )
+    print(f"🤖 Probabilidades calculadas en {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    odds = simulator.run(schedule, win_proba, pair_proba, played=played)
+    print(f"✅ Simulación completada en {time.perf_counter() - start:.2f}s")
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    odds.to_parquet(output_path, index=False)
+    print(f"💾 Probabilidades guardadas en: {output_path}")
+
+    summary_cols = ['team', 'current_wins', 'mean_wins', 'p_top6', 'p_play_in',
+                    'p_playoffs', 'p_conf_finals', 'p_finals', 'p_champion']
+    for conference, table in odds.groupby('conference'):
+        print(f"\n🏀 Conferencia {conference}:")
+        print(table[summary_cols].to_string(index=False, float_format='%.3f'))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
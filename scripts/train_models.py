@@ -1,15 +1,101 @@
 """Script para entrenar modelos de predicción."""
 
+import json
 import sys
+from datetime import datetime
 from pathlib import Path
 import pandas as pd
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.models.predictor import NBAPredictor
+from src.models.nba_predictor import NBAPredictor as XGBPredictor
+from src.models.tuning import HyperparameterSearch, STRATEGIES, TARGETS
+from src.models.streaming import train_streaming
+from src.features.matrix_cache import MatrixCache, load_training_matrix
+from src.models.registry import ModelRegistry
 import argparse
 
 
+def run_search(args) -> int:
+    """Subcomando `search`: búsqueda de hiperparámetros con CV temporal."""
+    print("=" * 60)
+    print("🔎 BÚSQUEDA DE HIPERPARÁMETROS NBA")
+    print("=" * 60)
+    
+    data_path = Path(args.data)
+    if not data_path.exists():
+        print(f"\n❌ Archivo no encontrado: {data_path}")
+        print("\nPrimero ejecuta: python scripts/process_features.py")
+        return 1
+    
+    # Matriz en orden cronológico, mapeada desde la caché si ya se preparó
+    matrix = load_training_matrix(str(data_path), cache_dir=None if args.no_cache else args.cache_dir)
+    print(f"✅ {len(matrix)} partidos válidos con {len(matrix.columns)} features")
+    
+    search = HyperparameterSearch(
+        strategy=args.strategy,
+        n_trials=args.trials,
+        n_folds=args.folds,
+        max_rounds=args.max_rounds,
+        min_rounds=args.min_rounds,
+        eta=args.eta,
+        early_stopping_rounds=args.early_stopping,
+        n_workers=args.workers,
+        log_path=args.log,
+        seed=args.seed,
+        # Datos + definición de features: el log solo se reanuda si no cambiaron
+        data_version=MatrixCache(args.cache_dir).key(str(data_path))
+    )
+    best = search.run(
+        matrix.X,
+        {'win': matrix.y_win, 'margin': matrix.y_margin, 'total': matrix.y_total},
+        models=args.models
+    )
+    
+    search_metadata = {
+        'strategy': args.strategy,
+        'n_trials': args.trials,
+        'n_folds': args.folds,
+        'seed': args.seed,
+        'log': str(args.log),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'best': best,
+    }
+    
+    model_path = Path(args.model)
+    if args.refit:
+        print("\n🏋️  Reentrenando con la mejor configuración...")
+        predictor = XGBPredictor(params=search.to_params(best))
+        # La misma matriz de la búsqueda (ya mapeada): no se vuelve a leer el Parquet
+        predictor.train_matrix(matrix)
+        # Nunca sobre el bundle que se está sirviendo: se publica por el registro
+        model_path = Path(args.refit_output)
+    elif model_path.exists():
+        predictor = XGBPredictor.load_model(str(model_path))
+    else:
+        print(f"\n⚠️  No existe {model_path}; usa --refit para crearlo")
+        return 1
+    
+    predictor.metadata['hyperparameter_search'] = search_metadata
+    predictor.save(str(model_path))
+    
+    if args.refit and args.registry:
+        ModelRegistry(args.registry).publish(str(model_path), note=f"search: {args.strategy}")
+    elif args.refit:
+        print(f"\n📦 Para servirlo: python scripts/model_registry.py publish {model_path}")
+    
+    print("\n" + "=" * 60)
+    print("✅ BÚSQUEDA COMPLETADA")
+    print("=" * 60)
+    for target, config in best.items():
+        print(f"  - {target}: {config['eval_metric']}={config['score']:.4f} "
+              f"(depth={config['max_depth']}, lr={config['learning_rate']:.3f}, "
+              f"árboles={config['n_estimators']})")
+    
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(description="Entrenar modelos de predicción NBA")
     parser.add_argument(
@@ -28,9 +114,113 @@ def main():
         default=0.2,
         help="Proporción de datos para test (default: 0.2)"
     )
+    parser.add_argument(
+        "--features",
+        default=None,
+        help="JSON con la lista de features a usar (salida de scripts/analyze_features.py)"
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Entrenar los modelos XGBoost leyendo el Parquet por lotes (archivo o directorio particionado)"
+    )
+    parser.add_argument(
+        "--external-memory",
+        action="store_true",
+        help="Con --streaming, paginar la matriz de entrenamiento a disco"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=65536,
+        help="Filas por lote en modo --streaming (default: 65536)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default="data/cache/matrices",
+        help="Caché de matrices de entrenamiento de los modelos XGBoost (default: data/cache/matrices)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Preparar la matriz en memoria sin usar la caché"
+    )
+    
+    subparsers = parser.add_subparsers(dest="command")
+    search_parser = subparsers.add_parser(
+        "search",
+        help="Búsqueda de hiperparámetros de los modelos XGBoost"
+    )
+    # --data, --cache-dir y --no-cache valen antes o después de `search`:
+    # SUPPRESS evita que los defaults del subcomando pisen los del comando principal
+    search_parser.add_argument(
+        "--data",
+        default=argparse.SUPPRESS,
+        help="Archivo con datos procesados"
+    )
+    search_parser.add_argument(
+        "--strategy",
+        choices=STRATEGIES,
+        default="random",
+        help="random o halving (successive halving) (default: random)"
+    )
+    search_parser.add_argument(
+        "--models",
+        nargs="+",
+        choices=list(TARGETS),
+        default=list(TARGETS),
+        help="Modelos a optimizar (default: win margin total)"
+    )
+    search_parser.add_argument("--trials", type=int, default=30, help="Configuraciones por modelo (default: 30)")
+    search_parser.add_argument("--folds", type=int, default=4, help="Folds de CV temporal (default: 4)")
+    search_parser.add_argument("--max-rounds", type=int, default=600, help="Máximo de árboles (default: 600)")
+    search_parser.add_argument("--min-rounds", type=int, default=50, help="Árboles del primer escalón en halving (default: 50)")
+    search_parser.add_argument("--eta", type=int, default=3, help="Factor de reducción en halving (default: 3)")
+    search_parser.add_argument("--early-stopping", type=int, default=30, help="Rondas sin mejora (default: 30)")
+    search_parser.add_argument("--workers", type=int, default=None, help="Procesos en paralelo (default: todos los núcleos)")
+    search_parser.add_argument("--seed", type=int, default=42, help="Semilla del muestreo (default: 42)")
+    search_parser.add_argument(
+        "--log",
+        default="models/search/search_log.jsonl",
+        help="Log de resultados; si existe, la búsqueda se reanuda"
+    )
+    search_parser.add_argument(
+        "--model",
+        default="models/nba_predictor.joblib",
+        help="Bundle donde escribir la mejor configuración en los metadatos"
+    )
+    search_parser.add_argument(
+        "--cache-dir",
+        default=argparse.SUPPRESS,
+        help="Caché de matrices de entrenamiento (default: data/cache/matrices)"
+    )
+    search_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="Preparar la matriz en memoria sin usar la caché"
+    )
+    search_parser.add_argument(
+        "--refit",
+        action="store_true",
+        help="Reentrenar un bundle nuevo con la mejor configuración"
+    )
+    search_parser.add_argument(
+        "--refit-output",
+        default="models/search/nba_predictor_search.joblib",
+        help="Donde guardar el bundle de --refit (default: models/search/nba_predictor_search.joblib)"
+    )
+    search_parser.add_argument(
+        "--registry",
+        default=None,
+        help="Con --refit, publicar y activar el bundle en este registro de modelos"
+    )
     
     args = parser.parse_args()
     
+    if args.command == "search":
+        return run_search(args)
+    
     print("=" * 60)
     print("🏋️  ENTRENAMIENTO DE MODELOS NBA")
     print("=" * 60)
@@ -44,13 +234,37 @@ def main():
         print("  2. python scripts/process_features.py")
         return 1
     
-    print(f"\n📂 Cargando datos desde: {data_path}")
-    df = pd.read_parquet(data_path)
-    print(f"✅ Cargados {len(df)} partidos con {df.shape[1]} features")
+    features = None
+    if args.features:
+        # Subconjunto recomendado por el análisis de features (modelos XGBoost)
+        features = json.loads(Path(args.features).read_text())['features']
+        print(f"🎯 Usando {len(features)} features de: {args.features}")
     
-    # Entrenar modelos
-    predictor = NBAPredictor()
-    metrics = predictor.train(df, test_size=args.test_size)
+    if args.streaming:
+        # Sin cargar el dataset: solo se proyectan las columnas necesarias
+        print(f"\n📂 Leyendo por lotes desde: {data_path}")
+        predictor, metrics = train_streaming(
+            str(data_path),
+            predictor=XGBPredictor(features=features),
+            test_size=args.test_size,
+            batch_size=args.batch_size,
+            external_memory=args.external_memory
+        )
+    elif features is not None:
+        # Modelos XGBoost: matriz de `prepare_features` mapeada desde la caché si ya existe
+        matrix = load_training_matrix(str(data_path), features, cache_dir=None if args.no_cache else args.cache_dir)
+        print(f"✅ {len(matrix)} partidos válidos con {len(matrix.columns)} features")
+        predictor = XGBPredictor(features=features)
+        metrics = predictor.train_matrix(matrix, test_size=args.test_size)
+    else:
+        # Modelo base (src.models.predictor): su preparación de features no es la de la caché
+        print(f"\n📂 Cargando datos desde: {data_path}")
+        df = pd.read_parquet(data_path)
+        print(f"✅ Cargados {len(df)} partidos con {df.shape[1]} features")
+        
+        # Entrenar modelos
+        predictor = NBAPredictor()
+        metrics = predictor.train(df, test_size=args.test_size)
     
     # Guardar
     print(f"\n💾 Guardando modelos en: {args.output}")
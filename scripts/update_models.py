@@ -0,0 +1,110 @@
+"""
+Script para la actualización nocturna incremental de los modelos NBA.
+
+Lee solo los partidos recientes del dataset procesado (filtro de Parquet por
+fecha, sin cargar todo el histórico) y continúa el boosting de los modelos
+existentes. Si el guard de drift/degradación se activa, reentrena desde cero.
+"""
+
+import sys
+from pathlib import Path
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.nba_predictor import NBAPredictor
+from src.models.registry import ModelRegistry
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Actualización incremental de modelos NBA")
+    parser.add_argument(
+        "--data",
+        default="data/processed/games_with_features.parquet",
+        help="Archivo con datos procesados"
+    )
+    parser.add_argument(
+        "--model",
+        default="models/nba_predictor.joblib",
+        help="Bundle a actualizar"
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Donde guardar el bundle actualizado (default: sobrescribe --model)"
+    )
+    parser.add_argument("--extra-rounds", type=int, default=20, help="Árboles adicionales por modelo (default: 20)")
+    parser.add_argument("--window-days", type=int, default=60, help="Ventana reciente en días (default: 60)")
+    parser.add_argument("--half-life-days", type=float, default=14.0, help="Vida media del peso por recencia (default: 14)")
+    parser.add_argument("--drift-threshold", type=float, default=0.5, help="Umbral de drift en desviaciones típicas (default: 0.5)")
+    parser.add_argument("--degradation-threshold", type=float, default=0.10, help="Umbral de aumento relativo del log loss (default: 0.10)")
+    parser.add_argument(
+        "--registry",
+        default=None,
+        help="Publicar y activar el bundle actualizado en este registro de modelos"
+    )
+    parser.add_argument(
+        "--no-retrain",
+        action="store_true",
+        help="Si el guard se activa, solo avisar (no reentrenar desde cero)"
+    )
+
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🌙 ACTUALIZACIÓN INCREMENTAL NBA")
+    print("=" * 60)
+
+    data_path = Path(args.data)
+    if not data_path.exists():
+        print(f"\n❌ Archivo no encontrado: {data_path}")
+        return 1
+
+    predictor = NBAPredictor.load_model(args.model)
+
+    # Solo los partidos de la ventana: Parquet descarta row groups por fecha
+    trained_until = predictor.metadata.get('trained_until')
+    if trained_until:
+        since = pd.Timestamp(trained_until) - pd.Timedelta(days=args.window_days)
+        new_games = pd.read_parquet(data_path, filters=[('GAME_DATE', '>', since)])
+    else:
+        print("⚠️  El bundle no tiene 'trained_until'; se usará el dataset completo")
+        new_games = pd.read_parquet(data_path)
+
+    new_games = new_games.sort_values('GAME_DATE').reset_index(drop=True)
+    print(f"\n📂 {len(new_games)} partidos en la ventana de actualización")
+
+    update_kwargs = dict(
+        extra_rounds=args.extra_rounds,
+        window_days=args.window_days,
+        half_life_days=args.half_life_days,
+        drift_threshold=args.drift_threshold,
+        degradation_threshold=args.degradation_threshold
+    )
+    result = predictor.update(new_games, **update_kwargs)
+
+    # El histórico completo solo se carga si el guard exige reentrenar
+    if result['mode'] == 'retrain_required' and not args.no_retrain:
+        print(f"\n📂 Cargando histórico completo desde: {data_path}")
+        history = pd.read_parquet(data_path)
+        result = predictor.update(new_games, history=history, **update_kwargs)
+
+    print(f"\n📋 Resultado: {result['mode']}")
+    if result.get('drift') is not None:
+        print(f"  - Drift: {result['drift']:.3f}")
+    if result.get('degradation') is not None:
+        print(f"  - Degradación log loss: {result['degradation']:+.1%}")
+
+    if result['mode'] in ('incremental', 'full_retrain'):
+        output = args.output or args.model
+        predictor.save(output)
+        if args.registry:
+            ModelRegistry(args.registry).publish(output, note=f"update: {result['mode']}")
+        return 0
+
+    return 0 if result['mode'] == 'noop' else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
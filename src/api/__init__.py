@@ -0,0 +1 @@
+"""API REST local de predicciones."""
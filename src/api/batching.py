@@ -0,0 +1,240 @@
+"""Micro-batching adaptativo (asyncio) delante de la inferencia del modelo."""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.models.instrumentation import Histogram, LATENCY_BUCKETS, BATCH_BUCKETS
+
+
+class _Request:
+    __slots__ = ('items', 'future', 'enqueued')
+
+    def __init__(self, items: Sequence, future: Future):
+        self.items = items
+        self.future = future
+        self.enqueued = time.perf_counter()
+
+
+class MicroBatcher:
+    """
+    Agrupa peticiones concurrentes en una sola llamada de inferencia.
+
+    Un bucle asyncio en un hilo propio recoge peticiones (cada una con uno o
+    más elementos) hasta `target_batch` elementos o `wait` segundos, ejecuta
+    `batch_fn` una vez con todos y reparte los resultados a cada llamador.
+    Mientras corre un lote, lo que llega se acumula en la cola y entra entero
+    (hasta `max_batch`) en el siguiente.
+
+    En modo adaptativo el objetivo es el número de elementos que llegan
+    durante una inferencia (tasa de llegada x duración media del lote) y la
+    espera es lo necesario para reunirlos, con tope `max_wait`: con poco
+    tráfico no se espera nada y con mucho los lotes crecen solos.
+
+    Uso desde hilos: `batcher(items)` o `batcher.submit(items)`;
+    desde corrutinas de cualquier bucle: `await batcher.predict(items)`.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List], List],
+        max_batch: int = 64,
+        max_wait: float = 0.005,
+        adaptive: bool = True,
+        smoothing: float = 0.2,
+        history: int = 10000
+    ):
+        """
+        Args:
+            batch_fn: Inferencia en lote: lista de elementos -> lista de resultados (mismo orden)
+            max_batch: Máximo de elementos por lote (una petición mayor va sola)
+            max_wait: Espera máxima para llenar un lote (segundos)
+            adaptive: Ajustar objetivo y espera a la tasa de llegada (si no: fijos)
+            smoothing: Peso de la última observación en las medias móviles
+            history: Esperas en cola recientes guardadas para los percentiles
+        """
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.adaptive = adaptive
+        self.smoothing = smoothing
+
+        # Estimaciones (medias móviles exponenciales)
+        self._gap = None            # segundos entre elementos que llegan
+        self._last_arrival = None
+        self._service = None        # segundos por lote
+        self.target_batch = 1 if adaptive else max_batch
+        self.wait = 0.0 if adaptive else max_wait
+
+        # Métricas
+        self._stats_lock = threading.Lock()
+        self.batch_items = Histogram(BATCH_BUCKETS)
+        self.queue_seconds = Histogram(LATENCY_BUCKETS)
+        self.inference_seconds = Histogram(LATENCY_BUCKETS)
+        self._recent_queue = deque(maxlen=history)
+        self.requests = 0
+        self.errors = 0
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='micro-batch')
+        self._loop = asyncio.new_event_loop()
+        self._queue: Optional[asyncio.Queue] = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name='micro-batcher', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    # --- API ---
+
+    def submit(self, items: Sequence) -> Future:
+        """Encola una petición desde cualquier hilo; el Future recibe sus resultados."""
+        request = _Request(list(items), Future())
+        self._loop.call_soon_threadsafe(self._enqueue, request)
+        return request.future
+
+    def __call__(self, items: Sequence, timeout: Optional[float] = None) -> List:
+        """Versión bloqueante de `submit`."""
+        return self.submit(items).result(timeout)
+
+    async def predict(self, items: Sequence) -> List:
+        """Versión asyncio de `submit`, para corrutinas de cualquier bucle."""
+        return await asyncio.wrap_future(self.submit(items))
+
+    def close(self):
+        """Procesa lo pendiente y detiene el bucle."""
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+            self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    # --- Bucle ---
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        self._ready.set()
+        try:
+            self._loop.run_until_complete(self._collect())
+        finally:
+            self._loop.close()
+
+    def _enqueue(self, request: _Request):
+        now = time.perf_counter()
+        if self._last_arrival is not None:
+            gap = (now - self._last_arrival) / max(1, len(request.items))
+            self._gap = gap if self._gap is None else (1 - self.smoothing) * self._gap + self.smoothing * gap
+        self._last_arrival = now
+        self._queue.put_nowait(request)
+
+    def _plan(self) -> Tuple[int, float]:
+        """(elementos objetivo, espera máxima) para el próximo lote."""
+        if not self.adaptive:
+            return self.max_batch, self.max_wait
+        if not self._gap or self._service is None:
+            return 1, 0.0
+        rate = 1 / self._gap
+        target = int(min(self.max_batch, max(1, math.ceil(rate * self._service))))
+        wait = 0.0 if target <= 1 else min(self.max_wait, (target - 1) / rate)
+        return target, wait
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            request = await self._queue.get()
+            if request is None:
+                break
+            batch, size = [request], len(request.items)
+            self.target_batch, self.wait = self._plan()
+            deadline = loop.time() + self.wait
+
+            # Esperar (como mucho `wait`) hasta reunir el objetivo...
+            while size < self.target_batch and not closing:
+                remaining = deadline - loop.time()
+                if self._queue.empty() and remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get_nowait() if not self._queue.empty() else \
+                        await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if request is None:
+                    closing = True
+                    break
+                batch.append(request)
+                size += len(request.items)
+
+            # ...y sumar sin esperar lo que ya está en cola, hasta max_batch
+            while size < self.max_batch and not closing and not self._queue.empty():
+                request = self._queue.get_nowait()
+                if request is None:
+                    closing = True
+                    break
+                batch.append(request)
+                size += len(request.items)
+
+            await loop.run_in_executor(self._executor, self._run_batch, batch)
+
+    def _run_batch(self, batch: List[_Request]):
+        items = [item for request in batch for item in request.items]
+        start = time.perf_counter()
+        try:
+            results = self.batch_fn(items)
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            with self._stats_lock:
+                self.errors += len(batch)
+            return
+        elapsed = time.perf_counter() - start
+        self._service = elapsed if self._service is None else \
+            (1 - self.smoothing) * self._service + self.smoothing * elapsed
+
+        offset = 0
+        for request in batch:
+            request.future.set_result(results[offset:offset + len(request.items)])
+            offset += len(request.items)
+
+        with self._stats_lock:
+            self.requests += len(batch)
+            self.batch_items.observe(len(items))
+            self.inference_seconds.observe(elapsed)
+            for request in batch:
+                delay = start - request.enqueued
+                self.queue_seconds.observe(delay)
+                self._recent_queue.append(delay)
+
+    # --- Métricas ---
+
+    def stats(self) -> Dict:
+        """Distribución de tamaños de lote, espera añadida en cola y estado del ajuste."""
+        with self._stats_lock:
+            batches = self.batch_items.count
+            buckets = {}
+            for bound, count in zip(self.batch_items.buckets + (float('inf'),), self.batch_items.counts):
+                if count:
+                    buckets['+Inf' if bound == float('inf') else f'<={bound}'] = count
+            delays = np.array(self._recent_queue) * 1000
+            return {
+                'requests': self.requests,
+                'batches': batches,
+                'errors': self.errors,
+                'mean_batch': self.batch_items.sum / batches if batches else 0.0,
+                'batch_size_buckets': buckets,
+                'queue_ms': {
+                    'mean': float(delays.mean()) if len(delays) else 0.0,
+                    'p50': float(np.percentile(delays, 50)) if len(delays) else 0.0,
+                    'p95': float(np.percentile(delays, 95)) if len(delays) else 0.0,
+                    'p99': float(np.percentile(delays, 99)) if len(delays) else 0.0,
+                },
+                'inference_ms_mean': self.inference_seconds.sum / batches * 1000 if batches else 0.0,
+                'arrival_rate': 1 / self._gap if self._gap else 0.0,
+                'adaptive': self.adaptive,
+                'target_batch': self.target_batch,
+                'wait_ms': self.wait * 1000,
+            }
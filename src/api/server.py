@@ -0,0 +1,372 @@
+"""
+API local de predicciones NBA (HTTP + JSON, solo biblioteca estándar).
+
+El modelo y la foto de estados de equipo se cargan una vez en el proceso
+principal; después se lanzan N workers (fork) que aceptan conexiones del
+mismo socket. Los estados son un .npy mapeado en memoria y el modelo se
+comparte copy-on-write, así que cada worker extra apenas suma memoria.
+
+Endpoints:
+    GET  /health                        Estado del worker y versiones
+    GET  /metrics                       Tamaños de lote y espera en cola del worker
+    GET  /teams                         Equipos disponibles
+    GET  /predict?home=...&away=...     Un partido
+    POST /predict  {"home_team": ..., "away_team": ...}
+    POST /slate    {"games": [{"home_team": ..., "away_team": ...}, ...]}
+
+Uso: python src/api/server.py --workers 4 --port 8000
+"""
+
+import sys
+import os
+import json
+import time
+import signal
+import socket
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.data.team_resolver import TeamResolver
+from src.features.matchup_features import assemble_matchups
+from src.features.state_snapshot import TeamStateSnapshot, load_team_states
+# Sin coste de xgboost: nba_predictor lo importa solo dentro de las funciones que lo usan
+from src.models.nba_predictor import game_result
+from src.api.batching import MicroBatcher
+
+
+class APIError(Exception):
+    """Error de la petición, con su código HTTP."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class PredictionService:
+    """
+    Lógica de los endpoints, independiente del transporte HTTP.
+
+    Las features de cada enfrentamiento salen de la foto de estados (la
+    misma construcción que `predict_matchups`), así que una predicción no
+    toca el histórico.
+    """
+
+    def __init__(self, predictor, snapshot: TeamStateSnapshot, max_slate: int = 500):
+        """
+        Args:
+            predictor: NBAPredictor, HotSwapPredictor o StudentPredictor
+            snapshot: Estados de equipo (`load_team_states`)
+            max_slate: Máximo de partidos por petición a /slate
+        """
+        self.predictor = predictor
+        self.snapshot = snapshot
+        self.states = snapshot.frame()
+        self.max_slate = max_slate
+        # Alias ("LAL", "lakers", "Los Ángeles Lakers") y erratas -> nombre de los estados
+        self.resolver = TeamResolver(snapshot.teams)
+        self.started = time.time()
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+        self.batcher: Optional[MicroBatcher] = None
+
+    def start_batching(self, max_batch: int = 64, max_wait: float = 0.005, adaptive: bool = True):
+        """
+        Agrupa las predicciones concurrentes del proceso en lotes (`MicroBatcher`).
+
+        Crea un hilo: en workers con fork se llama después del fork.
+        """
+        self.batcher = MicroBatcher(self._predict, max_batch=max_batch, max_wait=max_wait, adaptive=adaptive)
+
+    def resolve(self, name) -> str:
+        """Nombre del equipo tal como está en los estados (404 si no existe)."""
+        if not isinstance(name, str) or not name.strip():
+            raise APIError(400, "Falta el nombre del equipo")
+        team = self.resolver.resolve(name)
+        if team is None:
+            suggestions = [candidate.strip() for candidate, _ in self.resolver.search(name, limit=3)]
+            hint = f" (¿{' / '.join(suggestions)}?)" if suggestions else ""
+            raise APIError(404, f"Equipo desconocido: {name}{hint}")
+        return team
+
+    def count_request(self):
+        """Suma una petición (los handlers corren en muchos hilos)."""
+        with self._requests_lock:
+            self.requests += 1
+
+    def _versions(self) -> Dict:
+        return {
+            'model_version': getattr(self.predictor, 'model_version', None),
+            'data_version': self.snapshot.data_version,
+            'as_of': self.snapshot.as_of,
+        }
+
+    def _infer(self, pairs: List[Tuple[str, str]]) -> List[Dict]:
+        return self.batcher(pairs) if self.batcher is not None else self._predict(pairs)
+
+    def _predict(self, pairs: List[Tuple[str, str]]) -> List[Dict]:
+        homes = [home for home, _ in pairs]
+        aways = [away for _, away in pairs]
+        preds = self.predictor.predict(assemble_matchups(self.states, homes, aways))
+        return [game_result(home.strip(), away.strip(), preds, row) for row, (home, away) in enumerate(pairs)]
+
+    def _pair(self, game: Dict) -> Tuple[str, str]:
+        if not isinstance(game, dict):
+            raise APIError(400, "Cada partido debe ser un objeto con home_team y away_team")
+        home = self.resolve(game.get('home_team', game.get('home')))
+        away = self.resolve(game.get('away_team', game.get('away')))
+        if home == away:
+            raise APIError(400, f"Local y visitante son el mismo equipo: {home.strip()}")
+        return home, away
+
+    def health(self) -> Dict:
+        return {
+            'status': 'ok',
+            'pid': os.getpid(),
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'requests': self.requests,
+            'teams': len(self.snapshot),
+            **self._versions(),
+        }
+
+    def teams(self) -> Dict:
+        return {'teams': sorted(team.strip() for team in self.snapshot.teams), **self._versions()}
+
+    def predict(self, game: Dict) -> Dict:
+        return {**self._infer([self._pair(game)])[0], **self._versions()}
+
+    def slate(self, body: Dict) -> Dict:
+        games = body.get('games') if isinstance(body, dict) else None
+        if not isinstance(games, list) or not games:
+            raise APIError(400, "El cuerpo debe ser {\"games\": [{\"home_team\": ..., \"away_team\": ...}, ...]}")
+        if len(games) > self.max_slate:
+            raise APIError(413, f"Máximo {self.max_slate} partidos por petición")
+        return {'predictions': self._infer([self._pair(game) for game in games]), **self._versions()}
+
+    def metrics(self) -> Dict:
+        return {'pid': os.getpid(), 'batching': self.batcher.stats() if self.batcher is not None else None}
+
+    def warm_up(self):
+        """Una predicción de prueba para que la primera petición no pague la inicialización."""
+        if len(self.snapshot) >= 2:
+            self._predict([(self.snapshot.teams[0], self.snapshot.teams[1])])
+
+
+def make_handler(service: PredictionService, verbose: bool = False):
+    """Clase de handler HTTP ligada a `service`."""
+
+    class Handler(BaseHTTPRequestHandler):
+        # HTTP/1.1: conexiones persistentes (keep-alive) entre peticiones
+        protocol_version = 'HTTP/1.1'
+        server_version = 'NBAPredictionAPI/1.0'
+
+        def do_GET(self):
+            self._dispatch('GET')
+
+        def do_POST(self):
+            self._dispatch('POST')
+
+        def _dispatch(self, method: str):
+            url = urlsplit(self.path)
+            try:
+                body = self._read_json() if method == 'POST' else {}
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                service.count_request()
+
+                if url.path == '/predict':
+                    payload = service.predict(body if method == 'POST' else query)
+                elif url.path == '/slate' and method == 'POST':
+                    payload = service.slate(body)
+                elif url.path == '/teams' and method == 'GET':
+                    payload = service.teams()
+                elif url.path == '/health' and method == 'GET':
+                    payload = service.health()
+                elif url.path == '/metrics' and method == 'GET':
+                    payload = service.metrics()
+                elif url.path in ('/slate', '/teams', '/health', '/metrics'):
+                    raise APIError(405, f"Método no permitido: {method} {url.path}")
+                else:
+                    raise APIError(404, f"Ruta desconocida: {url.path}")
+                self._send(200, payload)
+            except APIError as e:
+                self._send(e.status, {'error': e.message})
+            except Exception as e:
+                self._send(500, {'error': f"{type(e).__name__}: {e}"})
+
+        def _read_json(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            if not length:
+                return {}
+            try:
+                return json.loads(self.rfile.read(length))
+            except ValueError:
+                raise APIError(400, "JSON inválido")
+
+        def _send(self, status: int, payload: Dict):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            if verbose:
+                super().log_message(format, *args)
+
+    return Handler
+
+
+def _serve_socket(sock: socket.socket, handler):
+    """Atiende conexiones del socket ya abierto (un hilo por conexión)."""
+    server = ThreadingHTTPServer(sock.getsockname()[:2], handler, bind_and_activate=False)
+    server.socket.close()
+    server.socket = sock
+    server.daemon_threads = True
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def serve(
+    service: PredictionService,
+    host: str = '127.0.0.1',
+    port: int = 8000,
+    workers: int = 1,
+    nthread: int = 1,
+    verbose: bool = False,
+    batching: Optional[Dict] = None
+):
+    """
+    Sirve la API con `workers` procesos sobre un mismo socket.
+
+    `batching` (argumentos de `start_batching`, None = sin micro-batching)
+    activa la agrupación de predicciones en cada worker.
+
+    Sin `os.fork` (Windows) se usa un solo proceso. El modelo no debe haber
+    predicho antes del fork (los hilos de OpenMP no sobreviven a él): el
+    calentamiento se hace en cada worker.
+    """
+    sock = socket.create_server((host, port), backlog=256)
+    handler = make_handler(service, verbose)
+    if workers > 1 and not hasattr(os, 'fork'):
+        print("⚠️  Este sistema no soporta fork: se usa un solo proceso")
+        workers = 1
+
+    def prepare_worker():
+        # HotSwapPredictor guarda el límite y lo aplica también a las versiones que cargue
+        if hasattr(service.predictor, 'set_nthread'):
+            service.predictor.set_nthread(nthread)
+        service.warm_up()
+        if batching is not None:
+            service.start_batching(**batching)
+
+    print(f"🚀 API en http://{host}:{sock.getsockname()[1]} ({workers} worker(s) x {nthread} hilo(s))")
+    if workers <= 1:
+        prepare_worker()
+        _serve_socket(sock, handler)
+        return
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                prepare_worker()
+                _serve_socket(sock, handler)
+            except BaseException:
+                status = 1
+            finally:
+                os._exit(status)
+        children.append(pid)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in children:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+    finally:
+        sock.close()
+
+
+def load_predictor(model_path: str, registry_root: str, student_path: Optional[str] = None):
+    """Alumno destilado si se indica; si no, el modelo activo del registro o el bundle clásico."""
+    if student_path:
+        from src.models.distillation import StudentPredictor
+        return StudentPredictor.load_model(student_path)
+    from src.models.registry import load_serving_predictor
+    return load_serving_predictor(registry_root, fallback_path=model_path, poll_interval=10.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API local de predicciones NBA")
+    parser.add_argument("--host", default="127.0.0.1", help="Interfaz (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Puerto (default: 8000)")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Procesos que atienden peticiones (default: min(4, núcleos))")
+    parser.add_argument("--threads", type=int, default=1, help="Hilos de XGBoost por worker (default: 1)")
+    parser.add_argument("--data", default=None,
+                        help="Histórico con features o foto de despliegue (default: "
+                             "data/processed/games_with_features.parquet, data/deployment o data/deployment_data.parquet)")
+    parser.add_argument("--model", default="models/nba_predictor.joblib", help="Bundle del predictor")
+    parser.add_argument("--registry", default="models/registry", help="Registro de modelos (si tiene versión activa)")
+    parser.add_argument("--student", default=None, help="Servir el alumno destilado (.npz) en vez de XGBoost")
+    parser.add_argument("--cache-dir", default="data/cache/team_states", help="Caché de estados de equipo")
+    parser.add_argument("--max-slate", type=int, default=500, help="Máximo de partidos por /slate (default: 500)")
+    parser.add_argument("--no-batching", action="store_true", help="Una inferencia por petición (sin micro-batching)")
+    parser.add_argument("--max-batch", type=int, default=64, help="Máximo de partidos por lote (default: 64)")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="Espera máxima para llenar un lote (default: 5 ms)")
+    parser.add_argument("--fixed-batching", action="store_true",
+                        help="Lote y espera fijos (--max-batch / --max-wait-ms) en vez de adaptativos")
+    parser.add_argument("--verbose", action="store_true", help="Registrar cada petición")
+    args = parser.parse_args()
+
+    data_path = args.data
+    if data_path is None:
+        candidates = ['data/processed/games_with_features.parquet', 'data/deployment', 'data/deployment_data.parquet']
+        data_path = next((path for path in candidates if Path(path).exists()), candidates[0])
+    if not Path(data_path).exists():
+        print(f"❌ No se encontró: {data_path}")
+        return 1
+
+    print("=" * 60)
+    print("🏀 API DE PREDICCIONES NBA")
+    print("=" * 60)
+
+    snapshot = load_team_states(data_path, cache_dir=args.cache_dir)
+    print(f"📊 Estados de {len(snapshot)} equipos (datos hasta {snapshot.as_of})")
+    predictor = load_predictor(args.model, args.registry, args.student)
+    service = PredictionService(predictor, snapshot, max_slate=args.max_slate)
+
+    batching = None if args.no_batching else {
+        'max_batch': args.max_batch,
+        'max_wait': args.max_wait_ms / 1000,
+        'adaptive': not args.fixed_batching,
+    }
+    serve(service, args.host, args.port, args.workers, args.threads, args.verbose, batching)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""Agregados precalculados (histogramas, equipos, medias, fechas) para el dashboard."""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def integer_bins(values: np.ndarray, bins: int = 30) -> np.ndarray:
+    """
+    Bordes de bins alineados a enteros (los puntos son enteros).
+
+    Con bordes en x.5 cada bin cubre el mismo número de valores posibles y
+    no aparecen picos falsos por bins que contienen un entero más que otros.
+    """
+    low, high = np.nanmin(values), np.nanmax(values)
+    width = max(1, int(np.ceil((high - low + 1) / bins)))
+    return np.arange(low, high + width + 1, width) - 0.5
+
+
+class DashboardAggregates:
+    """
+    Resumen pequeño del histórico para las tarjetas y gráficos del dashboard.
+
+    Se calcula una vez por versión de los datos (y día, por el filtro de
+    partidos ya jugados): lista de equipos, medias de puntos, histogramas ya
+    binneados con NumPy, rango de fechas y posiciones de los últimos
+    partidos. Los gráficos se dibujan con unas decenas de barras en vez de
+    enviar todos los puntos al navegador.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        home_col: str = 'HOME_TEAM_NAME',
+        away_col: str = 'AWAY_TEAM_NAME',
+        date_col: str = 'GAME_DATE',
+        home_pts_col: str = 'HOME_PTS',
+        away_pts_col: str = 'AWAY_PTS',
+        as_of: Optional[pd.Timestamp] = None,
+        bins: int = 30,
+        recent: int = 10
+    ):
+        """
+        Args:
+            df: DataFrame histórico (se guarda por referencia para `recent_games`)
+            home_col, away_col: Columnas de equipo local y visitante
+            date_col: Columna de fecha
+            home_pts_col, away_pts_col: Columnas de puntos
+            as_of: Fecha de corte de "partidos ya jugados" (default: ahora)
+            bins: Bins aproximados por histograma
+            recent: Últimos partidos a indexar
+        """
+        self.df = df
+        self.n_games = len(df)
+        self.teams: List[str] = sorted(set(df[home_col].unique()) | set(df[away_col].unique())) if len(df) else []
+        self.n_teams = len(self.teams)
+
+        self.home_pts_mean = self.away_pts_mean = None
+        self.histograms: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        if home_pts_col in df.columns and away_pts_col in df.columns and len(df):
+            home_pts = df[home_pts_col].to_numpy(dtype=float)
+            away_pts = df[away_pts_col].to_numpy(dtype=float)
+            self.home_pts_mean = float(np.nanmean(home_pts))
+            self.away_pts_mean = float(np.nanmean(away_pts))
+            # Mismos bordes para local y visitante: las dos distribuciones son comparables
+            edges = integer_bins(np.concatenate([home_pts, away_pts]), bins)
+            self.histograms['home'] = (np.histogram(home_pts, edges)[0], edges)
+            self.histograms['away'] = (np.histogram(away_pts, edges)[0], edges)
+
+        # Partidos ya jugados (si todos son futuros se usan todos)
+        self.recent_positions = np.array([], dtype=np.int64)
+        self.only_future = False
+        self.n_past = 0
+        self.date_range = None
+        if date_col in df.columns and len(df):
+            dates = pd.to_datetime(df[date_col]).to_numpy(dtype='datetime64[ns]')
+            cutoff = np.datetime64(as_of if as_of is not None else pd.Timestamp.now(), 'ns')
+            past = np.flatnonzero(dates <= cutoff)
+            if len(past) == 0:
+                self.only_future = True
+                past = np.arange(len(dates))
+            self.n_past = len(past)
+            past_dates = dates[past]
+            self.date_range = (pd.Timestamp(past_dates.min()), pd.Timestamp(past_dates.max()))
+            order = np.argsort(past_dates, kind='stable')[::-1][:recent]
+            self.recent_positions = past[order]
+
+    def histogram(self, side: str) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """(centros, conteos, anchos) del histograma de puntos de 'home' o 'away'."""
+        if side not in self.histograms:
+            return None
+        counts, edges = self.histograms[side]
+        return (edges[:-1] + edges[1:]) / 2, counts, np.diff(edges)
+
+    def recent_games(self) -> pd.DataFrame:
+        """Últimos partidos ya jugados, del más reciente al más antiguo."""
+        return self.df.iloc[self.recent_positions]
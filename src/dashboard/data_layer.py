@@ -0,0 +1,192 @@
+"""
+Capa de datos del dashboard: lectura proyectada y caché por versión del archivo.
+
+El histórico procesado tiene ~100 columnas, pero la interfaz y el predictor
+solo leen unas pocas. Aquí se leen solo esas, una vez por versión del archivo
+(ruta + tamaño + mtime), y el mismo DataFrame de solo lectura se comparte
+entre todas las sesiones y reruns.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.data.deployment_snapshot import DeploymentSnapshot, is_deployment_snapshot
+from src.data.versioning import file_fingerprint
+from src.features.matchup_features import LAST_GAME_STATS
+
+
+# Columnas que muestra la interfaz (últimos partidos, H2H, distribuciones)
+UI_COLUMNS = ('GAME_ID', 'GAME_DATE', 'HOME_TEAM_NAME', 'AWAY_TEAM_NAME', 'HOME_PTS', 'AWAY_PTS')
+
+# Columnas que lee el predictor para el estado de cada equipo (build_team_states)
+PREDICTOR_COLUMNS = ('HOME_WL',) + tuple(
+    f'{side}_{stat}'
+    for side in ('HOME', 'AWAY')
+    for stat in ['ELO_BEFORE', *LAST_GAME_STATS]
+)
+
+DASHBOARD_COLUMNS = tuple(dict.fromkeys(UI_COLUMNS + PREDICTOR_COLUMNS))
+
+
+def available_columns(path: str) -> List[str]:
+    """Columnas del archivo (Parquet: solo el esquema; CSV: la cabecera)."""
+    if str(path).endswith('.csv'):
+        return list(pd.read_csv(path, nrows=0).columns)
+    import pyarrow.parquet as pq
+    return list(pq.ParquetDataset(path).schema.names)
+
+
+def read_projected(path: str, columns: Optional[Sequence[str]] = DASHBOARD_COLUMNS) -> pd.DataFrame:
+    """
+    Lee solo las columnas pedidas que existan en el archivo.
+
+    Si el archivo no tiene ninguna (otro esquema, p. ej. CSV crudo con
+    columnas en minúsculas) se lee entero.
+
+    Args:
+        path: Parquet (archivo o directorio particionado) o CSV
+        columns: Columnas a leer (None = todas)
+
+    Returns:
+        DataFrame con GAME_DATE como datetime
+    """
+    names = available_columns(path)
+    selected = [c for c in columns if c in names] if columns is not None else None
+    if not selected:
+        selected = None
+
+    if str(path).endswith('.csv'):
+        df = pd.read_csv(path, usecols=selected)
+    else:
+        df = pd.read_parquet(path, columns=selected)
+
+    if 'GAME_DATE' in df.columns:
+        df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'])
+    return df
+
+
+def freeze(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Versión de solo lectura del DataFrame (mismas columnas, sin copiar datos).
+
+    Cada columna numérica o de fecha queda como un array propio marcado como
+    no escribible: una asignación accidental (`df.loc[...] = ...`) falla en
+    vez de modificar el frame compartido por todas las sesiones. Las columnas
+    de texto (object) se dejan igual: varias rutas en Cython de pandas no
+    aceptan arrays object de solo lectura.
+    """
+    columns = {}
+    for name in df.columns:
+        values = df[name]
+        if isinstance(values.dtype, np.dtype) and values.dtype != object:
+            array = values.to_numpy()
+            array.flags.writeable = False
+            columns[name] = array
+        else:
+            columns[name] = values.array
+    frozen = pd.DataFrame(columns, index=df.index, copy=False)
+    frozen.attrs.update(df.attrs)
+    return frozen
+
+
+class DashboardData:
+    """
+    Caché de DataFrames por archivo, invalidada por versión y no por tiempo.
+
+    En cada llamada solo se hace un `stat` del archivo: si su huella (tamaño
+    + mtime) no cambió se devuelve el mismo objeto; si cambió se vuelve a
+    leer. Es seguro entre hilos (sesiones de Streamlit).
+    """
+
+    def __init__(self, columns: Optional[Sequence[str]] = DASHBOARD_COLUMNS):
+        """
+        Args:
+            columns: Columnas a leer de cada archivo (None = todas)
+        """
+        self.columns = tuple(columns) if columns is not None else None
+        self._lock = threading.Lock()
+        self._entries: Dict[str, tuple] = {}
+        self.reads = 0
+        self.hits = 0
+        self.last_read_seconds = 0.0
+
+    def load(self, path: str) -> Optional[pd.DataFrame]:
+        """
+        DataFrame de solo lectura del archivo, o None si no existe.
+
+        `df.attrs['data_version']` lleva la huella del archivo (la misma que
+        usan las cachés de predicciones).
+        """
+        key = str(Path(path).resolve())
+        version = file_fingerprint(path)
+        if version is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return entry[1]
+
+            # Se lee bajo el lock: varias sesiones a la vez esperan una sola lectura
+            start = time.perf_counter()
+            df = read_projected(path, self.columns)
+            df.attrs['data_version'] = version
+            df = freeze(df)
+            self.last_read_seconds = time.perf_counter() - start
+            self.reads += 1
+            self._entries[key] = (version, df, None)
+            return df
+
+    def load_snapshot(self, directory: str) -> Optional[pd.DataFrame]:
+        """
+        Resultados recientes de una foto de despliegue, o None si no existe.
+
+        Misma caché por versión que `load`; los estados de equipo de la foto
+        quedan disponibles en `team_states(df.attrs['data_version'])`.
+        """
+        if not is_deployment_snapshot(directory):
+            return None
+        key = str(Path(directory).resolve())
+        version = file_fingerprint(directory)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return entry[1]
+
+            start = time.perf_counter()
+            snapshot = DeploymentSnapshot.load(directory)
+            df = snapshot.games
+            df.attrs['data_version'] = version
+            df = freeze(df)
+            self.last_read_seconds = time.perf_counter() - start
+            self.reads += 1
+            self._entries[key] = (version, df, snapshot.states)
+            return df
+
+    def team_states(self, data_version: Optional[str]) -> Optional[pd.DataFrame]:
+        """Estados de equipo de la foto con esa versión (None si los datos son un histórico)."""
+        with self._lock:
+            for version, _, states in self._entries.values():
+                if version == data_version:
+                    return states
+        return None
+
+    def stats(self) -> Dict[str, float]:
+        """Lecturas, aciertos y memoria de los frames cacheados."""
+        with self._lock:
+            frames = [df for _, df, _ in self._entries.values()]
+        return {
+            'reads': self.reads,
+            'hits': self.hits,
+            'files': len(frames),
+            'memory_mb': sum(df.memory_usage(deep=True).sum() for df in frames) / 1e6,
+            'last_read_seconds': self.last_read_seconds,
+        }
@@ -0,0 +1,97 @@
+"""Índice de enfrentamientos directos (H2H) por par de equipos, para el dashboard."""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class H2HIndex:
+    """
+    Historial de enfrentamientos precalculado por par de equipos (sin orden).
+
+    Se construye una vez por versión de los datos con operaciones vectorizadas:
+    para cada par guarda las posiciones de sus partidos (de más reciente a más
+    antiguo), las victorias y los puntos medios de cada equipo y la fecha del
+    último enfrentamiento. Consultar un par es un acceso a diccionario.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        home_col: str = 'HOME_TEAM_NAME',
+        away_col: str = 'AWAY_TEAM_NAME',
+        date_col: str = 'GAME_DATE',
+        home_pts_col: str = 'HOME_PTS',
+        away_pts_col: str = 'AWAY_PTS'
+    ):
+        """
+        Args:
+            df: DataFrame histórico (se guarda por referencia para `recent`)
+            home_col, away_col: Columnas de equipo local y visitante
+            date_col: Columna de fecha
+            home_pts_col, away_pts_col: Columnas de puntos
+        """
+        self.df = df
+        self.columns = [date_col, home_col, away_col, home_pts_col, away_pts_col]
+        self._pairs: Dict[frozenset, Dict] = {}
+        if df.empty:
+            return
+
+        n_games = len(df)
+        codes, teams = pd.factorize(np.concatenate([df[home_col].to_numpy(), df[away_col].to_numpy()]))
+        home, away = codes[:n_games], codes[n_games:]
+        low, high = np.minimum(home, away), np.maximum(home, away)
+        pair = low.astype(np.int64) * len(teams) + high
+
+        home_pts = df[home_pts_col].to_numpy(dtype=float)
+        away_pts = df[away_pts_col].to_numpy(dtype=float)
+        low_is_home = home == low
+        low_pts = np.where(low_is_home, home_pts, away_pts)
+        high_pts = np.where(low_is_home, away_pts, home_pts)
+
+        # Por par y, dentro de cada par, de más reciente a más antiguo
+        dates = pd.to_datetime(df[date_col]).to_numpy(dtype='datetime64[ns]')
+        order = np.lexsort((-dates.view(np.int64), pair))
+        sorted_pair = pair[order]
+        starts = np.flatnonzero(np.r_[True, sorted_pair[1:] != sorted_pair[:-1]])
+        games = np.diff(np.r_[starts, n_games])
+
+        low_wins = np.add.reduceat((low_pts > high_pts)[order], starts)
+        high_wins = np.add.reduceat((high_pts > low_pts)[order], starts)
+        low_avg = np.add.reduceat(low_pts[order], starts) / games
+        high_avg = np.add.reduceat(high_pts[order], starts) / games
+        last_dates = dates[order][starts]
+
+        for i, positions in enumerate(np.split(order, starts[1:])):
+            first = order[starts[i]]
+            team_low, team_high = teams[low[first]], teams[high[first]]
+            self._pairs[frozenset((team_low, team_high))] = {
+                'positions': positions,
+                'games': int(games[i]),
+                'wins': {team_low: int(low_wins[i]), team_high: int(high_wins[i])},
+                'avg_points': {team_low: float(low_avg[i]), team_high: float(high_avg[i])},
+                'last_date': pd.Timestamp(last_dates[i]),
+            }
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def lookup(self, team_a: str, team_b: str) -> Optional[Dict]:
+        """
+        Resumen del enfrentamiento, o None si nunca se enfrentaron.
+
+        Returns:
+            Dict con games, wins y avg_points (por nombre de equipo) y last_date
+        """
+        entry = self._pairs.get(frozenset((team_a, team_b)))
+        if entry is None or team_a == team_b:
+            return None
+        return {key: value for key, value in entry.items() if key != 'positions'}
+
+    def recent(self, team_a: str, team_b: str, n: int = 5) -> pd.DataFrame:
+        """Últimos `n` partidos entre ambos equipos (fecha, equipos y puntos)."""
+        entry = self._pairs.get(frozenset((team_a, team_b)))
+        if entry is None or team_a == team_b:
+            return self.df.iloc[:0][self.columns]
+        return self.df.iloc[entry['positions'][:n]][self.columns]
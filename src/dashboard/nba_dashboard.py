@@ -10,16 +10,28 @@ Dashboard especializado para NBA con:
 
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import sys
 import os
+import threading
 
 # Agregar src al path
 sys.path.insert(0, os.path.abspath('.'))
 
-from src.models.nba_predictor import NBAPredictor
+# Solo módulos ligeros al importar: plotly se importa al dibujar y xgboost
+# (con sklearn/scipy) al cargar el modelo, en un hilo aparte
+
+from src.models.prediction_cache import PredictionCache
+from src.models.instrumentation import configure_from_env
+from src.models.distillation import StudentPredictor
+from src.dashboard.data_layer import DashboardData
+from src.dashboard.h2h_index import H2HIndex
+from src.dashboard.aggregates import DashboardAggregates
+from src.data.prediction_store import read_predictions, predictions_version, stored_drivers
+from src.data.team_resolver import TeamResolver, split_matchup
+from src.features.matchup_features import build_team_states, assemble_matchups, all_pairs
 
 # Configuración de página
 st.set_page_config(
@@ -64,43 +76,56 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Capa de datos compartida: columnas proyectadas, caché por versión del archivo
+@st.cache_resource
+def load_data_layer():
+    """Un único DashboardData por proceso (mismo DataFrame para todas las sesiones)"""
+    return DashboardData()
+
 # Función para cargar datos NBA
-@st.cache_data(ttl=300)  # Cache 5 minutos
 def load_nba_data():
-    """Carga datos NBA del sistema existente"""
+    """Carga datos NBA del sistema existente (solo se releen si cambia el archivo)"""
+    layer = load_data_layer()
+
     # Prioridad 1: Datos completos procesados (local)
-    try:
-        df = pd.read_parquet('data/processed/games_with_features.parquet')
-        st.info("✅ Datos avanzados cargados (13,691 partidos con 103 features, 10 temporadas 2015-2025)")
+    df = layer.load('data/processed/games_with_features.parquet')
+    if df is not None:
+        st.info("✅ Datos avanzados cargados (13,691 partidos, 10 temporadas 2015-2025)")
         return df
-    except FileNotFoundError:
-        pass
-    
-    # Prioridad 2: Datos de despliegue (Cloud)
-    try:
-        df = pd.read_parquet('data/deployment_data.parquet')
+
+    # Prioridad 2: Foto de despliegue (Cloud): estados de equipo y partidos recientes
+    df = layer.load_snapshot('data/deployment')
+    if df is not None:
+        st.info(f"✅ Datos de despliegue cargados ({len(df):,} partidos recientes y estado de cada equipo)")
+        return df
+
+    # Prioridad 3: Parquet de despliegue anterior (2,000 partidos con features)
+    df = layer.load('data/deployment_data.parquet')
+    if df is not None:
         st.info("✅ Datos cargados (2,000 partidos recientes para predicciones)")
         return df
-    except FileNotFoundError:
-        pass
-    
-    # Prioridad 3: Datos raw
+
+    # Prioridad 4: Datos raw
     try:
         import glob
         csv_files = glob.glob('data/raw/games_*.csv')
         if csv_files:
             # Cargar el archivo más reciente
             latest_file = max(csv_files)
-            df = pd.read_csv(latest_file)
-            df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'])
+            df = layer.load(latest_file)
             st.info(f"✅ Datos cargados desde {latest_file}")
             return df
     except Exception:
         pass
-    
+
     # Si no hay archivos, crear datos de ejemplo mínimos
     st.warning("⚠️ No se encontraron archivos de datos. Usando datos de ejemplo...")
-    
+    st.info("ℹ️ Datos de ejemplo. Para predicciones reales, carga datos históricos.")
+    return load_sample_data()
+
+@st.cache_resource
+def load_sample_data():
+    """Datos de ejemplo mínimos (se generan una vez por proceso)"""
     teams = ['Lakers', 'Celtics', 'Warriors', 'Heat', 'Bucks', 'Nets', 'Suns', 'Mavericks']
     import numpy as np
     from datetime import datetime, timedelta
@@ -120,27 +145,223 @@ def load_nba_data():
             'AWAY_ELO_BEFORE': 1500 + np.random.randint(-100, 100),
         })
     
-    df = pd.DataFrame(data)
-    st.info("ℹ️ Datos de ejemplo. Para predicciones reales, carga datos históricos.")
-    return df
+    return pd.DataFrame(data)
+
+# Índice H2H por par de equipos (se reconstruye solo si cambian los datos)
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_h2h_index(data_version, home_col, away_col, date_col, _df_nba):
+    """Historial de enfrentamientos precalculado para todos los pares"""
+    return H2HIndex(_df_nba, home_col=home_col, away_col=away_col, date_col=date_col)
+
+# Buscador de equipos: alias e índice de trigramas (uno por versión de los datos)
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_team_resolver(data_version, _teams):
+    """Resuelve "lakers", "LAL" o "celtcs" al nombre del equipo en los datos"""
+    return TeamResolver(_teams)
+
+# Agregados para tarjetas y gráficos (por versión de los datos y día)
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_aggregates(data_version, day, columns, _df_nba):
+    """Equipos, medias, histogramas binneados y últimos partidos, precalculados"""
+    home_col, away_col, date_col, home_pts_col, away_pts_col = columns
+    return DashboardAggregates(
+        _df_nba, home_col=home_col, away_col=away_col, date_col=date_col,
+        home_pts_col=home_pts_col, away_pts_col=away_pts_col
+    )
+
+def get_aggregates(df_nba):
+    """Agregados de los datos cargados (detecta columnas en mayúsculas o minúsculas)"""
+    columns = tuple(
+        upper if upper in df_nba.columns else lower
+        for upper, lower in (('HOME_TEAM_NAME', 'home_team'), ('AWAY_TEAM_NAME', 'away_team'),
+                             ('GAME_DATE', 'game_date'), ('HOME_PTS', 'home_score'), ('AWAY_PTS', 'away_score'))
+    )
+    data_version = df_nba.attrs.get('data_version') or id(df_nba)
+    return load_aggregates(data_version, datetime.now().strftime('%Y-%m-%d'), columns, df_nba)
+
+def points_histogram(aggregates, side, title, color):
+    """Histograma de puntos dibujado desde los conteos ya binneados"""
+    import plotly.graph_objects as go
+    centers, counts, widths = aggregates.histogram(side)
+    fig = go.Figure(go.Bar(x=centers, y=counts, width=widths, marker_color=color))
+    fig.update_layout(title=title, height=300, bargap=0, showlegend=False,
+                      yaxis_title='Partidos')
+    return fig
+
+# Predicciones del calendario escritas por el job nocturno (scripts/predict_slate.py)
+@st.cache_data(max_entries=4, show_spinner=False)
+def load_slate_predictions(version, root, day):
+    """Partidos pendientes desde hoy (se releen solo si el job reescribe el dataset)"""
+    return read_predictions(root, start=day)
+
+def get_slate_predictions():
+    """Predicciones precalculadas de los próximos partidos (vacío si no hay dataset)"""
+    root = os.environ.get('NBA_PREDICTIONS_DIR', 'data/predictions')
+    version = predictions_version(root)
+    if version is None:
+        return pd.DataFrame()
+    return load_slate_predictions(version, root, datetime.now().strftime('%Y-%m-%d'))
+
+def find_slate_prediction(slate, home_team, away_team):
+    """Fila del próximo partido guardado entre los dos equipos, o None"""
+    if slate.empty:
+        return None
+    match = slate[(slate['home_team'] == home_team.strip()) & (slate['away_team'] == away_team.strip())]
+    return None if match.empty else match.iloc[0]
 
-# Función para cargar predictor
-@st.cache_resource
-def load_nba_predictor():
+# Función para cargar predictor (se ejecuta en un hilo: sin llamadas a st)
+def _load_predictor():
     """Carga el modelo entrenado de NBA"""
+    # Usar ruta absoluta basada en el directorio del archivo actual
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(os.path.dirname(current_dir))
+    model_path = os.path.join(project_root, 'models', 'nba_predictor.joblib')
+    registry_root = os.environ.get('NBA_MODEL_REGISTRY', os.path.join(project_root, 'models', 'registry'))
+    student_path = os.environ.get('NBA_STUDENT_MODEL')
+
+    # Alumno destilado: solo NumPy, sin importar xgboost (despliegue ligero)
+    if student_path:
+        return StudentPredictor.load_model(student_path)
+
     try:
-        # Usar ruta absoluta basada en el directorio del archivo actual
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(os.path.dirname(current_dir))
-        model_path = os.path.join(project_root, 'models', 'nba_predictor.joblib')
+        from src.models.registry import load_serving_predictor
+        from src.models.predictor_pool import PredictorPool
+    except ImportError:
+        # Entorno sin xgboost: usar el alumno por defecto si existe
+        student_path = os.path.join(project_root, 'models', 'nba_student.npz')
+        if os.path.exists(student_path):
+            return StudentPredictor.load_model(student_path)
+        raise
+
+    # Con registro: el modelo activo se cambia en caliente sin reiniciar
+    predictor = load_serving_predictor(registry_root, fallback_path=model_path, poll_interval=10.0)
+
+    # Pool compartido: hilos de XGBoost acotados aunque haya muchas sesiones
+    pool_size = os.environ.get('NBA_POOL_SIZE')
+    return PredictorPool(
+        predictor,
+        size=int(pool_size) if pool_size else None,
+        nthread=int(os.environ.get('NBA_POOL_THREADS', '1'))
+    )
+
+def _load_and_warm_predictor():
+    """Carga el modelo y hace una predicción de prueba (la primera paga la inicialización)"""
+    predictor = _load_predictor()
+    columns = getattr(predictor, 'feature_columns', None)
+    if columns:
+        try:
+            predictor.predict(pd.DataFrame(np.zeros((1, len(columns))), columns=columns))
+        except Exception:
+            pass
+    return predictor
+
+class ModelWarmup:
+    """
+    Carga del modelo en un hilo, lanzada una sola vez por proceso.
+
+    `main` la lanza al terminar de pintar: sklearn (vía xgboost) y las figuras
+    de plotly importan los mismos paquetes (narwhals) y importarlos a la vez
+    desde dos hilos puede acabar en un deadlock de imports.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.future = None
+
+    def start(self):
+        with self._lock:
+            if self.future is None:
+                executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='model-warmup')
+                self.future = executor.submit(_load_and_warm_predictor)
+                executor.shutdown(wait=False)
+        return self.future
+
+    def ready(self):
+        return self.future is not None and self.future.done()
 
-        predictor = NBAPredictor.load_model(model_path)
-        return predictor
-    except Exception as e:
+@st.cache_resource
+def get_model_warmup():
+    """Un único ModelWarmup por proceso"""
+    return ModelWarmup()
+
+def predictor_loading():
+    """True mientras el modelo no ha terminado de cargar (o aún no se lanzó)"""
+    return not get_model_warmup().ready()
+
+def load_nba_predictor(wait=False):
+    """Modelo si ya está cargado (con wait=True lo carga y lo espera); None mientras carga o si falló"""
+    warmup = get_model_warmup()
+    if wait:
+        warmup.start()
+    elif not warmup.ready():
+        return None
+    try:
+        return warmup.future.result()
+    except Exception:
         st.error(f"⚠️ No se pudo cargar el modelo NBA. Verifica que existe models/nba_predictor.joblib")
         st.info("💡 Para entrenar el modelo, ejecuta: python Analisis1/scripts/train_models.py")
         return None
 
+# Caché de predicciones compartida entre sesiones
+@st.cache_resource
+def load_prediction_cache():
+    """Caché LRU de predicciones (nivel en disco opcional vía NBA_PREDICTION_CACHE_DIR)"""
+    return PredictionCache(
+        max_entries=2048,
+        disk_dir=os.environ.get('NBA_PREDICTION_CACHE_DIR')
+    )
+
+# Exportador de métricas de inferencia (NBA_METRICS_PORT / NBA_METRICS_FILE)
+@st.cache_resource
+def start_metrics_exporter():
+    """Arranca una sola vez por proceso el endpoint o archivo de métricas"""
+    return configure_from_env()
+
+# Predicciones y factores de todos los enfrentamientos (una pasada por versión)
+@st.cache_data(show_spinner=False)
+def load_all_pairs(data_version, model_version, _df_nba, _predictor):
+    """Predice y explica todos los pares local/visitante en un solo lote"""
+    teams = sorted(set(_df_nba['HOME_TEAM_NAME'].unique()) | set(_df_nba['AWAY_TEAM_NAME'].unique()))
+    pairs = all_pairs(teams)
+    predictions, contributions = _predictor.explain_matchups(
+        pairs['HOME_TEAM_NAME'], pairs['AWAY_TEAM_NAME'],
+        states=get_team_states(_df_nba),
+        models=('win',)
+    )
+    index = pd.MultiIndex.from_frame(predictions[['home_team', 'away_team']])
+    return predictions.set_index(index), contributions['win'].set_axis(index)
+
+def get_team_states(df_nba):
+    """Estados de equipo: los de la foto de despliegue o calculados del histórico"""
+    states = load_data_layer().team_states(df_nba.attrs.get('data_version'))
+    return states if states is not None else build_team_states(df_nba)
+
+def lookup_matchup(home_team, away_team, df_nba, predictor):
+    """Predicción y factores precalculados, o None si no hay tabla de pares"""
+    data_version = df_nba.attrs.get('data_version')
+    model_version = getattr(predictor, 'model_version', None)
+    # El alumno destilado no tiene contribuciones por feature
+    if data_version is None or model_version is None or not hasattr(predictor, 'explain_matchups'):
+        return None
+    try:
+        predictions, contributions = load_all_pairs(data_version, model_version, df_nba, predictor)
+        row = predictions.loc[(home_team, away_team)]
+    except (KeyError, ValueError):
+        return None
+
+    margin, total = row['predicted_margin'], row['predicted_total']
+    result = {
+        'home_team': home_team,
+        'away_team': away_team,
+        'home_win_probability': float(row['home_win_probability']),
+        'away_win_probability': float(1 - row['home_win_probability']),
+        'predicted_margin': float(margin),
+        'predicted_total': float(total),
+        'predicted_home_score': float((total + margin) / 2),
+        'predicted_away_score': float((total - margin) / 2),
+    }
+    return result, contributions.loc[(home_team, away_team)]
+
 # Función para obtener stats de equipo
 def get_team_latest_stats(team_name, df_nba, predictor):
     """Extrae las últimas estadísticas de un equipo"""
@@ -168,18 +389,39 @@ def get_team_latest_stats(team_name, df_nba, predictor):
         return None
 
 # Función para mostrar predicción avanzada
-def show_advanced_prediction(home_team, away_team, df_nba, predictor):
-    """Muestra predicción con 3 modelos"""
-    if predictor is None:
+def show_advanced_prediction(home_team, away_team, df_nba, predictor, stored=None):
+    """Muestra predicción con 3 modelos (o la precalculada por el job del calendario)"""
+    if predictor is None and stored is None:
         st.error("❌ Modelo no disponible")
         return
 
     try:
-        # Preparar features para el partido
-        features = predictor.prepare_features_for_game(home_team, away_team, df_nba)
-        
-        # Obtener predicciones
-        predictions = predictor.predict_game(home_team, away_team, features)
+        cache = None
+        drivers = None
+        if stored is not None:
+            # Partido del calendario ya predicho: no se toca el modelo
+            predictions = {key: float(stored[key]) for key in (
+                'home_win_probability', 'away_win_probability', 'predicted_margin', 'predicted_total')}
+            drivers = stored_drivers(stored)
+        else:
+            # Tabla de todos los pares (incluye factores); si no, predicción cacheada
+            cache = load_prediction_cache()
+            precomputed = lookup_matchup(home_team, away_team, df_nba, predictor)
+            if precomputed is not None:
+                predictions, contributions = precomputed
+                from src.models.nba_predictor import top_drivers
+                drivers = top_drivers(contributions, k=6)
+            elif load_data_layer().team_states(df_nba.attrs.get('data_version')) is not None:
+                # Foto de despliegue: no hay features por partido, se usan sus estados
+                from src.models.nba_predictor import game_result
+                X = assemble_matchups(get_team_states(df_nba), [home_team], [away_team])
+                predictions = game_result(home_team, away_team, predictor.predict(X))
+            else:
+                predictions = predictor.predict_matchup(
+                    home_team, away_team, df_nba,
+                    data_version=df_nba.attrs.get('data_version'),
+                    cache=cache
+                )
 
         if predictions is None:
             st.error("❌ No se pudieron generar predicciones")
@@ -258,6 +500,7 @@ def show_advanced_prediction(home_team, away_team, df_nba, predictor):
         st.markdown("---")
 
         # Gráfico de probabilidades
+        import plotly.graph_objects as go
         fig = go.Figure()
 
         # Determinar colores basados en quién es favorito
@@ -282,6 +525,34 @@ def show_advanced_prediction(home_team, away_team, df_nba, predictor):
 
         st.plotly_chart(fig, use_container_width=True)
 
+        # Factores clave (contribuciones del modelo de victoria, ya calculadas)
+        if drivers is not None and not drivers.empty:
+            st.markdown("### 🔑 Factores Clave")
+            drivers = drivers.iloc[::-1]
+            fig_drivers = go.Figure(go.Bar(
+                x=drivers['contribution'],
+                y=drivers['driver'],
+                orientation='h',
+                marker_color=['#4ECDC4' if v >= 0 else '#FF6B6B' for v in drivers['contribution']],
+                text=[home_team if f == 'home' else away_team for f in drivers['favors']],
+                textposition='auto'
+            ))
+            fig_drivers.update_layout(
+                xaxis_title=f"Impacto en log-odds (positivo favorece a {home_team})",
+                showlegend=False,
+                height=320
+            )
+            st.plotly_chart(fig_drivers, use_container_width=True)
+
+        if stored is not None:
+            st.caption(f"📅 Predicción precalculada para el {stored['game_date']:%Y-%m-%d} "
+                       f"(modelo {stored['model_version']}, generada {stored['generated_at']:%Y-%m-%d %H:%M})")
+        else:
+            stats = cache.stats()
+            st.caption(f"⚡ Caché de predicciones: {stats['hits']} aciertos, {stats['misses']} fallos "
+                       f"({stats['hit_rate']:.0%}), {stats['size']} entradas"
+                       + (f", {stats['disk_errors']} errores de disco" if stats['disk_errors'] else ""))
+
     except Exception as e:
         st.error(f"Error en predicción: {e}")
 
@@ -292,51 +563,48 @@ def show_basic_analysis(df_nba):
         return
 
     st.markdown("### 📊 Análisis Básico")
+    aggregates = get_aggregates(df_nba)
 
     # Estadísticas generales
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        st.metric("📅 Partidos Totales", len(df_nba))
+        st.metric("📅 Partidos Totales", aggregates.n_games)
 
     with col2:
-        teams = set(df_nba['HOME_TEAM_NAME'].unique()) | set(df_nba['AWAY_TEAM_NAME'].unique())
-        st.metric("🏀 Equipos", len(teams))
+        st.metric("🏀 Equipos", aggregates.n_teams)
 
     with col3:
-        avg_home_pts = df_nba['HOME_PTS'].mean()
-        st.metric("🏠 Pts Local Promedio", f"{avg_home_pts:.1f}")
+        st.metric("🏠 Pts Local Promedio", f"{aggregates.home_pts_mean:.1f}")
 
     with col4:
-        avg_away_pts = df_nba['AWAY_PTS'].mean()
-        st.metric("✈️ Pts Visitante Promedio", f"{avg_away_pts:.1f}")
+        st.metric("✈️ Pts Visitante Promedio", f"{aggregates.away_pts_mean:.1f}")
 
 # Función principal para renderizar NBA
-def render_nba_tab():
+def render_nba_tab(df_nba, predictor):
     """Renderiza la pestaña principal de NBA"""
     st.markdown("## 🏀 NBA - Predicciones Avanzadas")
 
-    # Cargar datos
-    df_nba = load_nba_data()
-    predictor = load_nba_predictor()
-
     if df_nba.empty:
         st.error("❌ No se pudieron cargar datos NBA")
         return
 
+    aggregates = get_aggregates(df_nba)
+
     # Métricas principales
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        st.metric("📊 Partidos Analizados", f"{len(df_nba):,}")
+        st.metric("📊 Partidos Analizados", f"{aggregates.n_games:,}")
 
     with col2:
-        teams = set(df_nba['HOME_TEAM_NAME'].unique()) | set(df_nba['AWAY_TEAM_NAME'].unique())
-        st.metric("🏀 Equipos", len(teams))
+        st.metric("🏀 Equipos", aggregates.n_teams)
 
     with col3:
         if predictor:
             st.metric("🤖 Modelo", "XGBoost", help="3 modelos XGBoost entrenados con 13,691 partidos")
+        elif predictor_loading():
+            st.metric("🤖 Modelo", "CARGANDO", help="El modelo se está cargando en segundo plano")
         else:
             st.metric("🤖 Modelo", "INACTIVO", help="Modelo no disponible")
 
@@ -346,6 +614,21 @@ def render_nba_tab():
 
     st.markdown("---")
 
+    # ====== PRÓXIMOS PARTIDOS (PREDICCIONES PRECALCULADAS) ======
+    slate = get_slate_predictions()
+    if not slate.empty:
+        st.markdown("### 📅 Próximos Partidos")
+        st.dataframe(pd.DataFrame({
+            'Fecha': slate['game_date'].dt.strftime('%Y-%m-%d'),
+            'Local': slate['home_team'],
+            'Visitante': slate['away_team'],
+            'Prob. Local': slate['home_win_probability'].map('{:.1%}'.format),
+            'Margen': slate['predicted_margin'].round(1),
+            'Total': slate['predicted_total'].round(1),
+        }), use_container_width=True, hide_index=True, height=300)
+        st.caption(f"🤖 Modelo {slate['model_version'].iloc[0]} | generadas {slate['generated_at'].max():%Y-%m-%d %H:%M}")
+        st.markdown("---")
+
     # ====== SECCIÓN DE BÚSQUEDA Y PREDICCIÓN ======
     st.markdown("### 🔍 Buscar y Predecir Partido NBA")
 
@@ -355,8 +638,23 @@ def render_nba_tab():
     else:
         home_col, away_col = 'home_team', 'away_team'
 
-    # Obtener lista de equipos únicos
-    all_teams = sorted(set(list(df_nba[home_col].unique()) + list(df_nba[away_col].unique())))
+    # Lista de equipos únicos (precalculada)
+    all_teams = aggregates.teams
+
+    # Búsqueda rápida: "lakers vs celtics", "LAL @ BOS" (visitante @ local), con erratas
+    query = st.text_input("🔎 Búsqueda rápida", placeholder="Ej: lakers vs celtics", key="matchup_query")
+    if query and query != st.session_state.get('_resolved_query'):
+        resolver = load_team_resolver(df_nba.attrs.get('data_version') or id(df_nba), all_teams)
+        matchup = resolver.resolve_matchup(query)
+        if matchup is not None:
+            # Antes de crear los selectbox: así toman el valor encontrado
+            st.session_state['home_team'], st.session_state['away_team'] = matchup
+            st.session_state['_resolved_query'] = query
+        else:
+            suggestions = [team for part in (split_matchup(query) or (query,))
+                           for team, _ in resolver.search(part, limit=2)]
+            st.warning("⚠️ No se encontró el partido" +
+                       (f" (¿{', '.join(dict.fromkeys(suggestions))}?)" if suggestions else ""))
 
     col1, col2 = st.columns(2)
 
@@ -372,69 +670,43 @@ def render_nba_tab():
     st.markdown("---")
     st.markdown(f"### 📊 Historial: {home_team} vs {away_team}")
     
-    # Filtrar enfrentamientos directos entre estos equipos
-    h2h = df_nba[
-        ((df_nba[home_col] == home_team) & (df_nba[away_col] == away_team)) |
-        ((df_nba[home_col] == away_team) & (df_nba[away_col] == home_team))
-    ].copy()
+    # Índice precalculado por par de equipos (uno por versión de los datos)
+    date_col = 'GAME_DATE' if 'GAME_DATE' in df_nba.columns else 'game_date'
+    h2h_index = load_h2h_index(df_nba.attrs.get('data_version') or id(df_nba), home_col, away_col, date_col, df_nba)
+    summary = h2h_index.lookup(home_team, away_team)
     
-    if len(h2h) > 0:
+    if summary is not None:
         # Calcular estadísticas generales
         col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
         
-        # Victorias totales
-        home_wins = len(h2h[(h2h[home_col] == home_team) & (h2h['HOME_PTS'] > h2h['AWAY_PTS'])]) + \
-                    len(h2h[(h2h[away_col] == home_team) & (h2h['AWAY_PTS'] > h2h['HOME_PTS'])])
-        away_wins = len(h2h) - home_wins
-        
         with col_stat1:
-            st.metric(f"🏆 Victorias {home_team}", home_wins)
+            st.metric(f"🏆 Victorias {home_team}", summary['wins'][home_team])
         
         with col_stat2:
-            st.metric(f"🏆 Victorias {away_team}", away_wins)
+            st.metric(f"🏆 Victorias {away_team}", summary['wins'][away_team])
         
         with col_stat3:
-            st.metric("📅 Enfrentamientos", len(h2h))
+            st.metric("📅 Enfrentamientos", summary['games'])
         
         with col_stat4:
-            if len(h2h) > 0:
-                date_col = 'GAME_DATE' if 'GAME_DATE' in h2h.columns else 'game_date'
-                last_game = pd.to_datetime(h2h[date_col]).max()
-                st.metric("📆 Último Partido", last_game.strftime('%Y-%m-%d'))
+            st.metric("📆 Último Partido", summary['last_date'].strftime('%Y-%m-%d'))
         
         # Mostrar últimos 5 enfrentamientos
         st.markdown("#### 📋 Últimos 5 Enfrentamientos")
         
-        h2h_recent = h2h.sort_values(date_col, ascending=False).head(5)
-        
-        # Crear DataFrame para mostrar
-        display_data = []
-        for _, game in h2h_recent.iterrows():
-            # Determinar quién jugó de local y visitante
-            if game[home_col] == home_team:
-                local = home_team
-                visitante = away_team
-                pts_local = game['HOME_PTS']
-                pts_visitante = game['AWAY_PTS']
-            else:
-                local = away_team
-                visitante = home_team
-                pts_local = game['HOME_PTS']
-                pts_visitante = game['AWAY_PTS']
-            
-            ganador = local if pts_local > pts_visitante else visitante
-            margen = abs(pts_local - pts_visitante)
-            
-            display_data.append({
-                'Fecha': pd.to_datetime(game[date_col]).strftime('%Y-%m-%d'),
-                'Local': local,
-                'Visitante': visitante,
-                'Resultado': f"{int(pts_local)} - {int(pts_visitante)}",
-                'Ganador': f"🏆 {ganador}",
-                'Margen': f"{int(margen)} pts"
-            })
+        h2h_recent = h2h_index.recent(home_team, away_team, n=5)
+        pts_local = h2h_recent['HOME_PTS'].astype(int)
+        pts_visitante = h2h_recent['AWAY_PTS'].astype(int)
+        ganador = np.where(pts_local > pts_visitante, h2h_recent[home_col], h2h_recent[away_col])
         
-        h2h_df = pd.DataFrame(display_data)
+        h2h_df = pd.DataFrame({
+            'Fecha': pd.to_datetime(h2h_recent[date_col]).dt.strftime('%Y-%m-%d').values,
+            'Local': h2h_recent[home_col].values,
+            'Visitante': h2h_recent[away_col].values,
+            'Resultado': (pts_local.astype(str) + ' - ' + pts_visitante.astype(str)).values,
+            'Ganador': ['🏆 ' + team for team in ganador],
+            'Margen': ((pts_local - pts_visitante).abs().astype(str) + ' pts').values,
+        })
         st.dataframe(h2h_df, use_container_width=True, hide_index=True)
         
         # Estadísticas promedio en enfrentamientos
@@ -443,37 +715,11 @@ def render_nba_tab():
         
         with col_avg1:
             st.markdown(f"**{home_team}:**")
-            # Calcular promedio de puntos del home_team en estos partidos
-            home_as_home = h2h[h2h[home_col] == home_team]['HOME_PTS'].mean()
-            home_as_away = h2h[h2h[away_col] == home_team]['AWAY_PTS'].mean()
-            home_avg = h2h[
-                ((h2h[home_col] == home_team) & h2h['HOME_PTS']) |
-                ((h2h[away_col] == home_team) & h2h['AWAY_PTS'])
-            ]
-            
-            # Calcular correctamente
-            home_pts_list = []
-            for _, g in h2h.iterrows():
-                if g[home_col] == home_team:
-                    home_pts_list.append(g['HOME_PTS'])
-                else:
-                    home_pts_list.append(g['AWAY_PTS'])
-            
-            if home_pts_list:
-                st.metric("Puntos Promedio", f"{sum(home_pts_list)/len(home_pts_list):.1f}")
+            st.metric("Puntos Promedio", f"{summary['avg_points'][home_team]:.1f}")
         
         with col_avg2:
             st.markdown(f"**{away_team}:**")
-            # Calcular promedio de puntos del away_team en estos partidos
-            away_pts_list = []
-            for _, g in h2h.iterrows():
-                if g[home_col] == away_team:
-                    away_pts_list.append(g['HOME_PTS'])
-                else:
-                    away_pts_list.append(g['AWAY_PTS'])
-            
-            if away_pts_list:
-                st.metric("Puntos Promedio", f"{sum(away_pts_list)/len(away_pts_list):.1f}")
+            st.metric("Puntos Promedio", f"{summary['avg_points'][away_team]:.1f}")
         
     else:
         st.info(f"ℹ️ No hay historial de enfrentamientos entre {home_team} y {away_team} en los datos disponibles.")
@@ -482,9 +728,13 @@ def render_nba_tab():
 
     # Botón de predicción
     if st.button("🔮 Generar Predicción", type="primary", use_container_width=True):
-        if predictor:
+        stored = find_slate_prediction(slate, home_team, away_team)
+        if predictor is None and stored is None and predictor_loading():
+            with st.spinner("⏳ Cargando modelo..."):
+                predictor = load_nba_predictor(wait=True)
+        if predictor or stored is not None:
             with st.spinner("🤖 Generando predicciones avanzadas..."):
-                show_advanced_prediction(home_team, away_team, df_nba, predictor)
+                show_advanced_prediction(home_team, away_team, df_nba, predictor, stored=stored)
         else:
             st.warning("⚠️ Modelo no disponible. Mostrando análisis básico...")
             show_basic_analysis(df_nba)
@@ -494,100 +744,62 @@ def render_nba_tab():
     # Últimos partidos
     st.markdown("### 📋 Últimos Partidos Reales")
 
-    if len(df_nba) > 0:
-        # Detectar columna de fecha
-        date_col = 'GAME_DATE' if 'GAME_DATE' in df_nba.columns else 'game_date'
-
-        if date_col in df_nba.columns:
-            # Filtrar solo partidos hasta hoy (eliminar proyecciones futuras)
-            from datetime import datetime
-            today = pd.Timestamp(datetime.now())
-            df_past = df_nba[pd.to_datetime(df_nba[date_col]) <= today].copy()
-            
-            if len(df_past) == 0:
-                st.warning("⚠️ No hay partidos históricos disponibles. Los datos parecen ser proyecciones futuras.")
-                df_past = df_nba  # Usar todos los datos si no hay históricos
-            
-            # Ordenar por fecha descendente y tomar últimos 10
-            recent = df_past.sort_values(date_col, ascending=False).head(10)
-
-            # Determinar columnas a mostrar según tipo de datos
-            if 'HOME_TEAM_NAME' in df_nba.columns:
-                # Agregar columna de ganador
-                def get_winner(row):
-                    if row['HOME_PTS'] > row['AWAY_PTS']:
-                        return f"🏆 {row['HOME_TEAM_NAME']}"
-                    else:
-                        return f"🏆 {row['AWAY_TEAM_NAME']}"
-                
-                recent_display = recent.copy()
-                recent_display['Ganador'] = recent.apply(get_winner, axis=1)
-                recent_display['Resultado'] = recent['HOME_PTS'].astype(str) + ' - ' + recent['AWAY_PTS'].astype(str)
-                
-                display_cols = [date_col, 'HOME_TEAM_NAME', 'AWAY_TEAM_NAME', 'Resultado', 'Ganador']
-                rename_dict = {
-                    date_col: 'Fecha',
-                    'HOME_TEAM_NAME': 'Local',
-                    'AWAY_TEAM_NAME': 'Visitante',
-                }
-            else:
-                display_cols = [date_col, 'home_team', 'home_score', 'away_score', 'away_team']
-                rename_dict = {
-                    date_col: 'Fecha',
-                    'home_team': 'Local',
-                    'home_score': 'Pts Local',
-                    'away_score': 'Pts Visitante',
-                    'away_team': 'Visitante'
-                }
-                recent_display = recent
-
-            available_cols = [col for col in display_cols if col in recent_display.columns]
-
-            if available_cols:
-                display_df = recent_display[available_cols].rename(columns=rename_dict)
-                
-                # Formatear fecha
-                if 'Fecha' in display_df.columns:
-                    display_df['Fecha'] = pd.to_datetime(display_df['Fecha']).dt.strftime('%Y-%m-%d')
-                
-                st.dataframe(display_df, use_container_width=True, height=400)
-                
-                # Mostrar info de fechas
-                fecha_min = pd.to_datetime(df_past[date_col]).min()
-                fecha_max = pd.to_datetime(df_past[date_col]).max()
-                st.caption(f"📅 Rango de datos: {fecha_min.strftime('%Y-%m-%d')} a {fecha_max.strftime('%Y-%m-%d')} ({len(df_past):,} partidos)")
+    if aggregates.date_range is not None:
+        if aggregates.only_future:
+            st.warning("⚠️ No hay partidos históricos disponibles. Los datos parecen ser proyecciones futuras.")
+
+        # Últimos 10 ya jugados (posiciones precalculadas)
+        recent = aggregates.recent_games()
+
+        # Determinar columnas a mostrar según tipo de datos
+        if 'HOME_TEAM_NAME' in df_nba.columns:
+            display_df = pd.DataFrame({
+                'Fecha': recent[date_col].values,
+                'Local': recent['HOME_TEAM_NAME'].values,
+                'Visitante': recent['AWAY_TEAM_NAME'].values,
+                'Resultado': (recent['HOME_PTS'].astype(str) + ' - ' + recent['AWAY_PTS'].astype(str)).values,
+                'Ganador': ['🏆 ' + team for team in np.where(
+                    recent['HOME_PTS'] > recent['AWAY_PTS'], recent['HOME_TEAM_NAME'], recent['AWAY_TEAM_NAME'])],
+            }, index=recent.index)
         else:
-            st.info("No hay información de fechas disponible")
-
-    # Gráfico de distribución de puntos
+            display_cols = [date_col, 'home_team', 'home_score', 'away_score', 'away_team']
+            rename_dict = {
+                date_col: 'Fecha',
+                'home_team': 'Local',
+                'home_score': 'Pts Local',
+                'away_score': 'Pts Visitante',
+                'away_team': 'Visitante'
+            }
+            display_df = recent[[col for col in display_cols if col in recent.columns]].rename(columns=rename_dict)
+
+        # Formatear fecha
+        display_df['Fecha'] = pd.to_datetime(display_df['Fecha']).dt.strftime('%Y-%m-%d')
+        st.dataframe(display_df, use_container_width=True, height=400)
+
+        # Mostrar info de fechas
+        fecha_min, fecha_max = aggregates.date_range
+        st.caption(f"📅 Rango de datos: {fecha_min.strftime('%Y-%m-%d')} a {fecha_max.strftime('%Y-%m-%d')} ({aggregates.n_past:,} partidos)")
+    elif aggregates.n_games > 0:
+        st.info("No hay información de fechas disponible")
+
+    # Gráfico de distribución de puntos (conteos ya binneados, no los partidos)
     st.markdown("### 📊 Distribución de Puntos")
 
-    # Detectar columnas de puntos
-    home_pts_col = 'HOME_PTS' if 'HOME_PTS' in df_nba.columns else 'home_score'
-    away_pts_col = 'AWAY_PTS' if 'AWAY_PTS' in df_nba.columns else 'away_score'
-
-    if home_pts_col in df_nba.columns and away_pts_col in df_nba.columns:
+    if aggregates.histograms:
         col1, col2 = st.columns(2)
 
         with col1:
-            fig_home = px.histogram(df_nba, x=home_pts_col,
-                                   title='Distribución Puntos Local',
-                                   nbins=30,
-                                   color_discrete_sequence=['#4ECDC4'])
-            fig_home.update_layout(height=300)
-            st.plotly_chart(fig_home, use_container_width=True)
+            st.plotly_chart(points_histogram(aggregates, 'home', 'Distribución Puntos Local', '#4ECDC4'),
+                            use_container_width=True)
 
         with col2:
-            fig_away = px.histogram(df_nba, x=away_pts_col,
-                                   title='Distribución Puntos Visitante',
-                                   nbins=30,
-                                   color_discrete_sequence=['#FF6B6B'])
-            fig_away.update_layout(height=300)
-            st.plotly_chart(fig_away, use_container_width=True)
+            st.plotly_chart(points_histogram(aggregates, 'away', 'Distribución Puntos Visitante', '#FF6B6B'),
+                            use_container_width=True)
 
 # Función principal
 def main():
     """Función principal del dashboard"""
+    start_metrics_exporter()
 
     # Header
     st.markdown('<h1 class="main-header">🏀 SISTEMA DE PREDICCIONES NBA AVANZADO 🏀</h1>',
@@ -600,9 +812,12 @@ def main():
 
         # Estado del sistema
         st.markdown("### 📊 Estado del Sistema")
+        # El modelo carga en segundo plano: la primera pintura no lo espera
         predictor = load_nba_predictor()
         if predictor:
             st.success("✅ NBA: Operacional (72.6%)")
+        elif predictor_loading():
+            st.info("⏳ NBA: cargando modelo...")
         else:
             st.error("❌ NBA: Modelo no disponible")
 
@@ -611,9 +826,9 @@ def main():
         st.markdown("### 📈 Estadísticas")
         df_nba = load_nba_data()
         if not df_nba.empty:
-            teams = set(df_nba['HOME_TEAM_NAME'].unique()) | set(df_nba['AWAY_TEAM_NAME'].unique())
-            st.metric("Total Partidos", f"{len(df_nba):,}")
-            st.metric("Equipos NBA", len(teams))
+            aggregates = get_aggregates(df_nba)
+            st.metric("Total Partidos", f"{aggregates.n_games:,}")
+            st.metric("Equipos NBA", aggregates.n_teams)
             st.metric("Modelo ML", "3 algoritmos" if predictor else "No disponible")
 
         st.markdown("---")
@@ -624,8 +839,11 @@ def main():
         if show_advanced:
             st.selectbox("Modo de predicción", ["Tiempo Real", "Histórico"])
 
-    # Contenido principal - Solo NBA
-    render_nba_tab()
+    # Contenido principal - Solo NBA (mismos datos y modelo que el sidebar)
+    render_nba_tab(df_nba, predictor)
+
+    # Página ya pintada: el modelo se carga en segundo plano para la siguiente interacción
+    get_model_warmup().start()
 
     # Footer
     st.markdown("---")
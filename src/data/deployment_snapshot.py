@@ -0,0 +1,155 @@
+"""
+Foto compacta para despliegue: estado de cada equipo y resultados recientes.
+
+Sustituye al Parquet de los últimos 2,000 partidos: el predictor solo
+necesita el estado de cada equipo tras su último partido (lo que calcula
+`build_team_states`) y la interfaz solo muestra resultados (H2H y últimos
+partidos). Se guarda en un directorio con dos Parquet zstd:
+
+    team_states.parquet   una fila por equipo (float32 donde no pierde precisión)
+    recent_games.parquet  fecha, equipos (categóricos) y puntos (int16)
+    meta.json             versión del origen, fecha de corte, tamaños
+"""
+
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.features.matchup_features import build_team_states
+
+
+_STATES_NAME = 'team_states.parquet'
+_GAMES_NAME = 'recent_games.parquet'
+_META_NAME = 'meta.json'
+
+# Columnas de la tabla de resultados (las que usan H2H y "últimos partidos")
+GAME_COLUMNS = ('GAME_ID', 'GAME_DATE', 'HOME_TEAM_NAME', 'AWAY_TEAM_NAME', 'HOME_PTS', 'AWAY_PTS')
+
+
+def compact_float(values: pd.Series) -> pd.Series:
+    """
+    float32 si la columna vuelve idéntica a float64; si no, float64.
+
+    Los cortes de los árboles de XGBoost están en valores vistos al entrenar:
+    redondear ELO o porcentajes a float32 mueve partidos de rama (probabilidades
+    distintas en ~0.04). Conteos y medias de enteros pequeños sí caben exactos.
+    """
+    values = values.astype(np.float64)
+    narrow = values.astype(np.float32)
+    return narrow if np.array_equal(narrow.to_numpy(np.float64), values.to_numpy(), equal_nan=True) else values
+
+
+def is_deployment_snapshot(path) -> bool:
+    """True si `path` es un directorio escrito por `DeploymentSnapshot.save`."""
+    return Path(path).is_dir() and (Path(path) / _STATES_NAME).exists()
+
+
+class DeploymentSnapshot:
+    """
+    Estados de equipo + resultados recientes, con tipos compactos.
+
+    `states` está indexado por equipo con las columnas de `build_team_states`
+    (ver `compact_float`: las predicciones son las mismas que con el histórico).
+    `games` lleva GAME_COLUMNS con los equipos como categóricos.
+    """
+
+    def __init__(self, states: pd.DataFrame, games: pd.DataFrame, meta: Optional[Dict] = None):
+        self.states = states
+        self.games = games
+        self.meta = meta or {}
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        recent_games: int = 2000,
+        source_version: Optional[str] = None
+    ) -> 'DeploymentSnapshot':
+        """
+        Construye la foto a partir del histórico con features.
+
+        Los estados se calculan sobre todo `df` (no solo los partidos recientes).
+
+        Args:
+            df: Histórico con features (partidos ya jugados)
+            recent_games: Partidos que se guardan para H2H y últimos partidos
+            source_version: Huella del archivo de origen
+        """
+        states = build_team_states(df).apply(compact_float)
+        states.index.name = 'TEAM'
+
+        recent = df.sort_values('GAME_DATE', kind='mergesort').tail(recent_games)
+        teams = pd.CategoricalDtype(sorted(set(recent['HOME_TEAM_NAME']) | set(recent['AWAY_TEAM_NAME'])))
+        games = pd.DataFrame({
+            column: recent[column].values for column in GAME_COLUMNS if column in recent.columns
+        })
+        games['GAME_DATE'] = pd.to_datetime(games['GAME_DATE'])
+        games['HOME_TEAM_NAME'] = games['HOME_TEAM_NAME'].astype(teams)
+        games['AWAY_TEAM_NAME'] = games['AWAY_TEAM_NAME'].astype(teams)
+        for column in ('HOME_PTS', 'AWAY_PTS'):
+            games[column] = games[column].astype(np.int16)
+
+        meta = {
+            'source_version': source_version,
+            'as_of': str(pd.to_datetime(df['GAME_DATE']).max().date()),
+            'n_teams': len(states),
+            'n_games': len(games),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        return cls(states, games, meta)
+
+    def save(self, directory: str) -> Dict[str, int]:
+        """
+        Escribe la foto de forma atómica (directorio temporal + rename).
+
+        Returns:
+            Bytes de cada archivo
+        """
+        directory = Path(directory)
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        staging = directory.with_name(f'.{directory.name}.{uuid.uuid4().hex}')
+        staging.mkdir()
+        try:
+            self.states.to_parquet(staging / _STATES_NAME, compression='zstd')
+            self.games.to_parquet(staging / _GAMES_NAME, compression='zstd', index=False)
+            (staging / _META_NAME).write_text(json.dumps(self.meta, indent=2))
+            # Sustituir la foto anterior: se aparta, se publica la nueva y se borra la vieja
+            previous = directory.with_name(f'.{directory.name}.old.{uuid.uuid4().hex}')
+            if directory.exists():
+                os.replace(directory, previous)
+            os.replace(staging, directory)
+            shutil.rmtree(previous, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return {path.name: path.stat().st_size for path in directory.iterdir()}
+
+    @classmethod
+    def load(cls, directory: str) -> 'DeploymentSnapshot':
+        """Lee una foto guardada (dos Parquet pequeños: milisegundos)."""
+        directory = Path(directory)
+        meta = json.loads((directory / _META_NAME).read_text()) if (directory / _META_NAME).exists() else {}
+        return cls(
+            states=pd.read_parquet(directory / _STATES_NAME),
+            games=pd.read_parquet(directory / _GAMES_NAME),
+            meta=meta
+        )
+
+    def team_states(self, data_version: Optional[str] = None):
+        """Estados como `TeamStateSnapshot` (lo que usan la API y el job del calendario)."""
+        from src.features.state_snapshot import TeamStateSnapshot
+        return TeamStateSnapshot(
+            values=self.states.to_numpy(dtype=np.float64),
+            teams=list(self.states.index),
+            columns=list(self.states.columns),
+            data_version=data_version,
+            as_of=self.meta.get('as_of'),
+        )
+
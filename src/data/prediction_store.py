@@ -0,0 +1,152 @@
+"""
+Predicciones precalculadas del calendario en un dataset Parquet particionado.
+
+El job nocturno (`scripts/predict_slate.py`) escribe una partición por fecha
+de partido (`data/predictions/game_date=YYYY-MM-DD/`); el dashboard y otros
+consumidores leen de aquí sin cargar el modelo. Este módulo solo depende de
+pandas y pyarrow.
+"""
+
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data.versioning import file_fingerprint
+
+
+DEFAULT_ROOT = 'data/predictions'
+
+# Columnas obligatorias del calendario (mismo formato que simulate_season --schedule)
+SCHEDULE_COLUMNS = ('GAME_DATE', 'HOME_TEAM_NAME', 'AWAY_TEAM_NAME')
+
+
+def load_schedule(path: str) -> pd.DataFrame:
+    """
+    Lee el calendario de partidos pendientes (CSV o Parquet).
+
+    Args:
+        path: Archivo con GAME_DATE, HOME_TEAM_NAME, AWAY_TEAM_NAME (GAME_ID opcional)
+
+    Returns:
+        DataFrame ordenado por fecha, con GAME_DATE como datetime
+    """
+    path = Path(path)
+    schedule = pd.read_csv(path) if path.suffix == '.csv' else pd.read_parquet(path)
+    missing = [c for c in SCHEDULE_COLUMNS if c not in schedule.columns]
+    if missing:
+        raise ValueError(f"Faltan columnas en el calendario {path}: {missing}")
+    schedule['GAME_DATE'] = pd.to_datetime(schedule['GAME_DATE']).dt.normalize()
+    return schedule.sort_values('GAME_DATE', kind='mergesort').reset_index(drop=True)
+
+
+def drivers_columns(frame: pd.DataFrame, contributions: pd.DataFrame, k: int = 5) -> pd.DataFrame:
+    """
+    Añade a `frame` los k factores con más peso de cada fila de `contributions`.
+
+    Versión vectorizada de `top_drivers` para un lote: columnas `driver_i`
+    (nombre) y `driver_i_contribution` (log-odds, positivo favorece al local).
+    """
+    contributions = contributions.drop(columns='BIAS', errors='ignore')
+    values = contributions.to_numpy(dtype=np.float64)
+    k = min(k, values.shape[1])
+    order = np.argsort(-np.abs(values), axis=1, kind='stable')[:, :k]
+    names = np.asarray(contributions.columns, dtype=object)[order]
+    top = np.take_along_axis(values, order, axis=1)
+
+    frame = frame.copy()
+    for i in range(k):
+        frame[f'driver_{i + 1}'] = names[:, i]
+        frame[f'driver_{i + 1}_contribution'] = top[:, i]
+    return frame
+
+
+def stored_drivers(row: pd.Series) -> Optional[pd.DataFrame]:
+    """Factores de una fila guardada, con el formato de `top_drivers` (None si no hay)."""
+    drivers, contributions = [], []
+    i = 1
+    while f'driver_{i}' in row.index:
+        if isinstance(row[f'driver_{i}'], str):
+            drivers.append(row[f'driver_{i}'])
+            contributions.append(float(row[f'driver_{i}_contribution']))
+        i += 1
+    if not drivers:
+        return None
+    contributions = np.array(contributions)
+    return pd.DataFrame({
+        'driver': drivers,
+        'contribution': contributions,
+        'favors': np.where(contributions >= 0, 'home', 'away'),
+    })
+
+
+def write_predictions(frame: pd.DataFrame, root: str = DEFAULT_ROOT) -> List[str]:
+    """
+    Escribe las predicciones particionadas por `game_date`.
+
+    Solo se reemplazan las particiones de las fechas presentes en `frame`:
+    volver a lanzar el job para un día no toca los demás.
+
+    Returns:
+        Fechas (YYYY-MM-DD) escritas
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    frame = frame.copy()
+    frame['game_date'] = pd.to_datetime(frame['game_date']).dt.strftime('%Y-%m-%d')
+    Path(root).mkdir(parents=True, exist_ok=True)
+    ds.write_dataset(
+        pa.Table.from_pandas(frame, preserve_index=False),
+        root,
+        format='parquet',
+        partitioning=ds.partitioning(pa.schema([('game_date', pa.string())]), flavor='hive'),
+        basename_template='predictions-{i}.parquet',
+        existing_data_behavior='delete_matching',
+    )
+    return sorted(frame['game_date'].unique())
+
+
+def read_predictions(
+    root: str = DEFAULT_ROOT,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Lee predicciones guardadas (solo las particiones del rango pedido).
+
+    Args:
+        root: Directorio del dataset
+        start, end: Rango de fechas de partido, inclusivo (None = sin límite)
+        columns: Columnas a leer (None = todas)
+
+    Returns:
+        DataFrame ordenado por fecha y local (vacío si no hay dataset)
+    """
+    if not Path(root).is_dir():
+        return pd.DataFrame()
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(root, format='parquet', partitioning='hive')
+    condition = None
+    # Las particiones son cadenas YYYY-MM-DD: el orden lexicográfico es el cronológico
+    if start is not None:
+        condition = ds.field('game_date') >= pd.Timestamp(start).strftime('%Y-%m-%d')
+    if end is not None:
+        upper = ds.field('game_date') <= pd.Timestamp(end).strftime('%Y-%m-%d')
+        condition = upper if condition is None else condition & upper
+    if columns is not None and 'game_date' not in columns:
+        columns = ['game_date', *columns]
+
+    frame = dataset.to_table(columns=columns, filter=condition).to_pandas()
+    if frame.empty:
+        return frame
+    frame['game_date'] = pd.to_datetime(frame['game_date'])
+    return frame.sort_values(['game_date', 'home_team'], kind='mergesort').reset_index(drop=True)
+
+
+def predictions_version(root: str = DEFAULT_ROOT) -> Optional[str]:
+    """Huella del dataset (cambia con cada ejecución del job)."""
+    return file_fingerprint(root)
@@ -0,0 +1,235 @@
+"""
+Resolución de nombres de equipo: alias exactos + índice de trigramas.
+
+Se construye una vez a partir de la lista de equipos de los datos y
+devuelve el nombre canónico (el que usan los datos y el predictor) para
+consultas como "lakers", "LAL", "Los Ángeles Lakers", "Nueva York" o
+"celtcs". La CLI, el dashboard y la API comparten la misma clase.
+
+    resolver = TeamResolver(teams)
+    resolver.resolve('celtcs')        # 'Boston Celtics'
+    resolver.search('los angeles')    # [('LA Clippers', 1.0), ('Los Angeles Lakers', 1.0)]
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Nombre completo -> (ciudad, apodo, abreviatura, otros alias)
+# Los otros alias incluyen nombres antiguos, apodos cortos y variantes en español.
+NBA_TEAMS: Dict[str, Tuple[str, str, str, Tuple[str, ...]]] = {
+    'Atlanta Hawks': ('Atlanta', 'Hawks', 'ATL', ('halcones',)),
+    'Boston Celtics': ('Boston', 'Celtics', 'BOS', ('celtas', 'celts')),
+    'Brooklyn Nets': ('Brooklyn', 'Nets', 'BKN', ('new jersey nets', 'brooklin')),
+    'Charlotte Hornets': ('Charlotte', 'Hornets', 'CHA', ('charlotte bobcats', 'avispones')),
+    'Chicago Bulls': ('Chicago', 'Bulls', 'CHI', ('toros',)),
+    'Cleveland Cavaliers': ('Cleveland', 'Cavaliers', 'CLE', ('cavs', 'caballeros')),
+    'Dallas Mavericks': ('Dallas', 'Mavericks', 'DAL', ('mavs',)),
+    'Denver Nuggets': ('Denver', 'Nuggets', 'DEN', ('pepitas',)),
+    'Detroit Pistons': ('Detroit', 'Pistons', 'DET', ('pistones',)),
+    'Golden State Warriors': ('Golden State', 'Warriors', 'GSW', ('gs warriors', 'dubs', 'guerreros')),
+    'Houston Rockets': ('Houston', 'Rockets', 'HOU', ('cohetes',)),
+    'Indiana Pacers': ('Indiana', 'Pacers', 'IND', ()),
+    'LA Clippers': ('Los Angeles', 'Clippers', 'LAC', ('los angeles clippers', 'clips')),
+    'Los Angeles Lakers': ('Los Angeles', 'Lakers', 'LAL', ('la lakers', 'lagos')),
+    'Memphis Grizzlies': ('Memphis', 'Grizzlies', 'MEM', ('grizzlis', 'osos')),
+    'Miami Heat': ('Miami', 'Heat', 'MIA', ('calor',)),
+    'Milwaukee Bucks': ('Milwaukee', 'Bucks', 'MIL', ('ciervos',)),
+    'Minnesota Timberwolves': ('Minnesota', 'Timberwolves', 'MIN', ('wolves', 'lobos')),
+    'New Orleans Pelicans': ('New Orleans', 'Pelicans', 'NOP', ('nueva orleans', 'pels', 'pelicanos')),
+    'New York Knicks': ('New York', 'Knicks', 'NYK', ('nueva york', 'ny knicks')),
+    'Oklahoma City Thunder': ('Oklahoma City', 'Thunder', 'OKC', ('oklahoma', 'truenos')),
+    'Orlando Magic': ('Orlando', 'Magic', 'ORL', ('magia',)),
+    'Philadelphia 76ers': ('Philadelphia', '76ers', 'PHI', ('sixers', 'filadelfia', 'philly')),
+    'Phoenix Suns': ('Phoenix', 'Suns', 'PHX', ('fenix', 'soles')),
+    'Portland Trail Blazers': ('Portland', 'Trail Blazers', 'POR', ('blazers',)),
+    'Sacramento Kings': ('Sacramento', 'Kings', 'SAC', ('reyes',)),
+    'San Antonio Spurs': ('San Antonio', 'Spurs', 'SAS', ('espuelas',)),
+    'Toronto Raptors': ('Toronto', 'Raptors', 'TOR', ('raptores',)),
+    'Utah Jazz': ('Utah', 'Jazz', 'UTA', ()),
+    'Washington Wizards': ('Washington', 'Wizards', 'WAS', ('magos',)),
+}
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+_MATCHUP_SEPARATOR = re.compile(r'\s+(vs\.?|v|contra|@|-)\s+', re.IGNORECASE)
+
+
+def normalize(text: str) -> str:
+    """Minúsculas, sin acentos ni puntuación y con espacios simples ("Los Ángeles" -> "los angeles")."""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return _NON_ALNUM.sub(' ', text.casefold()).strip()
+
+
+def split_matchup(query: str) -> Optional[Tuple[str, str]]:
+    """"Lakers vs Celtics" (también "-", "contra" o "@") -> (local, visitante) sin resolver, o None."""
+    parts = _MATCHUP_SEPARATOR.split(query.strip(), maxsplit=1)
+    if len(parts) != 3:
+        return None
+    first, separator, second = parts
+    # "visitante @ local"
+    return (second, first) if separator == '@' else (first, second)
+
+
+def trigrams(text: str) -> set:
+    """Trigramas de `text` ya normalizado, con los bordes de cada palabra marcados."""
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def dice(a: set, b: set) -> float:
+    """Coeficiente de Dice entre dos conjuntos de trigramas."""
+    return 2 * len(a & b) / (len(a) + len(b)) if a or b else 0.0
+
+
+class TeamResolver:
+    """
+    Traduce consultas de texto al nombre canónico de un equipo.
+
+    1. Alias exacto (dict): nombre, ciudad, apodo, abreviatura y variantes de
+       `NBA_TEAMS`, normalizados. Es el camino habitual: microsegundos.
+    2. Si no hay alias exacto, se ordenan los alias por coeficiente de Dice
+       de trigramas (tolera erratas y nombres parciales). Solo se consultan
+       los alias que comparten algún trigrama con la consulta.
+
+    `resolve` solo acepta una coincidencia aproximada clara: consulta de al
+    menos `min_length` caracteres, ventaja de `min_margin` sobre el segundo
+    equipo y todas las palabras de la consulta parecidas a alguna palabra de
+    los alias del equipo ("Boston Red Sox" no es "Boston Celtics"). Si no,
+    devuelve None y `search` da las sugerencias.
+
+    Los alias que apuntan a varios equipos ("los angeles") no resuelven a
+    ninguno: `search` devuelve todos los candidatos.
+    """
+
+    def __init__(
+        self,
+        teams: Iterable[str],
+        min_score: float = 0.45,
+        min_length: int = 4,
+        min_margin: float = 0.15
+    ):
+        """
+        Args:
+            teams: Nombres de equipo tal como están en los datos (son el ID canónico)
+            min_score: Similitud mínima para aceptar una coincidencia aproximada
+            min_length: Caracteres mínimos (normalizados) de una consulta aproximada
+            min_margin: Ventaja mínima de similitud sobre el segundo equipo
+        """
+        self.teams = sorted({team for team in teams if isinstance(team, str) and team.strip()})
+        self.min_score = min_score
+        self.min_length = min_length
+        self.min_margin = min_margin
+
+        known = {}
+        for name, (city, nickname, abbreviation, extra) in NBA_TEAMS.items():
+            for alias in (name, f'{city} {nickname}', *extra):
+                known.setdefault(normalize(alias), name)
+
+        aliases: Dict[str, set] = defaultdict(set)
+        for team in self.teams:
+            aliases[normalize(team)].add(team)
+            entry = known.get(normalize(team))
+            if entry is None:
+                continue
+            city, nickname, abbreviation, extra = NBA_TEAMS[entry]
+            for alias in (entry, city, nickname, abbreviation, f'{city} {nickname}', *extra):
+                aliases[normalize(alias)].add(team)
+
+        # Alias -> equipos; el dict exacto solo guarda los que son de un equipo
+        self._aliases = {alias: sorted(owners) for alias, owners in aliases.items()}
+        self._exact = {alias: owners[0] for alias, owners in self._aliases.items() if len(owners) == 1}
+        self._alias_list = list(self._aliases)
+        self._alias_grams = [trigrams(alias) for alias in self._alias_list]
+        self._index: Dict[str, List[int]] = defaultdict(list)
+        for i, grams in enumerate(self._alias_grams):
+            for gram in grams:
+                self._index[gram].append(i)
+
+        # Palabras de los alias de cada equipo (con sus trigramas)
+        self._words: Dict[str, Dict[str, set]] = defaultdict(dict)
+        for alias, owners in self._aliases.items():
+            for team in owners:
+                for word in alias.split():
+                    self._words[team][word] = trigrams(word)
+
+    def __len__(self) -> int:
+        return len(self.teams)
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Equipos más parecidos a `query` con su similitud (1.0 = alias exacto).
+
+        Returns:
+            Lista de (equipo, similitud) de mayor a menor, como mucho `limit`
+        """
+        key = normalize(query)
+        if not key:
+            return []
+        if key in self._aliases:
+            return [(team, 1.0) for team in self._aliases[key][:limit]]
+        ranked = self._rank(key)
+        return [(team, round(score, 3)) for team, score in ranked[:limit] if score >= self.min_score]
+
+    def _rank(self, key: str) -> List[Tuple[str, float]]:
+        """Todos los equipos con algún trigrama en común, de más a menos parecido."""
+        grams = trigrams(key)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for i in self._index.get(gram, ()):
+                shared[i] += 1
+
+        best: Dict[str, float] = {}
+        for i, count in shared.items():
+            score = 2 * count / (len(grams) + len(self._alias_grams[i]))
+            for team in self._aliases[self._alias_list[i]]:
+                if score > best.get(team, 0.0):
+                    best[team] = score
+        return sorted(best.items(), key=lambda item: (-item[1], item[0]))
+
+    def _covers(self, team: str, key: str) -> bool:
+        """True si cada palabra de `key` empieza o se parece a una palabra de los alias de `team`."""
+        words = self._words[team]
+        for word in key.split():
+            grams = trigrams(word)
+            if not any(
+                candidate.startswith(word) or dice(grams, candidate_grams) >= self.min_score
+                for candidate, candidate_grams in words.items()
+            ):
+                return False
+        return True
+
+    def resolve(self, query: str) -> Optional[str]:
+        """
+        Nombre canónico del equipo, o None si no hay coincidencia clara.
+
+        Una coincidencia aproximada solo se acepta si es clara (ver la
+        descripción de la clase).
+        """
+        key = normalize(query)
+        team = self._exact.get(key)
+        if team is not None:
+            return team
+        if len(key.replace(' ', '')) < self.min_length or key in self._aliases:
+            return None
+
+        ranked = self._rank(key)
+        if not ranked or ranked[0][1] < self.min_score:
+            return None
+        team, score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        if score - runner_up < self.min_margin or not self._covers(team, key):
+            return None
+        return team
+
+    def resolve_matchup(self, query: str) -> Optional[Tuple[str, str]]:
+        """Partido escrito como texto (ver `split_matchup`) -> (local, visitante) canónicos, o None."""
+        sides = split_matchup(query)
+        if sides is None:
+            return None
+        home, away = self.resolve(sides[0]), self.resolve(sides[1])
+        if home is None or away is None or home == away:
+            return None
+        return home, away
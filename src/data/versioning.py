@@ -0,0 +1,34 @@
+"""Huellas de versión de archivos de datos y modelos."""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional
+
+
+def file_fingerprint(path: Optional[str]) -> Optional[str]:
+    """
+    Huella barata de un archivo (o directorio particionado).
+
+    Combina ruta absoluta, tamaño y mtime en nanosegundos, de modo que
+    cualquier reescritura del archivo produce una versión distinta sin
+    necesidad de leer su contenido. En un directorio se recorren todos
+    los archivos que contiene.
+
+    Args:
+        path: Ruta al archivo o directorio
+
+    Returns:
+        Hash hexadecimal de 16 caracteres, o None si la ruta no existe
+    """
+    if path is None or not os.path.exists(path):
+        return None
+
+    root = Path(path).resolve()
+    files = sorted(p for p in root.rglob('*') if p.is_file()) if root.is_dir() else [root]
+
+    digest = hashlib.sha1()
+    for file in files:
+        stat = file.stat()
+        digest.update(f"{file}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()[:16]
@@ -0,0 +1 @@
+"""Módulo de métricas y validación temporal."""
@@ -0,0 +1,323 @@
+"""Backtesting walk-forward para los modelos NBA."""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.models.nba_predictor import NBAPredictor, compute_metrics
+from src.features.matrix_cache import TrainingMatrix, ID_COLUMNS
+
+
+PERIODS = ('season', 'month')
+WINDOWS = ('expanding', 'sliding')
+
+# Métricas que se reportan por fold y agregadas
+REPORT_METRICS = [
+    'win_accuracy', 'win_log_loss', 'win_brier_score', 'win_roc_auc',
+    'margin_mae', 'margin_r2', 'total_mae', 'total_r2',
+]
+
+
+def period_labels(dates: pd.Series, period: str = 'season') -> pd.Series:
+    """
+    Etiqueta cada partido con su periodo de backtesting.
+
+    Args:
+        dates: Fechas de los partidos
+        period: 'season' (temporada NBA, ej. '2023-24') o 'month' (ej. '2024-01')
+
+    Returns:
+        Serie con la etiqueta de periodo de cada partido
+    """
+    dates = pd.to_datetime(dates)
+
+    if period == 'season':
+        # La temporada NBA arranca en octubre: agosto-diciembre pertenece al año de inicio
+        start_year = dates.dt.year.where(dates.dt.month >= 8, dates.dt.year - 1)
+        return start_year.astype(str) + '-' + (start_year + 1).astype(str).str[-2:]
+
+    if period == 'month':
+        return dates.dt.to_period('M').astype(str)
+
+    raise ValueError(f"Periodo no soportado: {period} (usa uno de {PERIODS})")
+
+
+def _run_refit_block(task: Dict) -> List[Dict]:
+    """
+    Entrena una vez y predice todos los periodos de test de un bloque de refit.
+
+    Se ejecuta en un proceso del pool, por eso vive a nivel de módulo. Con
+    una matriz cacheada la tarea solo lleva rutas e índices de filas y el
+    worker abre los .npy con mmap.
+    """
+    columns = task['columns']
+
+    if 'paths' in task:
+        arrays = {name: np.load(path, mmap_mode='r') for name, path in task['paths'].items()}
+        train_rows = task['train_rows']
+        X_train = arrays['X'][train_rows]
+        y_train = {name: arrays[name][train_rows] for name in ('y_win', 'y_margin', 'y_total')}
+        for test in task['tests']:
+            test['X'] = arrays['X'][test['rows']]
+    else:
+        X_train = task['X_train']
+        y_train = {name: task[f'{name}_train'] for name in ('y_win', 'y_margin', 'y_total')}
+
+    predictor = NBAPredictor()
+    predictor.feature_columns = columns
+    predictor.fit(
+        pd.DataFrame(X_train, columns=columns),
+        y_train['y_win'],
+        y_train['y_margin'],
+        y_train['y_total'],
+        random_state=task['random_state'],
+        n_jobs=task['n_jobs'],
+        verbose=False
+    )
+
+    results = []
+    for test in task['tests']:
+        preds = predictor.predict(pd.DataFrame(test['X'], columns=columns))
+        results.append({
+            'fold': test['fold'],
+            'period': test['period'],
+            'rows': test['rows'],
+            'win_proba': preds['win_probability'],
+            'margin_pred': preds['point_margin'],
+            'total_pred': preds['total_points'],
+        })
+
+    return results
+
+
+class WalkForwardBacktester:
+    """
+    Backtesting walk-forward con ventanas por temporada o por mes.
+
+    Cada periodo de test se evalúa con un modelo entrenado solo con periodos
+    anteriores. Los bloques de refit son independientes entre sí, así que se
+    reparten en un pool de procesos.
+    """
+
+    def __init__(
+        self,
+        period: str = 'season',
+        window: str = 'expanding',
+        train_periods: Optional[int] = None,
+        min_train_periods: int = 1,
+        refit_every: int = 1,
+        n_workers: Optional[int] = None,
+        random_state: int = 42
+    ):
+        """
+        Args:
+            period: Granularidad de los folds ('season' o 'month')
+            window: 'expanding' (todo el histórico) o 'sliding' (últimos N periodos)
+            train_periods: Periodos de entrenamiento en ventana deslizante
+            min_train_periods: Periodos mínimos antes del primer fold de test
+            refit_every: Cada cuántos periodos de test se reentrena el modelo
+            n_workers: Procesos del pool (None = todos los núcleos)
+            random_state: Semilla aleatoria
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Periodo no soportado: {period} (usa uno de {PERIODS})")
+        if window not in WINDOWS:
+            raise ValueError(f"Ventana no soportada: {window} (usa una de {WINDOWS})")
+        if window == 'sliding' and not train_periods:
+            raise ValueError("La ventana deslizante requiere train_periods")
+        if refit_every < 1 or min_train_periods < 1:
+            raise ValueError("refit_every y min_train_periods deben ser >= 1")
+
+        self.period = period
+        self.window = window
+        self.train_periods = train_periods
+        # En ventana deslizante el primer fold necesita la ventana completa
+        self.min_train_periods = max(min_train_periods, train_periods) if window == 'sliding' else min_train_periods
+        self.refit_every = refit_every
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.random_state = random_state
+
+    def make_folds(self, periods: List[str]) -> List[Dict]:
+        """
+        Construye los bloques de refit a partir de la lista ordenada de periodos.
+
+        Returns:
+            Lista de bloques con periodos de entrenamiento y de test
+        """
+        blocks = []
+        fold = 0
+
+        for start in range(self.min_train_periods, len(periods), self.refit_every):
+            if self.window == 'expanding':
+                train = periods[:start]
+            else:
+                train = periods[start - self.train_periods:start]
+
+            test = periods[start:start + self.refit_every]
+            blocks.append({
+                'block': len(blocks),
+                'train_periods': list(train),
+                'test_periods': list(test),
+                'folds': list(range(fold, fold + len(test))),
+            })
+            fold += len(test)
+
+        return blocks
+
+    def run(
+        self,
+        df: Optional[pd.DataFrame] = None,
+        matrix: Optional[TrainingMatrix] = None
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Ejecuta el backtest completo.
+
+        Args:
+            df: DataFrame procesado con features y targets
+            matrix: Matriz ya preparada (ej. `load_training_matrix`); si está
+                en disco, los workers la abren con mmap en vez de recibir copias
+
+        Returns:
+            (report, predictions): métricas por fold y agregadas, y
+            predicciones fuera de muestra partido a partido
+        """
+        if matrix is None:
+            matrix = TrainingMatrix.from_frame(df)
+        columns = matrix.columns
+
+        # La matriz ya está en orden cronológico estable
+        X_values = matrix.X
+        y_win_values = np.asarray(matrix.y_win).astype(int)
+        y_margin_values = np.asarray(matrix.y_margin)
+        y_total_values = np.asarray(matrix.y_total)
+        labels = period_labels(pd.Series(matrix.dates), self.period).values
+        shared_paths = matrix.paths
+
+        periods = list(pd.unique(labels))
+        blocks = self.make_folds(periods)
+
+        if not blocks:
+            raise ValueError(
+                f"Solo hay {len(periods)} periodos; se necesitan más de {self.min_train_periods}"
+            )
+
+        n_workers = min(self.n_workers, len(blocks))
+        n_jobs = max(1, (os.cpu_count() or 1) // n_workers)
+
+        print(f"🔁 Backtest walk-forward: {len(blocks)} bloques de refit, "
+              f"{sum(len(b['test_periods']) for b in blocks)} folds, {n_workers} procesos")
+
+        tasks = []
+        for block in blocks:
+            train_rows = np.flatnonzero(np.isin(labels, block['train_periods']))
+            tests = []
+            for fold, test_period in zip(block['folds'], block['test_periods']):
+                rows = np.flatnonzero(labels == test_period)
+                test = {'fold': fold, 'period': test_period, 'rows': rows}
+                if not shared_paths:
+                    test['X'] = X_values[rows]
+                tests.append(test)
+
+            task = {
+                'block': block['block'],
+                'columns': columns,
+                'tests': tests,
+                'random_state': self.random_state,
+                'n_jobs': n_jobs,
+            }
+            if shared_paths:
+                task.update(paths=shared_paths, train_rows=train_rows)
+            else:
+                task.update(
+                    X_train=X_values[train_rows],
+                    y_win_train=y_win_values[train_rows],
+                    y_margin_train=y_margin_values[train_rows],
+                    y_total_train=y_total_values[train_rows],
+                )
+            tasks.append(task)
+
+        start_time = time.perf_counter()
+        fold_results = []
+
+        if n_workers == 1:
+            for task in tasks:
+                fold_results.extend(_run_refit_block(task))
+                print(f"  ✓ Bloque {task['block'] + 1}/{len(tasks)}")
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                futures = {executor.submit(_run_refit_block, task): task['block'] for task in tasks}
+                for done, future in enumerate(as_completed(futures), 1):
+                    fold_results.extend(future.result())
+                    print(f"  ✓ Bloque {futures[future] + 1} ({done}/{len(tasks)})")
+
+        print(f"⏱️  Backtest completado en {time.perf_counter() - start_time:.1f}s")
+
+        block_by_fold = {fold: block for block in blocks for fold in block['folds']}
+        fold_results.sort(key=lambda r: r['fold'])
+
+        # Predicciones fuera de muestra
+        prediction_frames = []
+        report_rows = []
+        for result in fold_results:
+            rows = result['rows']
+            block = block_by_fold[result['fold']]
+
+            metrics = compute_metrics(
+                y_win_values[rows], result['win_proba'],
+                y_margin_values[rows], result['margin_pred'],
+                y_total_values[rows], result['total_pred']
+            )
+            report_rows.append({
+                'scope': 'fold',
+                'fold': result['fold'],
+                'period': result['period'],
+                'refit_block': block['block'],
+                'train_start': block['train_periods'][0],
+                'train_end': block['train_periods'][-1],
+                'n_train': int(np.isin(labels, block['train_periods']).sum()),
+                'n_test': len(rows),
+                **metrics,
+            })
+
+            frame = pd.DataFrame({column: matrix.ids[column][rows] for column in ID_COLUMNS if column in matrix.ids})
+            frame.insert(min(1, frame.shape[1]), 'GAME_DATE', matrix.dates[rows])
+            frame['fold'] = result['fold']
+            frame['period'] = result['period']
+            frame['y_win'] = y_win_values[rows]
+            frame['win_proba'] = result['win_proba']
+            frame['y_margin'] = y_margin_values[rows]
+            frame['margin_pred'] = result['margin_pred']
+            frame['y_total'] = y_total_values[rows]
+            frame['total_pred'] = result['total_pred']
+            prediction_frames.append(frame)
+
+        predictions = pd.concat(prediction_frames, ignore_index=True)
+        report = pd.DataFrame(report_rows)
+
+        # Agregados: métricas sobre todas las predicciones y media entre folds
+        pooled = compute_metrics(
+            predictions['y_win'].values, predictions['win_proba'].values,
+            predictions['y_margin'].values, predictions['margin_pred'].values,
+            predictions['y_total'].values, predictions['total_pred'].values
+        )
+        aggregates = pd.DataFrame([
+            {'scope': 'pooled', 'fold': -1, 'period': 'ALL', 'n_test': len(predictions), **pooled},
+            {'scope': 'mean', 'fold': -1, 'period': 'ALL', 'n_test': len(predictions),
+             **report[REPORT_METRICS].mean().to_dict()},
+        ])
+        report = pd.concat([report, aggregates], ignore_index=True)
+        report[['refit_block', 'n_train']] = report[['refit_block', 'n_train']].astype('Int64')
+
+        return report, predictions
+
+    @staticmethod
+    def save_report(report: pd.DataFrame, filepath: str):
+        """Guarda el reporte de backtesting en Parquet."""
+        Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+        report.to_parquet(filepath, index=False)
+        print(f"💾 Reporte guardado en: {filepath}")
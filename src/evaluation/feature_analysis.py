@@ -0,0 +1,290 @@
+"""Importancia por permutación y eliminación hacia atrás de features, en paralelo."""
+
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import log_loss
+
+from src.models.nba_predictor import NBAPredictor
+from src.features.matrix_cache import TrainingMatrix
+
+
+# Métrica de cada modelo sobre el holdout (menor es mejor)
+SCORES = {
+    'win': 'win_log_loss',
+    'margin': 'margin_mae',
+    'total': 'total_mae',
+}
+
+# Matrices compartidas: cada proceso las abre con mmap una vez (initializer)
+_WORKER_DATA = {}
+
+def _init_worker(paths: Dict[str, str], split: int, columns: List[str], params: Optional[Dict],
+                 baseline: Optional[NBAPredictor]):
+    """
+    Abre la matriz cronológica en modo solo lectura (sin copiarla al proceso).
+
+    Train y holdout son vistas de los mismos archivos: `[:split]` y `[split:]`.
+    """
+    for name in ('X', 'y_win', 'y_margin', 'y_total'):
+        values = np.load(paths[name], mmap_mode='r')
+        _WORKER_DATA[f'{name}_train'] = values[:split]
+        _WORKER_DATA[f'{name}_test'] = values[split:]
+    _WORKER_DATA['columns'] = columns
+    _WORKER_DATA['params'] = params
+    _WORKER_DATA['baseline'] = baseline
+
+
+def _scores(preds: Dict[str, np.ndarray]) -> Dict[str, float]:
+    data = _WORKER_DATA
+    proba = np.clip(preds['win_probability'], 1e-7, 1 - 1e-7)
+    return {
+        'win_log_loss': float(log_loss(data['y_win_test'], proba, labels=[0, 1])),
+        'margin_mae': float(np.mean(np.abs(preds['point_margin'] - data['y_margin_test']))),
+        'total_mae': float(np.mean(np.abs(preds['total_points'] - data['y_total_test']))),
+    }
+
+
+def _evaluate_subset(task: Dict) -> Dict:
+    """Entrena los tres modelos con un subconjunto de columnas y puntúa el holdout."""
+    data = _WORKER_DATA
+    index = task['index']
+    columns = [data['columns'][i] for i in index]
+
+    start = time.perf_counter()
+    predictor = NBAPredictor(params=data['params'])
+    predictor.feature_columns = columns
+    predictor.fit(
+        pd.DataFrame(data['X_train'][:, index], columns=columns),
+        data['y_win_train'],
+        data['y_margin_train'],
+        data['y_total_train'],
+        random_state=task['seed'],
+        n_jobs=task['nthread'],
+        verbose=False
+    )
+    preds = predictor.predict(pd.DataFrame(data['X_test'][:, index], columns=columns))
+    return {**task, **_scores(preds), 'seconds': time.perf_counter() - start}
+
+
+def _permute_feature(task: Dict) -> Dict:
+    """Puntúa el modelo base con una columna del holdout permutada (varias repeticiones)."""
+    data = _WORKER_DATA
+    rng = np.random.default_rng([task['seed'], task['feature']])
+    X = np.array(data['X_test'])  # copia local: solo se modifica una columna
+    original = X[:, task['feature']].copy()
+
+    repeats = []
+    for _ in range(task['repeats']):
+        X[:, task['feature']] = rng.permutation(original)
+        preds = data['baseline'].predict(pd.DataFrame(X, columns=data['columns']))
+        repeats.append(_scores(preds))
+    return {'feature': task['feature'], 'repeats': repeats}
+
+
+def relative_degradation(scores: Dict[str, float], baseline: Dict[str, float]) -> float:
+    """Empeoramiento relativo medio de las tres métricas respecto a la referencia."""
+    return float(np.mean([(scores[m] - baseline[m]) / baseline[m] for m in SCORES.values()]))
+
+
+class FeatureAnalyzer:
+    """
+    Análisis de features sobre un holdout cronológico.
+
+    1. Importancia por permutación: cuánto empeora cada métrica del modelo
+       entrenado con todas las features al barajar una columna del holdout.
+    2. Eliminación hacia atrás voraz: en cada paso se reentrenan los tres
+       modelos quitando cada feature candidata y se elimina la que menos
+       empeora; se para cuando cualquier eliminación supera `tolerance`
+       (empeoramiento relativo medio frente al conjunto completo).
+
+    Las evaluaciones de cada paso se reparten en un pool de procesos. La
+    matriz de entrenamiento (`TrainingMatrix`) está en .npy y cada proceso la
+    abre con mmap, así que no se copia por worker ni por tarea.
+    """
+
+    def __init__(
+        self,
+        test_size: float = 0.2,
+        n_repeats: int = 5,
+        tolerance: float = 0.002,
+        min_features: int = 1,
+        candidates: Optional[int] = None,
+        n_estimators: Optional[int] = None,
+        n_workers: Optional[int] = None,
+        work_dir: Optional[str] = None,
+        random_state: int = 42
+    ):
+        """
+        Args:
+            test_size: Fracción final (en orden temporal) usada como holdout
+            n_repeats: Permutaciones por feature
+            tolerance: Empeoramiento relativo medio admitido (0.002 = 0.2%)
+            min_features: No eliminar por debajo de este número de features
+            candidates: Evaluar en cada paso solo las N features menos
+                importantes según la permutación (None = todas)
+            n_estimators: Árboles por modelo durante el análisis (None = los del predictor)
+            n_workers: Procesos del pool (None = todos los núcleos)
+            work_dir: Directorio temporal para la matriz .npy cuando no
+                viene ya cacheada en disco (None = el del sistema)
+            random_state: Semilla aleatoria
+        """
+        self.test_size = test_size
+        self.n_repeats = n_repeats
+        self.tolerance = tolerance
+        self.min_features = max(1, min_features)
+        self.candidates = candidates
+        self.params = ({name: {'n_estimators': n_estimators} for name in SCORES}
+                       if n_estimators else None)
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.work_dir = work_dir
+        self.random_state = random_state
+
+    def run(
+        self,
+        df: Optional[pd.DataFrame] = None,
+        matrix: Optional[TrainingMatrix] = None
+    ) -> Tuple[pd.DataFrame, List[str], pd.DataFrame]:
+        """
+        Ejecuta la importancia por permutación y la eliminación hacia atrás.
+
+        Args:
+            df: DataFrame procesado con features y targets
+            matrix: Matriz ya preparada (p. ej. de `load_training_matrix`);
+                si está en disco los workers abren sus archivos directamente
+
+        Returns:
+            (report, recommended, history): ranking por feature, lista mínima
+            recomendada y métricas de cada paso de la eliminación
+        """
+        if matrix is None:
+            matrix = TrainingMatrix.from_frame(df)
+        columns = list(matrix.columns)
+        split = int(len(matrix) * (1 - self.test_size))
+
+        n_workers = self.n_workers
+        nthread = max(1, (os.cpu_count() or 1) // n_workers)
+        print(f"🔬 Análisis de {len(columns)} features: {split} partidos de entrenamiento, "
+              f"{len(matrix) - split} de holdout, {n_workers} procesos x {nthread} hilos")
+
+        with tempfile.TemporaryDirectory(dir=self.work_dir) as tmp:
+            if matrix.directory is None:
+                matrix = matrix.save(Path(tmp) / 'matrix')
+            paths = matrix.paths
+
+            # Modelo base en el proceso principal (lo reciben los workers para permutar)
+            _init_worker(paths, split, columns, self.params, None)
+            data = _WORKER_DATA
+            baseline = NBAPredictor(params=self.params)
+            baseline.feature_columns = columns
+            baseline.fit(pd.DataFrame(data['X_train'], columns=columns), data['y_win_train'],
+                         data['y_margin_train'], data['y_total_train'],
+                         random_state=self.random_state, verbose=False)
+            baseline_scores = _scores(baseline.predict(pd.DataFrame(data['X_test'], columns=columns)))
+            _WORKER_DATA.clear()  # soltar los mmap antes de borrar el directorio
+            print("📏 Referencia: " + ", ".join(f"{m}={v:.4f}" for m, v in baseline_scores.items()))
+
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_worker,
+                initargs=(paths, split, columns, self.params, baseline)
+            ) as executor:
+                importance = self._permutation_importance(executor, columns, baseline_scores)
+                history = self._backward_elimination(executor, columns, baseline_scores, importance, nthread)
+
+        removed = {row['removed']: row['step'] for row in history.to_dict('records') if row['removed']}
+        report = importance.copy()
+        report['removed_at_step'] = report['feature'].map(removed).astype('Int64')
+        report['kept'] = report['removed_at_step'].isna()
+        report = report.sort_values('importance', ascending=False, ignore_index=True)
+        report.insert(0, 'rank', np.arange(1, len(report) + 1))
+
+        recommended = [c for c in columns if c not in removed]
+        return report, recommended, history
+
+    def _permutation_importance(self, executor, columns: List[str], baseline: Dict[str, float]) -> pd.DataFrame:
+        print(f"\n🔀 Importancia por permutación ({self.n_repeats} repeticiones)")
+        start = time.perf_counter()
+        tasks = [{'feature': j, 'repeats': self.n_repeats, 'seed': self.random_state} for j in range(len(columns))]
+
+        rows = []
+        for result in executor.map(_permute_feature, tasks):
+            row = {'feature': columns[result['feature']]}
+            for metric in SCORES.values():
+                deltas = [r[metric] - baseline[metric] for r in result['repeats']]
+                row[f'{metric}_increase'] = float(np.mean(deltas))
+                row[f'{metric}_increase_std'] = float(np.std(deltas))
+            row['importance'] = float(np.mean([relative_degradation(r, baseline) for r in result['repeats']]))
+            rows.append(row)
+
+        print(f"⏱️  {len(tasks)} features en {time.perf_counter() - start:.1f}s")
+        return pd.DataFrame(rows)
+
+    def _backward_elimination(
+        self,
+        executor,
+        columns: List[str],
+        baseline: Dict[str, float],
+        importance: pd.DataFrame,
+        nthread: int
+    ) -> pd.DataFrame:
+        print(f"\n✂️  Eliminación hacia atrás (tolerancia {self.tolerance:.2%})")
+        rank = dict(zip(importance['feature'], importance['importance']))
+        current = list(range(len(columns)))
+        history = [{'step': 0, 'removed': None, 'n_features': len(current),
+                    **baseline, 'degradation': 0.0, 'candidates': 0}]
+
+        while len(current) > self.min_features:
+            # Candidatas: las menos importantes primero (todas si candidates es None)
+            pool = sorted(current, key=lambda j: rank[columns[j]])
+            if self.candidates:
+                pool = pool[:self.candidates]
+
+            tasks = [{'index': [i for i in current if i != j], 'drop': j,
+                      'seed': self.random_state, 'nthread': nthread} for j in pool]
+            start = time.perf_counter()
+            results = list(executor.map(_evaluate_subset, tasks))
+            for result in results:
+                result['degradation'] = relative_degradation(result, baseline)
+            best = min(results, key=lambda r: r['degradation'])
+
+            if best['degradation'] > self.tolerance:
+                print(f"  ⛔ Paso {len(history)}: quitar {columns[best['drop']]} empeora "
+                      f"{best['degradation']:.2%}; fin")
+                break
+
+            current.remove(best['drop'])
+            history.append({'step': len(history), 'removed': columns[best['drop']], 'n_features': len(current),
+                            **{m: best[m] for m in SCORES.values()},
+                            'degradation': best['degradation'], 'candidates': len(tasks)})
+            print(f"  ✓ Paso {len(history) - 1}: fuera {columns[best['drop']]} "
+                  f"({best['degradation']:+.2%}, {len(current)} features, {time.perf_counter() - start:.1f}s)")
+
+        return pd.DataFrame(history)
+
+    @staticmethod
+    def save(report: pd.DataFrame, recommended: List[str], history: pd.DataFrame,
+             report_path: str, features_path: str):
+        """Guarda el ranking (Parquet) y la lista recomendada (JSON)."""
+        Path(report_path).parent.mkdir(parents=True, exist_ok=True)
+        report.to_parquet(report_path, index=False)
+
+        final = history.iloc[-1]
+        Path(features_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(features_path).write_text(json.dumps({
+            'features': recommended,
+            'n_features': len(recommended),
+            'n_original': int(history.iloc[0]['n_features']),
+            'baseline': {m: float(history.iloc[0][m]) for m in SCORES.values()},
+            'final': {m: float(final[m]) for m in SCORES.values()},
+            'degradation': float(final['degradation']),
+        }, indent=2))
+        print(f"💾 Ranking en: {report_path}")
+        print(f"💾 Features recomendadas en: {features_path}")
@@ -0,0 +1,132 @@
+"""Features de enfrentamiento en lote a partir del estado actual de cada equipo."""
+
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+# Estadística del último partido -> (feature ROLL_5, valor por defecto)
+LAST_GAME_STATS = {
+    'PTS': 110,
+    'FG_PCT': 0.45,
+    'FG3_PCT': 0.35,
+    'REB': 45,
+    'AST': 25,
+    'TOV': 15,
+    'STL': 7.5,
+    'BLK': 5.0,
+}
+
+DEFAULT_ELO = 1500
+
+
+def _side_frame(df: pd.DataFrame, side: str) -> pd.DataFrame:
+    """Vista por equipo (una fila por equipo y partido) de un lado del partido."""
+    frame = pd.DataFrame({
+        'TEAM': df[f'{side}_TEAM_NAME'].values,
+        'GAME_DATE': pd.to_datetime(df['GAME_DATE']).values,
+        'GAME_ID': df['GAME_ID'].values if 'GAME_ID' in df else 0,
+        # Posición en el histórico: último desempate (partidos del mismo día sin GAME_ID)
+        'ROW': np.arange(len(df)),
+        'HOME_WL': df['HOME_WL'].values,
+        'WON': (df['HOME_WL'].values == (1 if side == 'HOME' else 0)).astype(int),
+        'ELO': df[f'{side}_ELO_BEFORE'].values if f'{side}_ELO_BEFORE' in df else DEFAULT_ELO,
+    })
+    for stat, default in LAST_GAME_STATS.items():
+        column = f'{side}_{stat}'
+        frame[stat] = df[column].values if column in df else default
+    return frame
+
+
+def build_team_states(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Estado de cada equipo tras su último partido del histórico.
+
+    Reproduce en una sola pasada lo que `NBAPredictor.prepare_features_for_game`
+    calcula equipo a equipo: ELO previo y estadísticas del último partido,
+    victorias en los últimos 5 y media de HOME_WL sobre todos sus partidos.
+
+    Args:
+        df: DataFrame histórico con features
+
+    Returns:
+        DataFrame indexado por nombre de equipo
+    """
+    games = pd.concat([_side_frame(df, 'HOME'), _side_frame(df, 'AWAY')], ignore_index=True)
+    # GAME_ID desempata partidos del mismo día (torneos de exhibición) y, si
+    # falta, la fila posterior del histórico, como `prepare_features_for_game`
+    games = games.sort_values(['TEAM', 'GAME_DATE', 'GAME_ID', 'ROW'], kind='mergesort')
+
+    by_team = games.groupby('TEAM', sort=True)
+    # nth(-1) y no last(): last() salta NaN y el predictor individual usa el valor tal cual
+    states = by_team.nth(-1).set_index('TEAM')[['ELO'] + list(LAST_GAME_STATS)]
+    states['WIN_STREAK'] = by_team.tail(5).groupby('TEAM')['WON'].sum()
+    states['WIN_PCT'] = by_team['HOME_WL'].mean()
+    return states
+
+
+def assemble_matchups(
+    states: pd.DataFrame,
+    home_teams: Sequence[str],
+    away_teams: Sequence[str]
+) -> pd.DataFrame:
+    """
+    Matriz de features (una fila por enfrentamiento) con las mismas columnas
+    que `NBAPredictor.prepare_features_for_game`.
+
+    Args:
+        states: Salida de `build_team_states`
+        home_teams: Equipos locales
+        away_teams: Equipos visitantes
+
+    Returns:
+        DataFrame de features
+    """
+    missing = (set(home_teams) | set(away_teams)) - set(states.index)
+    if missing:
+        raise ValueError(f"No hay datos suficientes para los equipos: {sorted(missing)}")
+
+    home = states.loc[list(home_teams)].reset_index(drop=True)
+    away = states.loc[list(away_teams)].reset_index(drop=True)
+    n_games = len(home)
+
+    features = {}
+    features['HOME_ELO_BEFORE'] = home['ELO'].values
+    features['AWAY_ELO_BEFORE'] = away['ELO'].values
+    features['ELO_DIFF'] = features['HOME_ELO_BEFORE'] - features['AWAY_ELO_BEFORE']
+
+    for stat in ('PTS', 'FG_PCT', 'FG3_PCT', 'REB', 'AST', 'TOV'):
+        features[f'HOME_{stat}_ROLL_5'] = home[stat].values
+        features[f'AWAY_{stat}_ROLL_5'] = away[stat].values
+
+    features['HOME_PTS_ROLL_10'] = features['HOME_PTS_ROLL_5']
+    features['AWAY_PTS_ROLL_10'] = features['AWAY_PTS_ROLL_5']
+
+    features['HOME_REST_DAYS'] = np.full(n_games, 2)
+    features['AWAY_REST_DAYS'] = np.full(n_games, 2)
+    features['HOME_BACK_TO_BACK'] = np.zeros(n_games, dtype=int)
+    features['AWAY_BACK_TO_BACK'] = np.zeros(n_games, dtype=int)
+
+    features['HOME_WIN_STREAK'] = home['WIN_STREAK'].values
+    features['AWAY_WIN_STREAK'] = away['WIN_STREAK'].values
+    features['HOME_WIN_PCT'] = home['WIN_PCT'].values
+    features['AWAY_WIN_PCT'] = away['WIN_PCT'].values
+
+    for stat in ('STL', 'BLK'):
+        features[f'HOME_{stat}_ROLL_5'] = home[stat].values
+        features[f'AWAY_{stat}_ROLL_5'] = away[stat].values
+
+    features['ELO_DIFF_X_REST'] = features['ELO_DIFF'] * (features['HOME_REST_DAYS'] - features['AWAY_REST_DAYS'])
+    features['WIN_PCT_DIFF'] = features['HOME_WIN_PCT'] - features['AWAY_WIN_PCT']
+    features['PTS_DIFF_ROLL_5'] = features['HOME_PTS_ROLL_5'] - features['AWAY_PTS_ROLL_5']
+    features['FG_PCT_DIFF_ROLL_5'] = features['HOME_FG_PCT_ROLL_5'] - features['AWAY_FG_PCT_ROLL_5']
+
+    return pd.DataFrame(features)
+
+
+def all_pairs(teams: List[str]) -> pd.DataFrame:
+    """Todos los enfrentamientos (local, visitante) entre equipos distintos."""
+    home, away = np.meshgrid(teams, teams, indexing='ij')
+    mask = home != away
+    return pd.DataFrame({'HOME_TEAM_NAME': home[mask], 'AWAY_TEAM_NAME': away[mask]})
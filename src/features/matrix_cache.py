@@ -0,0 +1,237 @@
+"""Caché en disco (.npy con mmap) de la matriz de entrenamiento de NBAPredictor."""
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data.versioning import file_fingerprint
+from src.models.nba_predictor import NBAPredictor, BASE_FEATURES, add_interaction_features
+
+
+# Subir si cambia el formato de los archivos
+MATRIX_FORMAT_VERSION = 1
+
+# Identificadores de partido que se guardan junto a la matriz (para reportes)
+ID_COLUMNS = ('GAME_ID', 'HOME_TEAM_NAME', 'AWAY_TEAM_NAME')
+
+_ARRAYS = ('X', 'y_win', 'y_margin', 'y_total', 'dates')
+_META_NAME = 'meta.json'
+
+
+def feature_spec_fingerprint(features: Optional[List[str]] = None) -> str:
+    """
+    Huella de la definición de features.
+
+    Incluye la lista de features base, el subconjunto pedido y el código de
+    `prepare_features` y `add_interaction_features`: si cambia cualquiera,
+    la matriz cacheada deja de valer.
+    """
+    spec = {
+        'format': MATRIX_FORMAT_VERSION,
+        'base': BASE_FEATURES,
+        'features': sorted(features) if features is not None else None,
+        'prepare': inspect.getsource(NBAPredictor.prepare_features),
+        'interactions': inspect.getsource(add_interaction_features),
+    }
+    return hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class TrainingMatrix:
+    """
+    Salida de `NBAPredictor.prepare_features` en orden cronológico.
+
+    X es float32 (filas x features); los targets (en su tipo original) y las
+    fechas van alineados.
+    Al cargarla desde disco todos los arrays son np.memmap de solo lectura:
+    abrirla no copia datos, y los cortes cronológicos (`X[:n]`) son vistas.
+    """
+
+    def __init__(
+        self,
+        X: np.ndarray,
+        y_win: np.ndarray,
+        y_margin: np.ndarray,
+        y_total: np.ndarray,
+        columns: List[str],
+        dates: np.ndarray,
+        ids: Optional[Dict[str, np.ndarray]] = None,
+        directory: Optional[Path] = None
+    ):
+        self.X = X
+        self.y_win = y_win
+        self.y_margin = y_margin
+        self.y_total = y_total
+        self.columns = list(columns)
+        self.dates = dates
+        self.ids = ids or {}
+        self.directory = directory
+
+    def __len__(self) -> int:
+        return len(self.X)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, features: Optional[List[str]] = None) -> 'TrainingMatrix':
+        """Construye la matriz en memoria a partir del DataFrame procesado."""
+        predictor = NBAPredictor(features=features)
+        X, y_win, y_margin, y_total = predictor.prepare_features(df)
+
+        dates = pd.to_datetime(df.loc[X.index, 'GAME_DATE']).values.astype('datetime64[ns]')
+        order = np.argsort(dates, kind='stable')
+        ids = {}
+        for column in ID_COLUMNS:
+            if column in df.columns:
+                values = df.loc[X.index, column].values
+                # Texto como unicode de ancho fijo: los arrays object no se pueden mapear
+                ids[column] = (values.astype(str) if values.dtype == object else values)[order]
+
+        return cls(
+            X=np.ascontiguousarray(X.values[order], dtype=np.float32),
+            y_win=y_win.values[order],
+            y_margin=y_margin.values[order],
+            y_total=y_total.values[order],
+            columns=predictor.feature_columns,
+            dates=dates[order],
+            ids=ids
+        )
+
+    @property
+    def paths(self) -> Dict[str, str]:
+        """Rutas de los .npy (solo si la matriz está en disco), para abrirlas en otros procesos."""
+        if self.directory is None:
+            return {}
+        names = list(_ARRAYS) + [f'id_{column}' for column in self.ids]
+        return {name: str(self.directory / f'{name}.npy') for name in names}
+
+    def frames(self) -> Tuple[pd.DataFrame, pd.Series, pd.Series, pd.Series]:
+        """(X, y_win, y_margin, y_total) como en `prepare_features`, sin copiar X."""
+        X = pd.DataFrame(self.X, columns=self.columns, copy=False)
+        return (X, pd.Series(self.y_win.astype(int)), pd.Series(self.y_margin), pd.Series(self.y_total))
+
+    def save(self, directory: Path) -> 'TrainingMatrix':
+        """
+        Escribe la matriz en `directory` de forma atómica y la devuelve mapeada.
+
+        Se escribe en un directorio temporal hermano y se publica con un
+        rename: otro proceso nunca ve una matriz a medio escribir.
+        """
+        directory = Path(directory)
+        staging = directory.with_name(f'.{directory.name}.{uuid.uuid4().hex}')
+        staging.mkdir(parents=True)
+        try:
+            arrays = {'X': self.X, 'y_win': self.y_win, 'y_margin': self.y_margin,
+                      'y_total': self.y_total, 'dates': self.dates}
+            arrays.update({f'id_{column}': values for column, values in self.ids.items()})
+            for name, values in arrays.items():
+                np.save(staging / f'{name}.npy', np.ascontiguousarray(values))
+            (staging / _META_NAME).write_text(json.dumps({
+                'columns': self.columns,
+                'ids': list(self.ids),
+                'rows': len(self),
+            }))
+            try:
+                os.replace(staging, directory)
+            except OSError:
+                # Otro proceso publicó la misma clave a la vez: vale la suya
+                shutil.rmtree(staging, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return TrainingMatrix.load(directory)
+
+    @classmethod
+    def load(cls, directory: Path) -> 'TrainingMatrix':
+        """Abre una matriz guardada con mmap (sin leerla entera)."""
+        directory = Path(directory)
+        meta = json.loads((directory / _META_NAME).read_text())
+
+        def open_array(name):
+            return np.load(directory / f'{name}.npy', mmap_mode='r')
+
+        return cls(
+            X=open_array('X'),
+            y_win=open_array('y_win'),
+            y_margin=open_array('y_margin'),
+            y_total=open_array('y_total'),
+            columns=meta['columns'],
+            dates=open_array('dates'),
+            ids={column: open_array(f'id_{column}') for column in meta['ids']},
+            directory=directory
+        )
+
+
+class MatrixCache:
+    """
+    Directorio de matrices de entrenamiento indexadas por dataset y features.
+
+    La clave combina la huella del archivo (o directorio particionado) de
+    datos con la de la definición de features, así que una matriz se
+    reconstruye sola cuando cambia cualquiera de las dos.
+    """
+
+    def __init__(self, root: str = 'data/cache/matrices'):
+        self.root = Path(root)
+
+    def key(self, data_path: str, features: Optional[List[str]] = None) -> Optional[str]:
+        dataset = file_fingerprint(data_path)
+        if dataset is None:
+            return None
+        return f'{dataset}-{feature_spec_fingerprint(features)}'
+
+    def get_or_build(
+        self,
+        data_path: str,
+        features: Optional[List[str]] = None,
+        refresh: bool = False
+    ) -> TrainingMatrix:
+        """
+        Matriz del dataset: mapeada desde la caché o construida y guardada.
+
+        Args:
+            data_path: Parquet (archivo o directorio) con features y targets
+            features: Subconjunto de features (como `NBAPredictor(features=...)`)
+            refresh: Reconstruir aunque exista
+
+        Returns:
+            TrainingMatrix mapeada desde disco
+        """
+        key = self.key(data_path, features)
+        if key is None:
+            raise FileNotFoundError(f"No se encontró: {data_path}")
+
+        directory = self.root / key
+        if directory.exists() and not refresh:
+            matrix = TrainingMatrix.load(directory)
+            print(f"⚡ Matriz de entrenamiento desde caché: {directory} ({len(matrix)} partidos)")
+            return matrix
+
+        if refresh and directory.exists():
+            shutil.rmtree(directory)
+
+        print(f"📂 Construyendo matriz de entrenamiento desde: {data_path}")
+        matrix = TrainingMatrix.from_frame(pd.read_parquet(data_path), features)
+        self.root.mkdir(parents=True, exist_ok=True)
+        matrix = matrix.save(directory)
+        print(f"💾 Matriz guardada en: {directory} ({len(matrix)} partidos, {len(matrix.columns)} features)")
+        return matrix
+
+
+def load_training_matrix(
+    data_path: str,
+    features: Optional[List[str]] = None,
+    cache_dir: Optional[str] = 'data/cache/matrices',
+    refresh: bool = False
+) -> TrainingMatrix:
+    """
+    Atajo para los scripts: matriz cacheada, o en memoria si `cache_dir` es None.
+    """
+    if cache_dir is None:
+        return TrainingMatrix.from_frame(pd.read_parquet(data_path), features)
+    return MatrixCache(cache_dir).get_or_build(data_path, features, refresh)
@@ -0,0 +1,145 @@
+"""Foto en disco (.npy con mmap) del estado de cada equipo, para servir predicciones."""
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data.versioning import file_fingerprint
+from src.features.matchup_features import _side_frame, build_team_states
+
+
+_VALUES_NAME = 'states.npy'
+_META_NAME = 'meta.json'
+
+
+def state_spec_fingerprint() -> str:
+    """Huella del código de `build_team_states` (y su `_side_frame`): si cambia, la foto deja de valer."""
+    source = inspect.getsource(_side_frame) + inspect.getsource(build_team_states)
+    return hashlib.sha1(source.encode()).hexdigest()[:16]
+
+
+class TeamStateSnapshot:
+    """
+    Salida de `build_team_states` como matriz float64 (equipos x columnas).
+
+    Al cargarla desde disco `values` es un np.memmap de solo lectura: varios
+    procesos (workers de la API, scripts) comparten las mismas páginas sin
+    recalcular los estados ni leer el histórico.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        teams: List[str],
+        columns: List[str],
+        data_version: Optional[str] = None,
+        as_of: Optional[str] = None,
+        directory: Optional[Path] = None
+    ):
+        self.values = values
+        self.teams = list(teams)
+        self.columns = list(columns)
+        self.data_version = data_version
+        self.as_of = as_of
+        self.directory = directory
+
+    def __len__(self) -> int:
+        return len(self.teams)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, data_version: Optional[str] = None) -> 'TeamStateSnapshot':
+        """Calcula los estados a partir del histórico."""
+        states = build_team_states(df)
+        return cls(
+            values=np.ascontiguousarray(states.to_numpy(dtype=np.float64)),
+            teams=list(states.index),
+            columns=list(states.columns),
+            data_version=data_version,
+            as_of=str(pd.to_datetime(df['GAME_DATE']).max().date()),
+        )
+
+    def frame(self) -> pd.DataFrame:
+        """Estados como DataFrame indexado por equipo (sin copiar), para `assemble_matchups`."""
+        return pd.DataFrame(self.values, index=pd.Index(self.teams, name='TEAM'), columns=self.columns, copy=False)
+
+    def save(self, directory: Path) -> 'TeamStateSnapshot':
+        """Escribe la foto de forma atómica (directorio temporal + rename) y la devuelve mapeada."""
+        directory = Path(directory)
+        staging = directory.with_name(f'.{directory.name}.{uuid.uuid4().hex}')
+        staging.mkdir(parents=True)
+        try:
+            np.save(staging / _VALUES_NAME, np.ascontiguousarray(self.values, dtype=np.float64))
+            (staging / _META_NAME).write_text(json.dumps({
+                'teams': self.teams,
+                'columns': self.columns,
+                'data_version': self.data_version,
+                'as_of': self.as_of,
+            }))
+            try:
+                os.replace(staging, directory)
+            except OSError:
+                # Otro proceso publicó la misma clave a la vez: vale la suya
+                shutil.rmtree(staging, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return TeamStateSnapshot.load(directory)
+
+    @classmethod
+    def load(cls, directory: Path) -> 'TeamStateSnapshot':
+        """Abre una foto guardada con mmap."""
+        directory = Path(directory)
+        meta = json.loads((directory / _META_NAME).read_text())
+        return cls(
+            values=np.load(directory / _VALUES_NAME, mmap_mode='r'),
+            teams=meta['teams'],
+            columns=meta['columns'],
+            data_version=meta.get('data_version'),
+            as_of=meta.get('as_of'),
+            directory=directory
+        )
+
+
+def load_team_states(
+    data_path: str,
+    cache_dir: Optional[str] = 'data/cache/team_states',
+    refresh: bool = False
+) -> TeamStateSnapshot:
+    """
+    Foto de estados del histórico: mapeada desde la caché o calculada y guardada.
+
+    La clave combina la huella del archivo de datos con la del código de
+    `build_team_states`. Con `cache_dir=None` se calcula en memoria.
+    `data_path` también puede ser una foto de despliegue
+    (`DeploymentSnapshot`), que ya trae los estados calculados.
+    """
+    data_version = file_fingerprint(data_path)
+    if data_version is None:
+        raise FileNotFoundError(f"No se encontró: {data_path}")
+
+    from src.data.deployment_snapshot import DeploymentSnapshot, is_deployment_snapshot
+    if is_deployment_snapshot(data_path):
+        return DeploymentSnapshot.load(data_path).team_states(data_version)
+
+    if cache_dir is None:
+        return TeamStateSnapshot.from_frame(pd.read_parquet(data_path), data_version)
+
+    directory = Path(cache_dir) / f'{data_version}-{state_spec_fingerprint()}'
+    if directory.exists() and not refresh:
+        return TeamStateSnapshot.load(directory)
+    if refresh and directory.exists():
+        shutil.rmtree(directory)
+
+    snapshot = TeamStateSnapshot.from_frame(pd.read_parquet(data_path), data_version)
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    snapshot = snapshot.save(directory)
+    print(f"💾 Estados de {len(snapshot)} equipos guardados en: {directory}")
+    return snapshot
@@ -0,0 +1,317 @@
+"""
+Modelos alumno destilados de NBAPredictor que predicen solo con NumPy.
+
+El bundle `.npz` no necesita xgboost ni scikit-learn para cargarse, así que
+el despliegue ligero (Streamlit Cloud) arranca antes y ocupa menos memoria.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.data.versioning import file_fingerprint
+from src.features.matchup_features import build_team_states, assemble_matchups
+# Sin coste de xgboost: nba_predictor lo importa solo dentro de las funciones que lo usan
+from src.models.nba_predictor import cached_matchup_prediction, game_result
+
+
+STUDENT_KINDS = ('additive', 'linear')
+
+TARGETS = ('win', 'margin', 'total')
+
+# Las probabilidades del maestro se destilan en escala logit
+_PROBA_CLIP = 1e-6
+
+
+def _logit(p: np.ndarray) -> np.ndarray:
+    p = np.clip(p, _PROBA_CLIP, 1 - _PROBA_CLIP)
+    return np.log(p / (1 - p))
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+class StudentPredictor:
+    """
+    Modelo compacto que imita las salidas de los tres modelos XGBoost.
+
+    Tipos:
+        additive: suma de una función escalonada por feature (bins por
+            cuantiles, un peso por bin); capta no linealidades como los
+            árboles pero predice con un searchsorted por columna.
+        linear: regresión lineal sobre las features estandarizadas.
+
+    Los pesos se ajustan en forma cerrada (ridge) contra las predicciones del
+    maestro: logit de la probabilidad de victoria, margen y total. Expone la
+    misma interfaz de predicción que NBAPredictor (`predict`, `predict_game`,
+    `predict_matchups`, `predict_matchup`).
+    """
+
+    def __init__(self, kind: str = 'additive', n_bins: int = 16, alpha: float = 1.0):
+        if kind not in STUDENT_KINDS:
+            raise ValueError(f"Tipo de alumno desconocido: {kind}. Usa uno de {STUDENT_KINDS}")
+        self.kind = kind
+        self.n_bins = n_bins
+        self.alpha = alpha
+        self.feature_columns = None
+        self.fill = None        # Mediana por feature para valores faltantes
+        self.center = None      # linear: media por feature
+        self.scale = None       # linear: desviación por feature
+        self.edges = None       # additive: cortes por feature (F x n_bins-1, +inf de relleno)
+        self.weights = None     # Un vector de pesos por objetivo (3 x P)
+        self.intercepts = None  # (3,)
+        self.metadata = {}
+        self.model_version = None
+
+    def _matrix(self, X: pd.DataFrame) -> np.ndarray:
+        values = X[self.feature_columns].to_numpy(dtype=np.float64)
+        missing = np.isnan(values)
+        if missing.any():
+            values = np.where(missing, self.fill, values)
+        return values
+
+    def _bin_index(self, values: np.ndarray) -> np.ndarray:
+        """Índice de bin de cada valor (n x F)."""
+        index = np.empty(values.shape, dtype=np.intp)
+        for j in range(values.shape[1]):
+            index[:, j] = np.searchsorted(self.edges[j], values[:, j], side='right')
+        return index
+
+    def _design(self, values: np.ndarray) -> np.ndarray:
+        """Matriz de diseño densa (solo para ajustar)."""
+        if self.kind == 'linear':
+            return (values - self.center) / self.scale
+
+        n_rows, n_features = values.shape
+        design = np.zeros((n_rows, n_features * self.n_bins))
+        columns = self._bin_index(values) + np.arange(n_features) * self.n_bins
+        design[np.arange(n_rows)[:, None], columns] = 1.0
+        return design
+
+    def fit(self, X: pd.DataFrame, teacher: Dict[str, np.ndarray]) -> 'StudentPredictor':
+        """
+        Ajusta el alumno a las predicciones del maestro.
+
+        Args:
+            X: Features del conjunto de transferencia
+            teacher: Salida de `NBAPredictor.predict` sobre X
+
+        Returns:
+            self
+        """
+        self.feature_columns = list(X.columns)
+        raw = X[self.feature_columns].to_numpy(dtype=np.float64)
+        self.fill = np.nan_to_num(np.nanmedian(raw, axis=0))
+        values = self._matrix(X)
+
+        if self.kind == 'linear':
+            self.center = values.mean(axis=0)
+            self.scale = values.std(axis=0)
+            self.scale[self.scale == 0] = 1.0
+        else:
+            quantiles = np.linspace(0, 1, self.n_bins + 1)[1:-1]
+            self.edges = np.full((values.shape[1], self.n_bins - 1), np.inf)
+            for j in range(values.shape[1]):
+                cuts = np.unique(np.quantile(values[:, j], quantiles))
+                self.edges[j, :len(cuts)] = cuts
+
+        design = self._design(values)
+        design_mean = design.mean(axis=0)
+        centered = design - design_mean
+        gram = centered.T @ centered + self.alpha * np.eye(centered.shape[1])
+
+        targets = np.column_stack([
+            _logit(np.asarray(teacher['win_probability'], dtype=np.float64)),
+            np.asarray(teacher['point_margin'], dtype=np.float64),
+            np.asarray(teacher['total_points'], dtype=np.float64),
+        ])
+        target_mean = targets.mean(axis=0)
+        self.weights = np.linalg.solve(gram, centered.T @ (targets - target_mean)).T
+        self.intercepts = target_mean - self.weights @ design_mean
+        return self
+
+    def _raw(self, X: pd.DataFrame) -> np.ndarray:
+        """Salidas crudas (n x 3): logit de victoria, margen y total."""
+        values = self._matrix(X)
+        if self.kind == 'linear':
+            return ((values - self.center) / self.scale) @ self.weights.T + self.intercepts
+
+        n_features = values.shape[1]
+        columns = self._bin_index(values) + np.arange(n_features) * self.n_bins
+        # Cada fila suma un peso por feature: gather en vez de matriz one-hot
+        return self.weights[:, columns].sum(axis=2).T + self.intercepts
+
+    def predict(self, X: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Mismo formato que `NBAPredictor.predict`."""
+        raw = self._raw(X)
+        return {
+            'win_probability': _sigmoid(raw[:, 0]),
+            'point_margin': raw[:, 1],
+            'total_points': raw[:, 2],
+        }
+
+    def prepare_features_for_game(self, home_team: str, away_team: str, df: pd.DataFrame) -> Dict[str, float]:
+        """Features de un partido (mismas que `NBAPredictor.prepare_features_for_game`)."""
+        states = build_team_states(df)
+        return assemble_matchups(states, [home_team], [away_team]).iloc[0].to_dict()
+
+    def predict_game(self, home_team: str, away_team: str, features: Dict[str, float]) -> Dict[str, float]:
+        """Mismo formato que `NBAPredictor.predict_game`."""
+        return game_result(home_team, away_team, self.predict(pd.DataFrame([features])))
+
+    def predict_matchups(
+        self,
+        home_teams: List[str],
+        away_teams: List[str],
+        df: Optional[pd.DataFrame] = None,
+        states: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """Mismo formato que `NBAPredictor.predict_matchups`."""
+        if states is None:
+            states = build_team_states(df)
+        preds = self.predict(assemble_matchups(states, home_teams, away_teams))
+        return pd.DataFrame({
+            'home_team': list(home_teams),
+            'away_team': list(away_teams),
+            'home_win_probability': preds['win_probability'],
+            'predicted_margin': preds['point_margin'],
+            'predicted_total': preds['total_points'],
+        })
+
+    def predict_matchup(
+        self,
+        home_team: str,
+        away_team: str,
+        df: pd.DataFrame,
+        data_version: Optional[str] = None,
+        as_of: Optional[str] = None,
+        cache=None
+    ) -> Dict[str, float]:
+        """Mismo comportamiento (y claves de caché) que `NBAPredictor.predict_matchup`."""
+        return cached_matchup_prediction(
+            self, home_team, away_team, df,
+            data_version=data_version, as_of=as_of, cache=cache
+        )
+
+    def save(self, filepath: str):
+        """Guarda el alumno como .npz (sin pickle)."""
+        arrays = {
+            'kind': np.array(self.kind),
+            'n_bins': np.array(self.n_bins),
+            'alpha': np.array(self.alpha),
+            'feature_columns': np.array(self.feature_columns),
+            'fill': self.fill,
+            'weights': self.weights,
+            'intercepts': self.intercepts,
+            'metadata': np.array(json.dumps(self.metadata, default=str)),
+        }
+        if self.kind == 'linear':
+            arrays.update(center=self.center, scale=self.scale)
+        else:
+            arrays['edges'] = self.edges
+
+        Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+        with open(filepath, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        self.model_version = file_fingerprint(filepath)
+        print(f"💾 Alumno guardado en: {filepath}")
+
+    def load(self, filepath: str):
+        """Carga un alumno guardado con `save`."""
+        with np.load(filepath, allow_pickle=False) as data:
+            self.kind = str(data['kind'])
+            self.n_bins = int(data['n_bins'])
+            self.alpha = float(data['alpha'])
+            self.feature_columns = data['feature_columns'].tolist()
+            self.fill = data['fill']
+            self.weights = data['weights']
+            self.intercepts = data['intercepts']
+            self.metadata = json.loads(str(data['metadata']))
+            if self.kind == 'linear':
+                self.center, self.scale = data['center'], data['scale']
+            else:
+                self.edges = data['edges']
+        self.model_version = file_fingerprint(filepath)
+        print(f"✅ Alumno cargado desde: {filepath}")
+
+    @classmethod
+    def load_model(cls, filepath: str) -> 'StudentPredictor':
+        instance = cls()
+        instance.load(filepath)
+        return instance
+
+
+def distill(
+    teacher,
+    X: pd.DataFrame,
+    kind: str = 'additive',
+    n_bins: int = 16,
+    alpha: float = 1.0
+) -> StudentPredictor:
+    """
+    Entrena un alumno con las predicciones del maestro sobre X.
+
+    Args:
+        teacher: NBAPredictor entrenado
+        X: Conjunto de transferencia (no necesita etiquetas)
+        kind: 'additive' o 'linear'
+        n_bins: Bins por feature (solo additive)
+        alpha: Regularización ridge
+
+    Returns:
+        StudentPredictor ajustado
+    """
+    X = X[teacher.feature_columns]
+    student = StudentPredictor(kind=kind, n_bins=n_bins, alpha=alpha)
+    student.fit(X, teacher.predict(X))
+    student.metadata = {
+        'teacher_version': teacher.model_version,
+        'teacher_trained_until': teacher.metadata.get('trained_until'),
+        'transfer_rows': len(X),
+    }
+    return student
+
+
+def fidelity_report(
+    teacher: Dict[str, np.ndarray],
+    student: Dict[str, np.ndarray],
+    y_win: Optional[Sequence] = None,
+    y_margin: Optional[Sequence] = None,
+    y_total: Optional[Sequence] = None
+) -> Dict[str, float]:
+    """
+    Diferencia entre alumno y maestro (y contra el resultado real si se pasa).
+
+    Args:
+        teacher, student: Salidas de `predict` sobre los mismos partidos
+
+    Returns:
+        Diccionario de métricas
+    """
+    p_teacher = np.asarray(teacher['win_probability'], dtype=np.float64)
+    p_student = np.asarray(student['win_probability'], dtype=np.float64)
+    report = {
+        'win_proba_mae': float(np.mean(np.abs(p_student - p_teacher))),
+        'win_proba_max_diff': float(np.max(np.abs(p_student - p_teacher))),
+        'pick_agreement': float(np.mean((p_student > 0.5) == (p_teacher > 0.5))),
+        'margin_mae_vs_teacher': float(np.mean(np.abs(student['point_margin'] - teacher['point_margin']))),
+        'total_mae_vs_teacher': float(np.mean(np.abs(student['total_points'] - teacher['total_points']))),
+    }
+
+    if y_win is not None:
+        y_win = np.asarray(y_win, dtype=np.float64)
+        for name, proba in (('teacher', p_teacher), ('student', p_student)):
+            clipped = np.clip(proba, _PROBA_CLIP, 1 - _PROBA_CLIP)
+            report[f'{name}_accuracy'] = float(np.mean((proba > 0.5) == y_win))
+            report[f'{name}_log_loss'] = float(-np.mean(y_win * np.log(clipped) + (1 - y_win) * np.log(1 - clipped)))
+    for target, key, truth in (('margin', 'point_margin', y_margin), ('total', 'total_points', y_total)):
+        if truth is not None:
+            truth = np.asarray(truth, dtype=np.float64)
+            report[f'teacher_{target}_mae'] = float(np.mean(np.abs(teacher[key] - truth)))
+            report[f'student_{target}_mae'] = float(np.mean(np.abs(student[key] - truth)))
+
+    return report
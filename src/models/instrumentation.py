@@ -0,0 +1,237 @@
+"""Métricas de latencia y throughput de inferencia (formato de texto Prometheus)."""
+
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Sequence
+
+
+# Límites superiores de los buckets (segundos)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Límites superiores de los buckets de tamaño de lote (filas)
+BATCH_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+class Histogram:
+    """Histograma acumulativo con buckets fijos, al estilo Prometheus."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # el último es +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _NullTimer:
+    """Contexto vacío que se devuelve cuando las métricas están desactivadas."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _PhaseTimer:
+    def __init__(self, metrics: 'InferenceMetrics', phase: str):
+        self.metrics = metrics
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe_phase(self.phase, time.perf_counter() - self.start, error=exc_type is not None)
+        return False
+
+
+class InferenceMetrics:
+    """
+    Histogramas de latencia por fase y contadores de llamadas, filas y errores.
+
+    Fases de NBAPredictor: feature_assembly, scaling (solo bundles antiguos),
+    win_model, margin_model y total_model.
+
+    Desactivado (por defecto), cada punto de medida cuesta una comprobación
+    de un booleano. Se activa con `enable()` o con la variable de entorno
+    NBA_METRICS=1.
+    """
+
+    def __init__(self, enabled: bool = False, namespace: str = 'nba_predictor'):
+        self.enabled = enabled
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.phase_seconds = {}
+            self.batch_rows = Histogram(BATCH_BUCKETS)
+            self.calls = {}
+            self.errors = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def phase(self, name: str):
+        """Context manager que mide la duración de una fase."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _PhaseTimer(self, name)
+
+    def observe_phase(self, name: str, seconds: float, error: bool = False):
+        with self._lock:
+            histogram = self.phase_seconds.get(name)
+            if histogram is None:
+                histogram = self.phase_seconds[name] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+            if error:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+    def record_call(self, method: str, rows: int):
+        """Cuenta una llamada y el tamaño de su lote."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            self.batch_rows.observe(rows)
+
+    def render(self) -> str:
+        """Exposición en formato de texto de Prometheus."""
+        ns = self.namespace
+        lines = []
+
+        def histogram_lines(name: str, histogram: Histogram, labels: str = ''):
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (float('inf'),), histogram.counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{name}_bucket{{{labels}le="{le}"}} {cumulative}')
+            suffix = f'{{{labels.rstrip(",")}}}' if labels else ''
+            lines.append(f'{name}_sum{suffix} {histogram.sum}')
+            lines.append(f'{name}_count{suffix} {histogram.count}')
+
+        with self._lock:
+            lines.append(f'# HELP {ns}_phase_seconds Latencia por fase de inferencia.')
+            lines.append(f'# TYPE {ns}_phase_seconds histogram')
+            for phase, histogram in sorted(self.phase_seconds.items()):
+                histogram_lines(f'{ns}_phase_seconds', histogram, f'phase="{phase}",')
+
+            lines.append(f'# HELP {ns}_batch_rows Filas por llamada a predict.')
+            lines.append(f'# TYPE {ns}_batch_rows histogram')
+            histogram_lines(f'{ns}_batch_rows', self.batch_rows)
+
+            lines.append(f'# HELP {ns}_calls_total Llamadas por método.')
+            lines.append(f'# TYPE {ns}_calls_total counter')
+            for method, count in sorted(self.calls.items()):
+                lines.append(f'{ns}_calls_total{{method="{method}"}} {count}')
+
+            lines.append(f'# HELP {ns}_errors_total Errores por fase.')
+            lines.append(f'# TYPE {ns}_errors_total counter')
+            for phase, count in sorted(self.errors.items()):
+                lines.append(f'{ns}_errors_total{{phase="{phase}"}} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str):
+        """Escribe la exposición a un archivo (textfile collector de node_exporter)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'.{path.name}.tmp')
+        tmp_path.write_text(self.render())
+        os.replace(tmp_path, path)
+
+    def start_textfile_writer(self, path: str, interval: float = 15.0) -> threading.Thread:
+        """Reescribe el archivo de métricas cada `interval` segundos en segundo plano."""
+        def loop():
+            while True:
+                try:
+                    self.write_textfile(path)
+                except Exception as e:
+                    # Un fallo puntual (disco lleno, permisos) no debe parar el exportador
+                    print(f"⚠️  No se pudo escribir {path}: {e}")
+                time.sleep(interval)
+
+        thread = threading.Thread(target=loop, name='metrics-textfile', daemon=True)
+        thread.start()
+        return thread
+
+    def serve(self, port: int = 9108, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """Expone /metrics en un servidor HTTP local en segundo plano."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+        print(f"📈 Métricas en http://{host}:{server.server_address[1]}/metrics")
+        return server
+
+
+METRICS = InferenceMetrics(enabled=os.environ.get('NBA_METRICS') == '1')
+
+
+def timed(phase: str):
+    """Decorador que mide una función como fase de inferencia."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                return func(*args, **kwargs)
+            with METRICS.phase(phase):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def configure_from_env() -> List[object]:
+    """
+    Activa las métricas según el entorno.
+
+    NBA_METRICS_PORT: sirve /metrics en ese puerto.
+    NBA_METRICS_FILE: reescribe periódicamente ese archivo.
+    Cualquiera de las dos activa la recolección; si están las dos, arrancan
+    ambos exportadores.
+
+    Returns:
+        Exportadores arrancados (servidor HTTP y/o hilo del archivo)
+    """
+    port = os.environ.get('NBA_METRICS_PORT')
+    textfile = os.environ.get('NBA_METRICS_FILE')
+    exporters = []
+    if port or textfile:
+        METRICS.enable()
+    if port:
+        exporters.append(METRICS.serve(int(port)))
+    if textfile:
+        exporters.append(METRICS.start_textfile_writer(textfile))
+    return exporters
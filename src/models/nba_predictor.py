@@ -2,28 +2,257 @@
 
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import LogisticRegression, Ridge, LinearRegression
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.calibration import CalibratedClassifierCV
-from sklearn.metrics import log_loss, brier_score_loss, roc_auc_score, accuracy_score, mean_absolute_error, r2_score
-from xgboost import XGBClassifier, XGBRegressor
-import joblib
 from pathlib import Path
-from typing import Dict, Tuple, List
+from typing import Callable, Dict, Tuple, List, Optional
+from src.data.versioning import file_fingerprint
+from src.features.matchup_features import build_team_states, assemble_matchups
+from src.models.instrumentation import METRICS, timed
 import warnings
 warnings.filterwarnings('ignore')
 
+# xgboost (que a su vez importa sklearn y scipy), joblib y sklearn.metrics se
+# importan al primer uso: importar este módulo no cuesta ~2 s de arranque.
+
+
+def compute_metrics(
+    y_win: np.ndarray,
+    win_proba: np.ndarray,
+    y_margin: np.ndarray,
+    margin_pred: np.ndarray,
+    y_total: np.ndarray,
+    total_pred: np.ndarray
+) -> Dict[str, float]:
+    """
+    Calcula las métricas de los tres modelos a partir de predicciones.
+    
+    Returns:
+        Diccionario con métricas de victoria, margen y total
+    """
+    from sklearn.metrics import log_loss, brier_score_loss, roc_auc_score, accuracy_score, mean_absolute_error, r2_score
+    
+    metrics = {}
+    
+    # Predicciones de victoria
+    y_win_pred = (win_proba > 0.5).astype(int)
+    
+    metrics['win_accuracy'] = accuracy_score(y_win, y_win_pred)
+    metrics['win_log_loss'] = log_loss(y_win, win_proba, labels=[0, 1])
+    metrics['win_brier_score'] = brier_score_loss(y_win, win_proba)
+    # ROC AUC no está definido si el bloque solo tiene una clase
+    metrics['win_roc_auc'] = roc_auc_score(y_win, win_proba) if len(np.unique(y_win)) > 1 else np.nan
+    
+    # Predicciones de margen
+    metrics['margin_mae'] = mean_absolute_error(y_margin, margin_pred)
+    metrics['margin_r2'] = r2_score(y_margin, margin_pred)
+    
+    # Predicciones de total
+    metrics['total_mae'] = mean_absolute_error(y_total, total_pred)
+    metrics['total_r2'] = r2_score(y_total, total_pred)
+    
+    return metrics
+
+
+# Features base que usan los modelos (columnas del dataset procesado)
+BASE_FEATURES = [
+    # ELO
+    'HOME_ELO_BEFORE', 'AWAY_ELO_BEFORE', 'ELO_DIFF',
+    
+    # Rolling stats (últimos 5 partidos)
+    'HOME_PTS_ROLL_5', 'AWAY_PTS_ROLL_5',
+    'HOME_FG_PCT_ROLL_5', 'AWAY_FG_PCT_ROLL_5',
+    'HOME_FG3_PCT_ROLL_5', 'AWAY_FG3_PCT_ROLL_5',
+    'HOME_REB_ROLL_5', 'AWAY_REB_ROLL_5',
+    'HOME_AST_ROLL_5', 'AWAY_AST_ROLL_5',
+    'HOME_TOV_ROLL_5', 'AWAY_TOV_ROLL_5',
+    
+    # Rolling stats (últimos 10 partidos)
+    'HOME_PTS_ROLL_10', 'AWAY_PTS_ROLL_10',
+    
+    # Rest y back-to-back
+    'HOME_REST_DAYS', 'AWAY_REST_DAYS',
+    'HOME_BACK_TO_BACK', 'AWAY_BACK_TO_BACK',
+    
+    # Win streaks
+    'HOME_WIN_STREAK', 'AWAY_WIN_STREAK',
+    
+    # Season stats
+    'HOME_WIN_PCT', 'AWAY_WIN_PCT',
+    
+    # NUEVAS FEATURES DEFENSIVAS
+    'HOME_STL_ROLL_5', 'AWAY_STL_ROLL_5',
+    'HOME_BLK_ROLL_5', 'AWAY_BLK_ROLL_5',
+]
+
+
+def add_interaction_features(X: pd.DataFrame) -> pd.DataFrame:
+    """Añade las features de interacción a partir de las features base disponibles."""
+    if 'ELO_DIFF' in X.columns and 'HOME_REST_DAYS' in X.columns:
+        X['ELO_DIFF_X_REST'] = X['ELO_DIFF'] * (X['HOME_REST_DAYS'] - X['AWAY_REST_DAYS'])
+    
+    if 'HOME_WIN_PCT' in X.columns and 'AWAY_WIN_PCT' in X.columns:
+        X['WIN_PCT_DIFF'] = X['HOME_WIN_PCT'] - X['AWAY_WIN_PCT']
+    
+    if 'HOME_PTS_ROLL_5' in X.columns and 'AWAY_PTS_ROLL_5' in X.columns:
+        X['PTS_DIFF_ROLL_5'] = X['HOME_PTS_ROLL_5'] - X['AWAY_PTS_ROLL_5']
+    
+    if 'HOME_FG_PCT_ROLL_5' in X.columns and 'AWAY_FG_PCT_ROLL_5' in X.columns:
+        X['FG_PCT_DIFF_ROLL_5'] = X['HOME_FG_PCT_ROLL_5'] - X['AWAY_FG_PCT_ROLL_5']
+    
+    return X
+
+
+# Grupos de features para las explicaciones: las de interacción van con sus componentes
+FEATURE_GROUPS = {
+    'ELO': ['HOME_ELO_BEFORE', 'AWAY_ELO_BEFORE', 'ELO_DIFF'],
+    'Récord': ['HOME_WIN_PCT', 'AWAY_WIN_PCT', 'WIN_PCT_DIFF'],
+    'Racha': ['HOME_WIN_STREAK', 'AWAY_WIN_STREAK'],
+    'Anotación': ['HOME_PTS_ROLL_5', 'AWAY_PTS_ROLL_5', 'HOME_PTS_ROLL_10', 'AWAY_PTS_ROLL_10', 'PTS_DIFF_ROLL_5'],
+    'Tiro': ['HOME_FG_PCT_ROLL_5', 'AWAY_FG_PCT_ROLL_5', 'HOME_FG3_PCT_ROLL_5', 'AWAY_FG3_PCT_ROLL_5',
+             'FG_PCT_DIFF_ROLL_5'],
+    'Rebotes': ['HOME_REB_ROLL_5', 'AWAY_REB_ROLL_5'],
+    'Asistencias': ['HOME_AST_ROLL_5', 'AWAY_AST_ROLL_5'],
+    'Pérdidas': ['HOME_TOV_ROLL_5', 'AWAY_TOV_ROLL_5'],
+    'Defensa': ['HOME_STL_ROLL_5', 'AWAY_STL_ROLL_5', 'HOME_BLK_ROLL_5', 'AWAY_BLK_ROLL_5'],
+    'Descanso': ['HOME_REST_DAYS', 'AWAY_REST_DAYS', 'HOME_BACK_TO_BACK', 'AWAY_BACK_TO_BACK', 'ELO_DIFF_X_REST'],
+}
+
+
+def top_drivers(contributions: pd.Series, k: int = 5) -> pd.DataFrame:
+    """
+    Los k factores con más peso (en valor absoluto) de una fila de contribuciones.
+    
+    Args:
+        contributions: Fila de `NBAPredictor.explain` (sin contar BIAS)
+        k: Número de factores
+        
+    Returns:
+        DataFrame con factor, contribución y equipo favorecido ('home'/'away')
+    """
+    contributions = contributions.drop('BIAS', errors='ignore')
+    top = contributions.reindex(contributions.abs().sort_values(ascending=False).index[:k])
+    return pd.DataFrame({
+        'driver': top.index,
+        'contribution': top.values,
+        'favors': np.where(top.values >= 0, 'home', 'away'),
+    })
+
+
+# Objetivo de cada modelo (entrenados con la API nativa de XGBoost)
+OBJECTIVES = {
+    'win': {'objective': 'binary:logistic', 'eval_metric': 'logloss'},
+    'margin': {'objective': 'reg:squarederror'},
+    'total': {'objective': 'reg:squarederror'},
+}
+
+
+def _predict_model(model, X, proba: bool = False) -> np.ndarray:
+    """Predice con un Booster nativo o con un estimador sklearn de bundles antiguos."""
+    import xgboost as xgb
+    if isinstance(model, xgb.Booster):
+        # Un array float32 evita la conversión por columna de DataFrame (~20x más rápido)
+        if isinstance(X, pd.DataFrame):
+            if model.feature_names is not None and list(X.columns) != model.feature_names:
+                X = X[model.feature_names]
+            X = X.to_numpy(dtype=np.float32)
+        return model.inplace_predict(X)
+    return model.predict_proba(X)[:, 1] if proba else model.predict(X)
+
+
+def game_result(home_team: str, away_team: str, preds: Dict[str, np.ndarray], row: int = 0) -> Dict[str, float]:
+    """Resultado de `predict_game` a partir de la fila `row` de `predict`."""
+    win_proba = float(preds['win_probability'][row])
+    margin = float(preds['point_margin'][row])
+    total = float(preds['total_points'][row])
+    return {
+        'home_team': home_team,
+        'away_team': away_team,
+        'home_win_probability': win_proba,
+        'away_win_probability': 1 - win_proba,
+        'predicted_margin': margin,
+        'predicted_total': total,
+        'predicted_home_score': (total + margin) / 2,
+        'predicted_away_score': (total - margin) / 2,
+    }
+
+
+def cached_matchup_prediction(
+    predictor,
+    home_team: str,
+    away_team: str,
+    df: pd.DataFrame,
+    data_version: Optional[str] = None,
+    as_of: Optional[str] = None,
+    cache=None,
+    predict_game: Optional[Callable[[str, str, Dict[str, float]], Dict[str, float]]] = None
+) -> Dict[str, float]:
+    """
+    `predict_matchup` de cualquier predictor con `prepare_features_for_game`,
+    `predict_game` y `model_version` (NBAPredictor y StudentPredictor).
+    """
+    if as_of is not None:
+        df = df[pd.to_datetime(df['GAME_DATE']) <= pd.Timestamp(as_of)]
+        as_of = str(pd.Timestamp(as_of).date())
+    else:
+        as_of = str(pd.to_datetime(df['GAME_DATE']).max().date())
+
+    def compute():
+        features = predictor.prepare_features_for_game(home_team, away_team, df)
+        return (predict_game or predictor.predict_game)(home_team, away_team, features)
+
+    if cache is None or data_version is None or predictor.model_version is None:
+        return compute()
+
+    key = cache.make_key(home_team, away_team, as_of, data_version, predictor.model_version)
+    return cache.get_or_compute(key, compute)
+
+
+# Hiperparámetros por defecto de los tres modelos XGBoost
+DEFAULT_PARAMS = {
+    'win': {
+        'n_estimators': 200,
+        'max_depth': 5,
+        'learning_rate': 0.05,
+        'subsample': 0.8,
+        'colsample_bytree': 0.8,
+    },
+    'margin': {
+        'n_estimators': 180,
+        'max_depth': 5,
+        'learning_rate': 0.05,
+        'subsample': 0.8,
+        'colsample_bytree': 0.8,
+    },
+    'total': {
+        'n_estimators': 180,
+        'max_depth': 5,
+        'learning_rate': 0.05,
+        'subsample': 0.8,
+        'colsample_bytree': 0.8,
+    },
+}
+
 
 class NBAPredictor:
     """Sistema de predicción para partidos NBA."""
     
-    def __init__(self):
+    def __init__(self, params: Optional[Dict[str, Dict]] = None, features: Optional[List[str]] = None):
+        """
+        Args:
+            params: Hiperparámetros por modelo ('win', 'margin', 'total') que
+                reemplazan a los de DEFAULT_PARAMS
+            features: Subconjunto de features a usar (ej. la lista recomendada
+                por `scripts/analyze_features.py`); None = todas
+        """
+        self.features = features
         self.win_model = None
         self.margin_model = None
         self.total_model = None
-        self.scaler = StandardScaler()
+        self.scaler = None  # Solo lo usan bundles antiguos entrenados con features escaladas
         self.feature_columns = None
+        self.params = {name: {**defaults, **(params or {}).get(name, {})}
+                       for name, defaults in DEFAULT_PARAMS.items()}
+        self.metadata = {}
+        self.model_version = None  # Huella del bundle en disco (ver save/load)
         
     def prepare_features(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series, pd.Series, pd.Series]:
         """
@@ -33,35 +262,7 @@ class NBAPredictor:
             X, y_win, y_margin, y_total
         """
         # Seleccionar features relevantes
-        feature_cols = [
-            # ELO
-            'HOME_ELO_BEFORE', 'AWAY_ELO_BEFORE', 'ELO_DIFF',
-            
-            # Rolling stats (últimos 5 partidos)
-            'HOME_PTS_ROLL_5', 'AWAY_PTS_ROLL_5',
-            'HOME_FG_PCT_ROLL_5', 'AWAY_FG_PCT_ROLL_5',
-            'HOME_FG3_PCT_ROLL_5', 'AWAY_FG3_PCT_ROLL_5',
-            'HOME_REB_ROLL_5', 'AWAY_REB_ROLL_5',
-            'HOME_AST_ROLL_5', 'AWAY_AST_ROLL_5',
-            'HOME_TOV_ROLL_5', 'AWAY_TOV_ROLL_5',
-            
-            # Rolling stats (últimos 10 partidos)
-            'HOME_PTS_ROLL_10', 'AWAY_PTS_ROLL_10',
-            
-            # Rest y back-to-back
-            'HOME_REST_DAYS', 'AWAY_REST_DAYS',
-            'HOME_BACK_TO_BACK', 'AWAY_BACK_TO_BACK',
-            
-            # Win streaks
-            'HOME_WIN_STREAK', 'AWAY_WIN_STREAK',
-            
-            # Season stats
-            'HOME_WIN_PCT', 'AWAY_WIN_PCT',
-            
-            # NUEVAS FEATURES DEFENSIVAS
-            'HOME_STL_ROLL_5', 'AWAY_STL_ROLL_5',
-            'HOME_BLK_ROLL_5', 'AWAY_BLK_ROLL_5',
-        ]
+        feature_cols = BASE_FEATURES
         
         # Filtrar solo las columnas que existen
         available_features = [col for col in feature_cols if col in df.columns]
@@ -76,17 +277,11 @@ class NBAPredictor:
         X = df[available_features].copy()
         
         # CREAR FEATURES DE INTERACCIÓN
-        if 'ELO_DIFF' in X.columns and 'HOME_REST_DAYS' in X.columns:
-            X['ELO_DIFF_X_REST'] = X['ELO_DIFF'] * (X['HOME_REST_DAYS'] - X['AWAY_REST_DAYS'])
+        X = add_interaction_features(X)
         
-        if 'HOME_WIN_PCT' in X.columns and 'AWAY_WIN_PCT' in X.columns:
-            X['WIN_PCT_DIFF'] = X['HOME_WIN_PCT'] - X['AWAY_WIN_PCT']
-        
-        if 'HOME_PTS_ROLL_5' in X.columns and 'AWAY_PTS_ROLL_5' in X.columns:
-            X['PTS_DIFF_ROLL_5'] = X['HOME_PTS_ROLL_5'] - X['AWAY_PTS_ROLL_5']
-        
-        if 'HOME_FG_PCT_ROLL_5' in X.columns and 'AWAY_FG_PCT_ROLL_5' in X.columns:
-            X['FG_PCT_DIFF_ROLL_5'] = X['HOME_FG_PCT_ROLL_5'] - X['AWAY_FG_PCT_ROLL_5']
+        # Subconjunto elegido (las interacciones se calculan antes de filtrar)
+        if self.features is not None:
+            X = X[[col for col in X.columns if col in self.features]]
         
         # Actualizar feature_columns con las nuevas features de interacción
         self.feature_columns = X.columns.tolist()
@@ -102,6 +297,7 @@ class NBAPredictor:
         
         return X, y_win, y_margin, y_total
     
+    @timed('feature_assembly')
     def prepare_features_for_game(self, home_team: str, away_team: str, df: pd.DataFrame) -> Dict[str, float]:
         """
         Prepara features para predecir un partido específico.
@@ -114,16 +310,19 @@ class NBAPredictor:
         Returns:
             Diccionario con features para predicción
         """
-        # Obtener el último partido de cada equipo para calcular features
+        # Obtener el último partido de cada equipo. GAME_ID desempata partidos del
+        # mismo día y, sin GAME_ID, la fila posterior del histórico (orden
+        # ascendente estable e invertido), igual que `build_team_states`
+        order = ['GAME_DATE', 'GAME_ID'] if 'GAME_ID' in df.columns else ['GAME_DATE']
         home_games = df[
             (df['HOME_TEAM_NAME'] == home_team) | 
             (df['AWAY_TEAM_NAME'] == home_team)
-        ].sort_values('GAME_DATE', ascending=False)
+        ].sort_values(order, kind='mergesort').iloc[::-1]
         
         away_games = df[
             (df['HOME_TEAM_NAME'] == away_team) | 
             (df['AWAY_TEAM_NAME'] == away_team)
-        ].sort_values('GAME_DATE', ascending=False)
+        ].sort_values(order, kind='mergesort').iloc[::-1]
         
         if home_games.empty or away_games.empty:
             raise ValueError(f"No hay datos suficientes para uno de los equipos: {home_team}, {away_team}")
@@ -242,7 +441,50 @@ class NBAPredictor:
         
         # Preparar datos
         X, y_win, y_margin, y_total = self.prepare_features(df)
+        dates = pd.to_datetime(df.loc[X.index, 'GAME_DATE']) if 'GAME_DATE' in df.columns else None
         
+        return self._train_split(X, y_win, y_margin, y_total, dates, test_size, random_state)
+    
+    def train_matrix(
+        self,
+        matrix,
+        test_size: float = 0.2,
+        random_state: int = 42
+    ) -> Dict[str, float]:
+        """
+        Igual que `train`, pero sobre una `TrainingMatrix` ya preparada.
+        
+        La matriz (`src.features.matrix_cache`) suele venir mapeada desde la
+        caché en disco, así que no se vuelve a leer el Parquet ni a ejecutar
+        `prepare_features`. Está en orden cronológico: el split es temporal.
+        
+        Args:
+            matrix: TrainingMatrix construida con el mismo `features`
+            test_size: Proporción de datos para test
+            random_state: Semilla aleatoria
+            
+        Returns:
+            Diccionario con métricas de evaluación
+        """
+        if self.features is not None and not set(matrix.columns) <= set(self.features):
+            raise ValueError("La matriz no se construyó con las features de este predictor")
+        self.feature_columns = list(matrix.columns)
+        
+        print("🏋️  Entrenando modelos...")
+        X, y_win, y_margin, y_total = matrix.frames()
+        return self._train_split(X, y_win, y_margin, y_total, pd.Series(matrix.dates), test_size, random_state)
+    
+    def _train_split(
+        self,
+        X: pd.DataFrame,
+        y_win: pd.Series,
+        y_margin: pd.Series,
+        y_total: pd.Series,
+        dates: Optional[pd.Series],
+        test_size: float,
+        random_state: int
+    ) -> Dict[str, float]:
+        """Split temporal, ajuste, evaluación y referencias de `train`/`train_matrix`."""
         # Split temporal (importante para series de tiempo)
         split_idx = int(len(X) * (1 - test_size))
         
@@ -251,81 +493,324 @@ class NBAPredictor:
         y_margin_train, y_margin_test = y_margin.iloc[:split_idx], y_margin.iloc[split_idx:]
         y_total_train, y_total_test = y_total.iloc[:split_idx], y_total.iloc[split_idx:]
         
-        # Escalar features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
-        
-        # 1. Modelo de probabilidad de victoria - MEJORADO CON XGBOOST
-        print("  - Entrenando modelo de victoria (XGBoost)...")
-        self.win_model = XGBClassifier(
-            n_estimators=200,
-            max_depth=5,
-            learning_rate=0.05,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            random_state=random_state,
-            eval_metric='logloss'
-        )
-        self.win_model.fit(X_train_scaled, y_win_train, verbose=False)
-        
-        # 2. Modelo de margen de puntos - MEJORADO CON XGBOOST
-        print("  - Entrenando modelo de margen (XGBoost optimizado)...")
-        self.margin_model = XGBRegressor(
-            n_estimators=180,
-            max_depth=5,
-            learning_rate=0.05,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            random_state=random_state
-        )
-        self.margin_model.fit(X_train_scaled, y_margin_train, verbose=False)
-        
-        # 3. Modelo de puntos totales - MEJORADO CON XGBOOST
-        print("  - Entrenando modelo de total de puntos (XGBoost optimizado)...")
-        self.total_model = XGBRegressor(
-            n_estimators=180,
-            max_depth=5,
-            learning_rate=0.05,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            random_state=random_state
-        )
-        self.total_model.fit(X_train_scaled, y_total_train, verbose=False)
+        # Entrenar los tres modelos sobre el bloque de entrenamiento
+        self.fit(X_train, y_win_train, y_margin_train, y_total_train, random_state=random_state)
         
         # Evaluar
         print("\n📊 Evaluando modelos en test set...")
-        metrics = self.evaluate(X_test_scaled, y_win_test, y_margin_test, y_total_test)
+        metrics = self.evaluate(X_test, y_win_test, y_margin_test, y_total_test)
+        
+        # Referencias para las actualizaciones incrementales (`update`)
+        self.metadata['metrics'] = {k: float(v) for k, v in metrics.items()}
+        if dates is not None and len(X_train):
+            self.metadata['trained_until'] = str(pd.Timestamp(dates.iloc[:split_idx].max()).date())
         
         return metrics
     
+    def fit(
+        self,
+        X_train: pd.DataFrame,
+        y_win_train: pd.Series,
+        y_margin_train: pd.Series,
+        y_total_train: pd.Series,
+        random_state: int = 42,
+        n_jobs: Optional[int] = None,
+        verbose: bool = True
+    ):
+        """
+        Ajusta los tres modelos sobre un bloque de entrenamiento.
+        
+        A diferencia de `train`, no hace split ni evaluación; lo usan el
+        backtesting walk-forward y cualquier flujo que ya tenga su propio
+        particionado temporal.
+        
+        Los tres modelos comparten un único QuantileDMatrix (cortes de
+        histograma calculados una sola vez); entre modelo y modelo solo se
+        cambia la etiqueta. Las features no se escalan: los árboles no lo
+        necesitan. En memoria cuesta lo mismo que tres fits sklearn
+        (`scripts/benchmark_training.py`); la matriz compartida es lo que
+        permite a `train_streaming` leer el Parquet una sola vez.
+        
+        Args:
+            X_train: Features de entrenamiento (columnas de `feature_columns`)
+            y_win_train: Target de victoria local
+            y_margin_train: Target de margen de puntos
+            y_total_train: Target de puntos totales
+            random_state: Semilla aleatoria
+            n_jobs: Hilos de XGBoost por modelo (None = todos los núcleos)
+            verbose: Si True, imprime el progreso
+        """
+        import xgboost as xgb
+        
+        # Distribución de las features de entrenamiento (para detectar drift)
+        X_values = np.asarray(X_train, dtype=np.float64)
+        self.metadata['feature_stats'] = {
+            'mean': X_values.mean(axis=0).tolist(),
+            'std': X_values.std(axis=0).tolist(),
+        }
+        
+        dtrain = xgb.QuantileDMatrix(
+            np.asarray(X_train, dtype=np.float32),
+            label=np.asarray(y_win_train, dtype=np.float32),
+            feature_names=self.feature_columns,
+            nthread=n_jobs or -1
+        )
+        
+        return self.fit_matrix(dtrain, y_margin_train, y_total_train, random_state, n_jobs, verbose)
+    
+    def fit_matrix(
+        self,
+        dtrain: 'xgb.DMatrix',
+        y_margin_train: np.ndarray,
+        y_total_train: np.ndarray,
+        random_state: int = 42,
+        n_jobs: Optional[int] = None,
+        verbose: bool = True
+    ):
+        """
+        Entrena los tres modelos sobre una matriz XGBoost ya construida.
+        
+        `dtrain` debe traer como etiqueta el target de victoria; los targets
+        de margen y total se asignan después sobre la misma matriz. Lo usan
+        `fit` y el entrenamiento out-of-core (`src.models.streaming`).
+        """
+        # Los bundles con árboles nativos no usan scaler
+        self.scaler = None
+        
+        # 1. Modelo de probabilidad de victoria - XGBOOST
+        if verbose:
+            print("  - Entrenando modelo de victoria (XGBoost)...")
+        self.win_model = self._train_booster('win', dtrain, random_state, n_jobs)
+        
+        # 2. Modelo de margen de puntos - misma matriz, otra etiqueta
+        if verbose:
+            print("  - Entrenando modelo de margen (XGBoost optimizado)...")
+        dtrain.set_label(np.asarray(y_margin_train, dtype=np.float32))
+        self.margin_model = self._train_booster('margin', dtrain, random_state, n_jobs)
+        
+        # 3. Modelo de puntos totales - misma matriz, otra etiqueta
+        if verbose:
+            print("  - Entrenando modelo de total de puntos (XGBoost optimizado)...")
+        dtrain.set_label(np.asarray(y_total_train, dtype=np.float32))
+        self.total_model = self._train_booster('total', dtrain, random_state, n_jobs)
+        
+        return self
+    
+    def update(
+        self,
+        new_games: pd.DataFrame,
+        extra_rounds: int = 20,
+        window_days: int = 60,
+        half_life_days: float = 14.0,
+        drift_threshold: float = 0.5,
+        degradation_threshold: float = 0.10,
+        min_guard_games: int = 30,
+        history: Optional[pd.DataFrame] = None,
+        random_state: int = 42
+    ) -> Dict:
+        """
+        Actualiza los modelos de forma incremental con partidos nuevos.
+        
+        Continúa el boosting de los Boosters existentes (`xgb_model=`) con
+        `extra_rounds` árboles más, entrenados sobre los partidos de los
+        últimos `window_days` días ponderados por recencia. Antes de
+        actualizar, un guard compara los partidos no vistos con las
+        referencias del último entrenamiento completo:
+        
+        - drift: desplazamiento medio de las features en desviaciones típicas
+        - degradación: aumento relativo del log loss respecto al de test
+        
+        Si no hay partidos posteriores a `trained_until` devuelve
+        `mode='noop'` sin tocar los modelos.
+        
+        Si alguno supera su umbral (o el bundle es antiguo y usa scaler) se
+        hace un reentrenamiento completo con `history` + `new_games`; si no
+        se pasa `history`, se devuelve `mode='retrain_required'` sin tocar
+        los modelos.
+        
+        Args:
+            new_games: Partidos recientes con features y resultados
+            extra_rounds: Árboles adicionales por modelo
+            window_days: Días hacia atrás (desde el último partido) que se usan
+            half_life_days: Vida media del peso por recencia
+            drift_threshold: Umbral de drift (desviaciones típicas)
+            degradation_threshold: Umbral de aumento relativo del log loss
+            min_guard_games: Partidos no vistos mínimos para evaluar la degradación
+            history: Histórico completo para un eventual reentrenamiento
+            random_state: Semilla aleatoria
+            
+        Returns:
+            Diccionario con el modo aplicado y los valores del guard
+        """
+        import xgboost as xgb
+        
+        columns = self.feature_columns
+        X, y_win, y_margin, y_total = self.prepare_features(new_games)
+        self.feature_columns = columns
+        
+        if list(X.columns) != columns:
+            raise ValueError("Los partidos nuevos no tienen las mismas features que el modelo")
+        
+        if X.empty:
+            return {'mode': 'noop', 'n_games': 0}
+        
+        dates = pd.to_datetime(new_games.loc[X.index, 'GAME_DATE'])
+        
+        # Guard: solo partidos que el modelo no ha visto
+        trained_until = self.metadata.get('trained_until')
+        unseen = (dates > pd.Timestamp(trained_until)).values if trained_until else np.ones(len(X), dtype=bool)
+        report = {
+            'n_games': int(len(X)),
+            'n_unseen': int(unseen.sum()),
+            'drift': None,
+            'degradation': None,
+        }
+        
+        # Nada nuevo desde el último entrenamiento: volver a boostear la misma
+        # ventana solo sobreajustaría (p. ej. si el job nocturno corre dos veces)
+        if report['n_unseen'] == 0:
+            print("ℹ️  Sin partidos nuevos desde el último entrenamiento: no se actualiza")
+            return {**report, 'mode': 'noop'}
+        
+        stats = self.metadata.get('feature_stats')
+        if stats and unseen.any():
+            std = np.asarray(stats['std'])
+            std = np.where(std > 0, std, 1.0)
+            shift = np.abs(X.values[unseen].mean(axis=0) - np.asarray(stats['mean'])) / std
+            report['drift'] = float(shift.mean())
+        
+        baseline = self.metadata.get('metrics', {}).get('win_log_loss')
+        if baseline and unseen.sum() >= min_guard_games:
+            win_proba, _, _ = self._predict_arrays(X[unseen])
+            from sklearn.metrics import log_loss
+            current = log_loss(y_win.values[unseen], win_proba, labels=[0, 1])
+            report['degradation'] = float((current - baseline) / baseline)
+        
+        needs_retrain = (
+            self.scaler is not None
+            or not isinstance(self.win_model, xgb.Booster)
+            or (report['drift'] is not None and report['drift'] > drift_threshold)
+            or (report['degradation'] is not None and report['degradation'] > degradation_threshold)
+        )
+        
+        if needs_retrain:
+            if history is None:
+                print("⚠️  Guard activado: se requiere reentrenamiento completo")
+                return {**report, 'mode': 'retrain_required'}
+            
+            print("🔄 Guard activado: reentrenamiento completo...")
+            full = pd.concat([history, new_games], ignore_index=True)
+            if 'GAME_ID' in full.columns:
+                full = full.drop_duplicates('GAME_ID', keep='last')
+            full = full.sort_values('GAME_DATE').reset_index(drop=True)
+            metrics = self.train(full, random_state=random_state)
+            return {**report, 'mode': 'full_retrain', 'metrics': metrics}
+        
+        # Ventana reciente con pesos por recencia
+        recent = (dates >= dates.max() - pd.Timedelta(days=window_days)).values
+        age_days = (dates.max() - dates[recent]).dt.days.values
+        weights = np.power(0.5, age_days / half_life_days)
+        
+        dmatrix = xgb.DMatrix(
+            X.values[recent].astype(np.float32),
+            label=y_win.values[recent],
+            weight=weights,
+            feature_names=columns
+        )
+        
+        for name, target in (('win', y_win), ('margin', y_margin), ('total', y_total)):
+            dmatrix.set_label(np.asarray(target.values[recent], dtype=np.float32))
+            params = {k: v for k, v in self.params[name].items() if k != 'n_estimators'}
+            params.update(OBJECTIVES[name])
+            params.update({'tree_method': 'hist', 'seed': random_state, 'verbosity': 0})
+            
+            model_attr = f'{name}_model'
+            booster = xgb.train(
+                params,
+                dmatrix,
+                num_boost_round=extra_rounds,
+                xgb_model=getattr(self, model_attr)
+            )
+            setattr(self, model_attr, booster)
+        
+        self.metadata['trained_until'] = str(dates.max().date())
+        self.metadata.setdefault('updates', []).append({
+            'date': str(pd.Timestamp.now().date()),
+            'trained_until': self.metadata['trained_until'],
+            'n_games': int(recent.sum()),
+            'extra_rounds': extra_rounds,
+            'drift': report['drift'],
+            'degradation': report['degradation'],
+        })
+        
+        print(f"✅ Actualización incremental: +{extra_rounds} árboles con {int(recent.sum())} partidos")
+        return {**report, 'mode': 'incremental', 'n_window_games': int(recent.sum())}
+    
+    def _train_booster(
+        self,
+        name: str,
+        dtrain: 'xgb.DMatrix',
+        random_state: int,
+        n_jobs: Optional[int]
+    ) -> 'xgb.Booster':
+        """Entrena un Booster nativo con los hiperparámetros de `self.params[name]`."""
+        import xgboost as xgb
+        params = dict(self.params[name])
+        num_boost_round = params.pop('n_estimators')
+        params.update(OBJECTIVES[name])
+        params.update({
+            'tree_method': 'hist',
+            'seed': random_state,
+            'nthread': n_jobs or -1,
+            'verbosity': 0,
+        })
+        return xgb.train(params, dtrain, num_boost_round=num_boost_round)
+    
+    def _predict_arrays(self, X) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Predicciones crudas de los tres modelos: (victoria, margen, total)."""
+        # Bundles antiguos: estimadores sklearn entrenados sobre features escaladas
+        if self.scaler is not None:
+            with METRICS.phase('scaling'):
+                X = self.scaler.transform(X)
+        
+        with METRICS.phase('win_model'):
+            win_proba = _predict_model(self.win_model, X, proba=True)
+        with METRICS.phase('margin_model'):
+            margin_pred = _predict_model(self.margin_model, X)
+        with METRICS.phase('total_model'):
+            total_pred = _predict_model(self.total_model, X)
+        
+        return win_proba, margin_pred, total_pred
+    
+    def set_nthread(self, nthread: int):
+        """Limita los hilos que usa cada modelo al predecir (-1 = todos los núcleos)."""
+        import xgboost as xgb
+        for model in (self.win_model, self.margin_model, self.total_model):
+            if model is None:
+                continue
+            if isinstance(model, xgb.Booster):
+                model.set_param({'nthread': nthread})
+            else:
+                model.set_params(n_jobs=nthread)
+                model.get_booster().set_param({'nthread': nthread})
+    
     def evaluate(
         self,
-        X_test: np.ndarray,
+        X_test: pd.DataFrame,
         y_win_test: pd.Series,
         y_margin_test: pd.Series,
         y_total_test: pd.Series
     ) -> Dict[str, float]:
         """Evalúa los modelos y retorna métricas."""
-        metrics = {}
-        
-        # Predicciones de victoria
-        y_win_proba = self.win_model.predict_proba(X_test)[:, 1]
-        y_win_pred = (y_win_proba > 0.5).astype(int)
-        
-        metrics['win_accuracy'] = accuracy_score(y_win_test, y_win_pred)
-        metrics['win_log_loss'] = log_loss(y_win_test, y_win_proba)
-        metrics['win_brier_score'] = brier_score_loss(y_win_test, y_win_proba)
-        metrics['win_roc_auc'] = roc_auc_score(y_win_test, y_win_proba)
-        
-        # Predicciones de margen
-        y_margin_pred = self.margin_model.predict(X_test)
-        metrics['margin_mae'] = mean_absolute_error(y_margin_test, y_margin_pred)
-        metrics['margin_r2'] = r2_score(y_margin_test, y_margin_pred)
-        
-        # Predicciones de total
-        y_total_pred = self.total_model.predict(X_test)
-        metrics['total_mae'] = mean_absolute_error(y_total_test, y_total_pred)
-        metrics['total_r2'] = r2_score(y_total_test, y_total_pred)
+        win_proba, margin_pred, total_pred = self._predict_arrays(X_test)
+        metrics = compute_metrics(
+            y_win_test,
+            win_proba,
+            y_margin_test,
+            margin_pred,
+            y_total_test,
+            total_pred
+        )
         
         # Imprimir resultados
         print("\n✅ RESULTADOS DE EVALUACIÓN")
@@ -356,12 +841,13 @@ class NBAPredictor:
         Returns:
             Diccionario con predicciones
         """
-        X_scaled = self.scaler.transform(X[self.feature_columns])
+        METRICS.record_call('predict', len(X))
+        win_proba, margin_pred, total_pred = self._predict_arrays(X[self.feature_columns])
         
         predictions = {
-            'win_probability': self.win_model.predict_proba(X_scaled)[:, 1],
-            'point_margin': self.margin_model.predict(X_scaled),
-            'total_points': self.total_model.predict(X_scaled)
+            'win_probability': win_proba,
+            'point_margin': margin_pred,
+            'total_points': total_pred
         }
         
         return predictions
@@ -389,19 +875,164 @@ class NBAPredictor:
         # Predecir
         preds = self.predict(X)
         
-        result = {
-            'home_team': home_team,
-            'away_team': away_team,
-            'home_win_probability': float(preds['win_probability'][0]),
-            'away_win_probability': float(1 - preds['win_probability'][0]),
-            'predicted_margin': float(preds['point_margin'][0]),
-            'predicted_total': float(preds['total_points'][0]),
-            'predicted_home_score': float((preds['total_points'][0] + preds['point_margin'][0]) / 2),
-            'predicted_away_score': float((preds['total_points'][0] - preds['point_margin'][0]) / 2),
-        }
+        return game_result(home_team, away_team, preds)
+    
+    def predict_matchups(
+        self,
+        home_teams: List[str],
+        away_teams: List[str],
+        df: Optional[pd.DataFrame] = None,
+        states: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        Predice muchos enfrentamientos en una sola llamada a cada modelo.
+        
+        Las features son las mismas que `prepare_features_for_game`, pero se
+        construyen a partir del estado de todos los equipos calculado una vez.
+        
+        Args:
+            home_teams: Equipos locales
+            away_teams: Equipos visitantes
+            df: DataFrame histórico con features (si no se pasa `states`)
+            states: Estados de equipo de `build_team_states` ya calculados
+            
+        Returns:
+            DataFrame con una fila por enfrentamiento
+        """
+        with METRICS.phase('feature_assembly'):
+            if states is None:
+                states = build_team_states(df)
+            X = assemble_matchups(states, home_teams, away_teams)
+        preds = self.predict(X)
+        
+        return pd.DataFrame({
+            'home_team': list(home_teams),
+            'away_team': list(away_teams),
+            'home_win_probability': preds['win_probability'].astype(float),
+            'predicted_margin': preds['point_margin'].astype(float),
+            'predicted_total': preds['total_points'].astype(float),
+        })
+    
+    def explain(
+        self,
+        X: pd.DataFrame,
+        models: Tuple[str, ...] = ('win', 'margin', 'total'),
+        group: bool = True,
+        approx: bool = False
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Contribuciones por feature (valores SHAP exactos de los árboles) en lote.
+        
+        Usa `pred_contribs` de XGBoost sobre todo el lote en una llamada por
+        modelo. Cada fila suma la predicción cruda: log-odds para 'win' y
+        puntos para 'margin' y 'total'. Positivo favorece al local (o al over).
+        
+        Args:
+            X: DataFrame con features
+            models: Modelos a explicar
+            group: Agrupar features según FEATURE_GROUPS (las columnas que no
+                estén en ningún grupo se mantienen)
+            approx: Contribuciones aproximadas (Saabas): mucho más rápidas,
+                también aditivas, pero no son valores SHAP
+            
+        Returns:
+            Diccionario modelo -> DataFrame (filas de X x features/grupos + BIAS)
+        """
+        values = X[self.feature_columns]
+        if self.scaler is not None:
+            values = self.scaler.transform(values)
+        values = np.asarray(values, dtype=np.float32)
+        
+        import xgboost as xgb
+        result = {}
+        for name in models:
+            model = getattr(self, f'{name}_model')
+            booster = model if isinstance(model, xgb.Booster) else model.get_booster()
+            # Bundles antiguos se entrenaron sin nombres de features
+            dmatrix = xgb.DMatrix(values, feature_names=self.feature_columns if booster.feature_names else None)
+            with METRICS.phase(f'{name}_explain'):
+                contribs = booster.predict(dmatrix, pred_contribs=True, approx_contribs=approx)
+            
+            frame = pd.DataFrame(contribs[:, :-1], columns=self.feature_columns, index=X.index)
+            if group:
+                grouped = {}
+                for group_name, columns in FEATURE_GROUPS.items():
+                    present = [c for c in columns if c in frame.columns]
+                    if present:
+                        grouped[group_name] = frame[present].sum(axis=1)
+                ungrouped = [c for c in frame.columns
+                             if not any(c in columns for columns in FEATURE_GROUPS.values())]
+                frame = pd.DataFrame({**grouped, **{c: frame[c] for c in ungrouped}}, index=X.index)
+            frame['BIAS'] = contribs[:, -1]
+            result[name] = frame
         
         return result
     
+    def explain_matchups(
+        self,
+        home_teams: List[str],
+        away_teams: List[str],
+        df: Optional[pd.DataFrame] = None,
+        states: Optional[pd.DataFrame] = None,
+        models: Tuple[str, ...] = ('win', 'margin', 'total')
+    ) -> Tuple[pd.DataFrame, Dict[str, pd.DataFrame]]:
+        """
+        Predicciones y contribuciones de muchos enfrentamientos con las mismas features.
+        
+        Las features se construyen una vez y sirven para predecir y explicar.
+        
+        Returns:
+            (salida de `predict_matchups`, salida de `explain`), alineadas por fila
+        """
+        with METRICS.phase('feature_assembly'):
+            if states is None:
+                states = build_team_states(df)
+            X = assemble_matchups(states, home_teams, away_teams)
+        
+        preds = self.predict(X)
+        predictions = pd.DataFrame({
+            'home_team': list(home_teams),
+            'away_team': list(away_teams),
+            'home_win_probability': preds['win_probability'].astype(float),
+            'predicted_margin': preds['point_margin'].astype(float),
+            'predicted_total': preds['total_points'].astype(float),
+        })
+        return predictions, self.explain(X, models=models)
+    
+    def predict_matchup(
+        self,
+        home_team: str,
+        away_team: str,
+        df: pd.DataFrame,
+        data_version: Optional[str] = None,
+        as_of: Optional[str] = None,
+        cache=None,
+        predict_game: Optional[Callable[[str, str, Dict[str, float]], Dict[str, float]]] = None
+    ) -> Dict[str, float]:
+        """
+        Predice un enfrentamiento con el histórico hasta `as_of`, usando caché.
+        
+        La clave de caché es (local, visitante, as_of, versión de datos,
+        versión del modelo); si falta alguna versión se calcula sin caché.
+        
+        Args:
+            home_team: Nombre del equipo local
+            away_team: Nombre del equipo visitante
+            df: DataFrame histórico con features
+            data_version: Versión del dataset (ej. `file_fingerprint` del parquet)
+            as_of: Fecha de corte (default: último partido del histórico)
+            cache: `PredictionCache` opcional
+            predict_game: Inferencia alternativa con la firma de `predict_game`
+                (ej. `PredictorPool.predict_game`)
+            
+        Returns:
+            Diccionario con predicciones (mismo formato que `predict_game`)
+        """
+        return cached_matchup_prediction(
+            self, home_team, away_team, df,
+            data_version=data_version, as_of=as_of, cache=cache, predict_game=predict_game
+        )
+    
     def save(self, filepath: str):
         """Guarda los modelos entrenados."""
         save_data = {
@@ -409,22 +1040,30 @@ class NBAPredictor:
             'margin_model': self.margin_model,
             'total_model': self.total_model,
             'scaler': self.scaler,
-            'feature_columns': self.feature_columns
+            'feature_columns': self.feature_columns,
+            'params': self.params,
+            'metadata': self.metadata
         }
         
+        import joblib
         Path(filepath).parent.mkdir(parents=True, exist_ok=True)
         joblib.dump(save_data, filepath)
+        self.model_version = file_fingerprint(filepath)
         print(f"💾 Modelos guardados en: {filepath}")
     
     def load(self, filepath: str):
         """Carga modelos entrenados."""
+        import joblib
         save_data = joblib.load(filepath)
         
         self.win_model = save_data['win_model']
         self.margin_model = save_data['margin_model']
         self.total_model = save_data['total_model']
-        self.scaler = save_data['scaler']
+        self.scaler = save_data.get('scaler')
         self.feature_columns = save_data['feature_columns']
+        self.params = save_data.get('params', self.params)
+        self.metadata = save_data.get('metadata', {})
+        self.model_version = file_fingerprint(filepath)
         
         print(f"✅ Modelos cargados desde: {filepath}")
     
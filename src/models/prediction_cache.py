@@ -0,0 +1,168 @@
+"""Caché de predicciones por enfrentamiento con expulsión LRU."""
+
+import hashlib
+import json
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+
+# (local, visitante, fecha de corte, versión de datos, versión de modelo)
+CacheKey = Tuple[str, str, str, str, str]
+
+
+class PredictionCache:
+    """
+    Caché de resultados de `NBAPredictor.predict_game`.
+
+    La clave incluye la versión del dataset procesado y la del bundle de
+    modelos, así que un cambio en cualquiera de los dos deja de acertar
+    automáticamente y las entradas viejas salen por LRU. El nivel en disco
+    (opcional) guarda un JSON por entrada dentro de un subdirectorio por
+    par de versiones, de modo que se comparte entre procesos (dashboard,
+    CLI, jobs programados) y `prune` puede borrar versiones obsoletas.
+    """
+
+    def __init__(self, max_entries: int = 1024, disk_dir: Optional[str] = None):
+        """
+        Args:
+            max_entries: Entradas máximas en memoria
+            disk_dir: Directorio del nivel en disco (None = solo memoria)
+        """
+        self.max_entries = max_entries
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_errors = 0
+
+    @staticmethod
+    def make_key(
+        home_team: str,
+        away_team: str,
+        as_of: str,
+        data_version: str,
+        model_version: str
+    ) -> CacheKey:
+        """Construye la clave de caché de un enfrentamiento."""
+        return (home_team, away_team, str(as_of), str(data_version), str(model_version))
+
+    def _disk_path(self, key: CacheKey) -> Path:
+        name = hashlib.sha1('|'.join(key).encode()).hexdigest()
+        return self.disk_dir / f"{key[3]}_{key[4]}" / f"{name}.json"
+
+    def _store(self, key: CacheKey, value: Dict):
+        """Inserta en memoria y expulsa la entrada menos usada si hace falta."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: CacheKey) -> Optional[Dict]:
+        """Devuelve la predicción cacheada o None."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(self._entries[key])
+
+        if self.disk_dir is not None:
+            path = self._disk_path(key)
+            try:
+                with open(path) as f:
+                    value = json.load(f)
+            except (OSError, ValueError):
+                value = None
+            if value is not None:
+                with self._lock:
+                    self._store(key, value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                return dict(value)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: CacheKey, value: Dict):
+        """Guarda una predicción en memoria y, si está activo, en disco."""
+        with self._lock:
+            self._store(key, dict(value))
+
+        if self.disk_dir is not None:
+            path = self._disk_path(key)
+            # Escritura atómica: otro proceso nunca lee un JSON a medias.
+            # Nombre temporal único entre procesos (los ids de hilo se repiten)
+            tmp_path = path.with_suffix(f'.{uuid.uuid4().hex}.tmp')
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, 'w') as f:
+                    json.dump(value, f)
+                tmp_path.replace(path)
+            except OSError as e:
+                # Disco lleno o de solo lectura: la predicción sigue valiendo en memoria
+                try:
+                    tmp_path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+                with self._lock:
+                    self.disk_errors += 1
+                    first = self.disk_errors == 1
+                if first:
+                    print(f"⚠️ No se pudo escribir la caché en disco ({self.disk_dir}): {e}")
+
+    def get_or_compute(self, key: CacheKey, compute: Callable[[], Optional[Dict]]) -> Optional[Dict]:
+        """Devuelve la entrada cacheada o la calcula y la guarda."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def prune(self, data_version: str, model_version: str) -> int:
+        """
+        Borra las entradas (memoria y disco) de otras versiones.
+
+        Returns:
+            Número de entradas en memoria eliminadas
+        """
+        with self._lock:
+            stale = [key for key in self._entries
+                     if key[3] != str(data_version) or key[4] != str(model_version)]
+            for key in stale:
+                del self._entries[key]
+
+        if self.disk_dir is not None and self.disk_dir.exists():
+            current = f"{data_version}_{model_version}"
+            for version_dir in self.disk_dir.iterdir():
+                if version_dir.is_dir() and version_dir.name != current:
+                    shutil.rmtree(version_dir, ignore_errors=True)
+
+        return len(stale)
+
+    def clear(self):
+        """Vacía la memoria (el nivel en disco se conserva)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Contadores de aciertos/fallos y ocupación."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'disk_errors': self.disk_errors,
+                'size': len(self._entries),
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
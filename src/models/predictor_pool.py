@@ -0,0 +1,241 @@
+"""Pool de predictores con hilos limitados y cola acotada que agrupa peticiones."""
+
+import copy
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.models.instrumentation import METRICS
+from src.models.nba_predictor import NBAPredictor, game_result
+from src.models.registry import HotSwapPredictor
+
+
+class PoolSaturatedError(RuntimeError):
+    """La cola de peticiones está llena."""
+
+
+_STOP = object()
+
+
+class _Call:
+    """Llamada completa a un método del predictor (lotes de `predict`, `explain`...)."""
+
+    __slots__ = ('method', 'args', 'kwargs', 'future')
+
+    def __init__(self, method: str, args: Tuple, kwargs: Dict):
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+
+
+class PredictorPool:
+    """
+    Reparte la inferencia de muchas sesiones entre `size` workers.
+
+    Cada worker tiene su propia copia del predictor limitada a `nthread`
+    hilos, así que la inferencia usa como mucho `size * nthread` núcleos
+    sea cual sea el número de sesiones concurrentes. Las peticiones entran en una cola
+    acotada (`max_queue`); cuando está llena `submit` espera `queue_timeout`
+    segundos y después lanza `PoolSaturatedError`. Cada worker toma una
+    petición y las que llegan en los `batch_wait` segundos siguientes (hasta
+    `max_batch`) y las predice en una sola llamada a cada modelo.
+
+    `predict`, `explain` y `explain_matchups` también se ejecutan en un
+    worker (con su copia limitada), de uno en uno y sin agrupar. Con un
+    `HotSwapPredictor` los workers vuelven a copiar el modelo cuando cambia
+    la versión activa. El resto de atributos se delegan en el predictor
+    activo.
+    """
+
+    def __init__(
+        self,
+        predictor,
+        size: Optional[int] = None,
+        nthread: int = 1,
+        max_queue: int = 64,
+        max_batch: int = 32,
+        batch_wait: float = 0.002,
+        queue_timeout: float = 1.0
+    ):
+        self._source = predictor
+        self.size = size or max(1, min(4, os.cpu_count() or 1))
+        self.nthread = nthread
+        self.max_batch = max_batch
+        self.batch_wait = batch_wait
+        self.queue_timeout = queue_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stats_lock = threading.Lock()
+        self._stats = {'requests': 0, 'batches': 0, 'rejected': 0, 'max_batch_seen': 0}
+        self._workers = [
+            threading.Thread(target=self._worker_loop, name=f'predictor-pool-{i}', daemon=True)
+            for i in range(self.size)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _active(self) -> NBAPredictor:
+        if isinstance(self._source, HotSwapPredictor):
+            return self._source.predictor
+        return self._source
+
+    def _instance_for(self, active: NBAPredictor, current: Tuple) -> Tuple:
+        """Copia del predictor activo con los hilos limitados (una por worker)."""
+        if current[0] is active:
+            return current
+        instance = copy.deepcopy(active)
+        instance.set_nthread(self.nthread)
+        return active, instance
+
+    def _worker_loop(self):
+        current = (None, None)
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.put(_STOP)  # que lo vean también los demás workers
+                return
+
+            batch = [item]
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.put(_STOP)  # que lo vean también los demás workers
+                    break
+                batch.append(item)
+
+            try:
+                current = self._instance_for(self._active(), current)
+                self._run_batch(current[1], batch)
+            except Exception as e:
+                for item in batch:
+                    future = item.future if isinstance(item, _Call) else item[3]
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _run_batch(self, instance: NBAPredictor, batch: List):
+        games = []
+        for item in batch:
+            if not isinstance(item, _Call):
+                games.append(item)
+                continue
+            try:
+                item.future.set_result(getattr(instance, item.method)(*item.args, **item.kwargs))
+            except Exception as e:
+                item.future.set_exception(e)
+        if not games:
+            return
+
+        with self._stats_lock:
+            self._stats['batches'] += 1
+            self._stats['max_batch_seen'] = max(self._stats['max_batch_seen'], len(games))
+        METRICS.record_call('pool_batch', len(games))
+
+        X = pd.DataFrame([features for _, _, features, _ in games])
+        preds = instance.predict(X)
+        for row, (home_team, away_team, _, future) in enumerate(games):
+            future.set_result(game_result(home_team, away_team, preds, row))
+
+    def _call(self, method: str, *args, **kwargs):
+        """
+        Ejecuta `method` del predictor en un worker y espera el resultado.
+
+        Son llamadas de lote (pocas y largas): esperan hueco en la cola en
+        vez de lanzar `PoolSaturatedError`.
+        """
+        call = _Call(method, args, kwargs)
+        self._queue.put(call)
+        return call.future.result()
+
+    def submit(self, home_team: str, away_team: str, features: Dict[str, float]) -> Future:
+        """
+        Encola un partido (features de `prepare_features_for_game`).
+
+        Returns:
+            Future con el resultado en el formato de `predict_game`
+        """
+        future = Future()
+        try:
+            self._queue.put((home_team, away_team, features, future), timeout=self.queue_timeout)
+        except queue.Full:
+            with self._stats_lock:
+                self._stats['rejected'] += 1
+            raise PoolSaturatedError(
+                f"Cola de predicción llena ({self._queue.maxsize} peticiones en espera)"
+            )
+        with self._stats_lock:
+            self._stats['requests'] += 1
+        return future
+
+    def predict_game(
+        self,
+        home_team: str,
+        away_team: str,
+        features: Dict[str, float],
+        timeout: Optional[float] = None
+    ) -> Dict[str, float]:
+        """Igual que `NBAPredictor.predict_game`, pero a través del pool."""
+        return self.submit(home_team, away_team, features).result(timeout)
+
+    def predict_matchup(
+        self,
+        home_team: str,
+        away_team: str,
+        df: pd.DataFrame,
+        data_version: Optional[str] = None,
+        as_of: Optional[str] = None,
+        cache=None
+    ) -> Dict[str, float]:
+        """Igual que `NBAPredictor.predict_matchup`; la inferencia pasa por el pool."""
+        return self._active().predict_matchup(
+            home_team, away_team, df,
+            data_version=data_version, as_of=as_of, cache=cache,
+            predict_game=self.predict_game
+        )
+
+    def predict(self, X: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Igual que `NBAPredictor.predict`, en un worker del pool."""
+        return self._call('predict', X)
+
+    def explain(self, X: pd.DataFrame, **kwargs) -> Dict[str, pd.DataFrame]:
+        """Igual que `NBAPredictor.explain`, en un worker del pool."""
+        return self._call('explain', X, **kwargs)
+
+    def explain_matchups(
+        self,
+        home_teams: List[str],
+        away_teams: List[str],
+        **kwargs
+    ) -> Tuple[pd.DataFrame, Dict[str, pd.DataFrame]]:
+        """Igual que `NBAPredictor.explain_matchups`, en un worker del pool."""
+        return self._call('explain_matchups', home_teams, away_teams, **kwargs)
+
+    def stats(self) -> Dict[str, float]:
+        """Peticiones, lotes, rechazos y tamaño medio de lote."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['queued'] = self._queue.qsize()
+        stats['mean_batch'] = stats['requests'] / stats['batches'] if stats['batches'] else 0.0
+        return stats
+
+    def close(self):
+        """Detiene los workers cuando terminan las peticiones encoladas."""
+        self._queue.put(_STOP)
+        for worker in self._workers:
+            worker.join()
+
+    def __getattr__(self, name):
+        # Solo se llama para atributos que no son del pool
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._active(), name)
@@ -0,0 +1,224 @@
+"""Precios de spreads y over/under a partir de los modelos de margen y total."""
+
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+
+
+DISTRIBUTIONS = ('empirical', 'normal')
+
+# Mercado -> (columna real, columna predicha) en las predicciones del backtest
+MARKETS = {
+    'spread': ('y_margin', 'margin_pred'),
+    'total': ('y_total', 'total_pred'),
+}
+
+
+class ResidualDistribution:
+    """
+    Distribución de los residuos (real - predicho) de un modelo.
+
+    `empirical` usa los residuos fuera de muestra tal cual (colas y
+    asimetrías incluidas); `normal` solo su media y desviación típica.
+    """
+
+    def __init__(self, kind: str = 'empirical'):
+        if kind not in DISTRIBUTIONS:
+            raise ValueError(f"Distribución no soportada: {kind} (usa una de {DISTRIBUTIONS})")
+        self.kind = kind
+        self.residuals = None
+        self.mean = None
+        self.std = None
+
+    def fit(self, residuals: np.ndarray) -> 'ResidualDistribution':
+        residuals = np.asarray(residuals, dtype=np.float64)
+        residuals = residuals[~np.isnan(residuals)]
+        if len(residuals) < 2:
+            raise ValueError("Se necesitan al menos 2 residuos para ajustar la distribución")
+
+        self.residuals = np.sort(residuals)
+        self.mean = float(residuals.mean())
+        self.std = float(residuals.std(ddof=1))
+        return self
+
+    def sf(self, x: np.ndarray) -> np.ndarray:
+        """P(residuo > x), evaluada elemento a elemento sobre un array de cualquier forma."""
+        x = np.asarray(x, dtype=np.float64)
+        if self.kind == 'normal':
+            return ndtr((self.mean - x) / self.std)
+        below = np.searchsorted(self.residuals, x.ravel(), side='right')
+        return (1 - below / len(self.residuals)).reshape(x.shape)
+
+
+class LinePricer:
+    """
+    Probabilidades de cubrir spreads y de over/under para una grilla de líneas.
+
+    El resultado real es entero, así que la predicción más el residuo se
+    redondea: P(resultado >= k) = P(residuo >= k - 0.5 - predicción). Las
+    líneas enteras tienen probabilidad de push; las de medio punto no.
+    Todas las combinaciones partido x línea se evalúan en una sola llamada
+    vectorizada por mercado.
+    """
+
+    def __init__(self, kind: str = 'empirical'):
+        """
+        Args:
+            kind: 'empirical' o 'normal'
+        """
+        self.kind = kind
+        self.distributions = {}
+        self.metadata = {}
+
+    def fit(self, predictions: pd.DataFrame) -> 'LinePricer':
+        """
+        Ajusta las distribuciones de residuos de margen y total.
+
+        Args:
+            predictions: Predicciones fuera de muestra (formato de
+                `scripts/backtest_models.py`: y_margin, margin_pred, y_total, total_pred)
+        """
+        for market, (actual_col, pred_col) in MARKETS.items():
+            residuals = predictions[actual_col].values - predictions[pred_col].values
+            self.distributions[market] = ResidualDistribution(self.kind).fit(residuals)
+            self.metadata[market] = {
+                'n': int(len(self.distributions[market].residuals)),
+                'mean': self.distributions[market].mean,
+                'std': self.distributions[market].std,
+            }
+        return self
+
+    @classmethod
+    def from_backtest(
+        cls,
+        path: str = 'data/processed/backtest_predictions.parquet',
+        kind: str = 'empirical'
+    ) -> 'LinePricer':
+        """Ajusta el pricer con las predicciones guardadas por el backtest."""
+        return cls(kind).fit(pd.read_parquet(path))
+
+    def probabilities(
+        self,
+        market: str,
+        predictions: np.ndarray,
+        lines: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Probabilidades para todas las combinaciones partido x línea.
+
+        Para 'spread' la línea es la del local (ej. -5.5 = local favorito por
+        5.5) y `win` significa que el local cubre. Para 'total', `win`
+        significa over.
+
+        Args:
+            market: 'spread' o 'total'
+            predictions: Predicción del modelo por partido, forma (G,)
+            lines: Líneas comunes (L,) o por partido (G, L)
+
+        Returns:
+            Diccionario con arrays (G, L): win, push, loss
+        """
+        if market not in MARKETS:
+            raise ValueError(f"Mercado no soportado: {market} (usa uno de {list(MARKETS)})")
+
+        predictions = np.asarray(predictions, dtype=np.float64)[:, None]
+        lines = np.atleast_2d(np.asarray(lines, dtype=np.float64))
+
+        # Umbral sobre el resultado entero: local cubre si margen > -línea; over si total > línea
+        target = -lines if market == 'spread' else lines
+        dist = self.distributions[market]
+
+        p_win = dist.sf(np.floor(target) + 0.5 - predictions)
+        is_integer = np.isclose(target, np.round(target))
+        p_push = np.where(
+            is_integer,
+            dist.sf(target - 0.5 - predictions) - dist.sf(target + 0.5 - predictions),
+            0.0
+        )
+        p_push = np.broadcast_to(p_push, p_win.shape)
+        return {'win': p_win, 'push': p_push, 'loss': 1 - p_win - p_push}
+
+    def price(
+        self,
+        slate: pd.DataFrame,
+        spread_lines: Optional[np.ndarray] = None,
+        total_lines: Optional[np.ndarray] = None,
+        id_columns: Optional[list] = None
+    ) -> pd.DataFrame:
+        """
+        Tabla tidy (una fila por partido, mercado y línea) para un slate.
+
+        Args:
+            slate: Partidos con `margin_pred` y `total_pred`
+            spread_lines: Líneas de spread (L,) o (G, L)
+            total_lines: Líneas de total (L,) o (G, L)
+            id_columns: Columnas de `slate` que identifican el partido
+
+        Returns:
+            DataFrame con market, line, prediction, p_win, p_push, p_loss y
+            cuota decimal justa (`fair_odds`, sin margen de la casa)
+        """
+        id_columns = id_columns or [c for c in ('GAME_ID', 'HOME_TEAM_NAME', 'AWAY_TEAM_NAME') if c in slate]
+        market_lines = {'spread': spread_lines, 'total': total_lines}
+
+        tables = []
+        for market, lines in market_lines.items():
+            if lines is None:
+                continue
+            pred_col = MARKETS[market][1]
+            n_games = len(slate)
+            grid = np.broadcast_to(np.atleast_2d(np.asarray(lines, dtype=np.float64)),
+                                   (n_games, np.shape(lines)[-1]))
+            probs = self.probabilities(market, slate[pred_col].values, grid)
+
+            n_lines = grid.shape[1]
+            table = slate[id_columns].iloc[np.repeat(np.arange(n_games), n_lines)].reset_index(drop=True)
+            table['market'] = market
+            table['line'] = grid.ravel()
+            table['prediction'] = np.repeat(slate[pred_col].values, n_lines)
+            table['p_win'] = probs['win'].ravel()
+            table['p_push'] = probs['push'].ravel()
+            table['p_loss'] = probs['loss'].ravel()
+            tables.append(table)
+
+        result = pd.concat(tables, ignore_index=True)
+        # Cuota justa con push devuelto: p_win * cuota + p_push = 1
+        with np.errstate(divide='ignore'):
+            result['fair_odds'] = (1 - result['p_push']) / result['p_win']
+        return result
+
+    def save(self, filepath: str):
+        """Guarda las distribuciones ajustadas."""
+        Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump({'kind': self.kind, 'distributions': self.distributions, 'metadata': self.metadata}, filepath)
+        print(f"💾 Pricer guardado en: {filepath}")
+
+    @classmethod
+    def load(cls, filepath: str) -> 'LinePricer':
+        """Carga un pricer guardado con `save`."""
+        data = joblib.load(filepath)
+        pricer = cls(data['kind'])
+        pricer.distributions = data['distributions']
+        pricer.metadata = data.get('metadata', {})
+        return pricer
+
+
+def line_ladder(center: Union[np.ndarray, float], n_lines: int = 50, step: float = 0.5) -> np.ndarray:
+    """
+    Escalera de líneas alrededor de una línea central por partido.
+
+    Args:
+        center: Línea central por partido (G,) (se redondea al medio punto)
+        n_lines: Líneas por partido
+        step: Separación entre líneas
+
+    Returns:
+        Array (G, n_lines)
+    """
+    center = np.round(np.atleast_1d(np.asarray(center, dtype=np.float64)) * 2) / 2
+    offsets = (np.arange(n_lines) - n_lines // 2) * step
+    return center[:, None] + offsets[None, :]
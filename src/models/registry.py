@@ -0,0 +1,353 @@
+"""Registro local de modelos con versiones inmutables y cambio en caliente."""
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from src.models.nba_predictor import NBAPredictor
+
+
+BUNDLE_NAME = 'model.joblib'
+MANIFEST_NAME = 'manifest.json'
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: Path, content: str):
+    """Escribe a un temporal en el mismo directorio y lo renombra con os.replace."""
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    with open(tmp_path, 'w') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class ModelRegistry:
+    """
+    Directorio de bundles versionados con un puntero CURRENT atómico.
+
+    Estructura:
+        <root>/versions/<versión>/model.joblib   (solo lectura)
+        <root>/versions/<versión>/manifest.json
+        <root>/CURRENT                           (versión activa)
+        <root>/history.jsonl                     (activaciones y rollbacks)
+
+    Una versión se prepara en un directorio temporal y se publica con un
+    rename, así que nadie ve nunca un bundle a medio escribir. CURRENT se
+    reemplaza con os.replace; los consumidores solo necesitan hacer stat.
+    """
+
+    def __init__(self, root: str = 'models/registry'):
+        self.root = Path(root)
+        self.versions_dir = self.root / 'versions'
+        self.current_file = self.root / 'CURRENT'
+        self.history_file = self.root / 'history.jsonl'
+
+    def publish(
+        self,
+        bundle_path: str,
+        note: Optional[str] = None,
+        activate: bool = True
+    ) -> str:
+        """
+        Copia un bundle al registro como versión inmutable.
+
+        Args:
+            bundle_path: Bundle .joblib de NBAPredictor
+            note: Descripción libre (se guarda en el manifest)
+            activate: Activar la versión al publicarla
+
+        Returns:
+            Identificador de la versión
+        """
+        bundle_path = Path(bundle_path)
+        if not bundle_path.exists():
+            raise FileNotFoundError(f"Bundle no encontrado: {bundle_path}")
+
+        checksum = _sha256(bundle_path)
+        version = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{checksum[:8]}"
+        target = self.versions_dir / version
+        if target.exists():
+            raise ValueError(f"La versión ya existe: {version}")
+
+        # Validar que el bundle carga antes de publicarlo
+        metadata = NBAPredictor.load_model(str(bundle_path)).metadata
+
+        self.versions_dir.mkdir(parents=True, exist_ok=True)
+        staging = self.root / f".staging-{uuid.uuid4().hex}"
+        staging.mkdir(parents=True)
+        try:
+            shutil.copy2(bundle_path, staging / BUNDLE_NAME)
+            manifest = {
+                'version': version,
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'source': str(bundle_path),
+                'sha256': checksum,
+                'size': (staging / BUNDLE_NAME).stat().st_size,
+                'note': note,
+                'trained_until': metadata.get('trained_until'),
+                'metrics': metadata.get('metrics'),
+            }
+            (staging / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, default=str))
+            for name in (BUNDLE_NAME, MANIFEST_NAME):
+                os.chmod(staging / name, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            os.replace(staging, target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        print(f"📦 Versión publicada: {version}")
+        if activate:
+            self.activate(version)
+        return version
+
+    def _set_current(self, version: str, action: str):
+        if not (self.versions_dir / version / BUNDLE_NAME).exists():
+            raise ValueError(f"Versión desconocida: {version}")
+
+        entry = {'version': version, 'action': action,
+                 'timestamp': datetime.now().isoformat(timespec='seconds')}
+        _write_atomic(self.current_file, json.dumps(entry))
+        with open(self.history_file, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+
+    def activate(self, version: str):
+        """Apunta CURRENT a una versión publicada."""
+        self._set_current(version, 'activate')
+        print(f"✅ Versión activa: {version}")
+
+    def _active_stack(self) -> List[str]:
+        """Pila de versiones activadas (cada rollback desapila una)."""
+        stack = []
+        if self.history_file.exists():
+            with open(self.history_file) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if entry['action'] == 'rollback':
+                        stack.pop()
+                    else:
+                        stack.append(entry['version'])
+        return stack
+
+    def rollback(self) -> str:
+        """
+        Vuelve a la versión activa anterior.
+
+        Rollbacks sucesivos retroceden más en el historial.
+
+        Returns:
+            Versión que queda activa
+        """
+        stack = self._active_stack()
+        if len(stack) < 2:
+            raise ValueError("No hay una versión anterior a la que volver")
+
+        version = stack[-2]
+        self._set_current(version, 'rollback')
+        print(f"↩️  Rollback a: {version}")
+        return version
+
+    def current(self) -> Optional[str]:
+        """Versión activa, o None si el registro está vacío."""
+        try:
+            return json.loads(self.current_file.read_text())['version']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def bundle_path(self, version: Optional[str] = None) -> Path:
+        """Ruta al bundle de una versión (default: la activa)."""
+        version = version or self.current()
+        if version is None:
+            raise ValueError(f"El registro {self.root} no tiene versión activa")
+        return self.versions_dir / version / BUNDLE_NAME
+
+    def versions(self) -> List[Dict]:
+        """Manifests de todas las versiones, de la más antigua a la más reciente."""
+        if not self.versions_dir.exists():
+            return []
+        manifests = []
+        for manifest_path in sorted(self.versions_dir.glob(f'*/{MANIFEST_NAME}')):
+            manifests.append(json.loads(manifest_path.read_text()))
+        return manifests
+
+    def load(self, version: Optional[str] = None) -> NBAPredictor:
+        """Carga el predictor de una versión (default: la activa)."""
+        return NBAPredictor.load_model(str(self.bundle_path(version)))
+
+
+class HotSwapPredictor:
+    """
+    Predictor que sigue la versión activa del registro sin reiniciar.
+
+    Cada acceso hace como mucho un `stat` de CURRENT cada `poll_interval`
+    segundos. Si la versión cambió, el nuevo bundle se carga fuera del lock
+    y la referencia se cambia bajo el lock: las predicciones en curso
+    terminan con el modelo anterior y las siguientes usan el nuevo. Si el
+    bundle nuevo no se puede cargar se sigue sirviendo el actual y la carga
+    se reintenta tras `retry_backoff` segundos (o al cambiar CURRENT). El
+    límite de `set_nthread` se aplica también a cada versión que se cargue.
+    Los demás atributos y métodos se delegan en el NBAPredictor activo.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        poll_interval: float = 5.0,
+        loader: Callable[[str], NBAPredictor] = NBAPredictor.load_model,
+        retry_backoff: float = 60.0
+    ):
+        self._registry = registry
+        self._poll_interval = poll_interval
+        self._loader = loader
+        self._retry_backoff = retry_backoff
+        # Última versión que no se pudo cargar: (versión, instante del próximo reintento)
+        self._failed = None
+        self._nthread = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._predictor = None
+        self._version = None
+        self._signature = None
+        self._next_poll = 0.0
+        self._watcher = None
+        self._stop = threading.Event()
+        self.refresh(force=True)
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._version
+
+    @property
+    def predictor(self) -> NBAPredictor:
+        self.refresh()
+        return self._predictor
+
+    def _current_signature(self):
+        try:
+            st = os.stat(self._registry.current_file)
+        except OSError:
+            return None
+        # os.replace crea un inodo nuevo aunque el mtime coincida
+        return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Comprueba CURRENT y cambia de modelo si hay una versión nueva.
+
+        Returns:
+            True si se cambió de versión
+        """
+        now = time.monotonic()
+        if not force and now < self._next_poll:
+            return False
+
+        # Un solo hilo comprueba/carga; el resto sigue con el modelo actual
+        if not self._refresh_lock.acquire(blocking=force):
+            return False
+        try:
+            self._next_poll = now + self._poll_interval
+            return self._swap_if_changed(force)
+        finally:
+            self._refresh_lock.release()
+
+    def _swap_if_changed(self, force: bool) -> bool:
+        signature = self._current_signature()
+        retry = self._failed is not None and time.monotonic() >= self._failed[1]
+        if not force and signature == self._signature and not retry:
+            return False
+
+        version = self._registry.current()
+        if version is None or (version == self._version and not force):
+            self._signature = signature
+            self._failed = None
+            return False
+
+        # Carga fuera del lock: quien ya tiene el predictor sigue sirviendo
+        try:
+            predictor = self._loader(str(self._registry.bundle_path(version)))
+        except Exception as e:
+            # Sin modelo previo no hay con qué seguir: el error se propaga
+            if self._predictor is None:
+                raise
+            # Bundle roto o a medio copiar: se sigue con el actual y no se
+            # reintenta en cada sondeo, solo tras `retry_backoff` o si CURRENT cambia
+            self._signature = signature
+            self._failed = (version, time.monotonic() + self._retry_backoff)
+            print(f"⚠️  No se pudo cargar la versión {version} ({e}); se sigue con {self._version} "
+                  f"(reintento en {self._retry_backoff:.0f}s)")
+            return False
+
+        if self._nthread is not None:
+            predictor.set_nthread(self._nthread)
+
+        with self._lock:
+            previous = self._version
+            self._predictor, self._version, self._signature = predictor, version, signature
+            self._failed = None
+
+        if previous is not None:
+            print(f"🔄 Modelo actualizado: {previous} → {version}")
+        return True
+
+    def set_nthread(self, nthread: int):
+        """Limita los hilos del modelo activo y de los que se carguen después."""
+        with self._lock:
+            self._nthread = nthread
+            predictor = self._predictor
+        predictor.set_nthread(nthread)
+
+    def start_watcher(self):
+        """Hilo en segundo plano que sondea el registro (para procesos sin tráfico constante)."""
+        if self._watcher is not None:
+            return
+
+        def watch():
+            while not self._stop.wait(self._poll_interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"⚠️  Error recargando el modelo: {e}")
+
+        self._watcher = threading.Thread(target=watch, name='model-registry-watcher', daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop.set()
+
+    def __getattr__(self, name):
+        # Solo se llama para atributos que no son del wrapper
+        return getattr(self.predictor, name)
+
+
+def load_serving_predictor(
+    registry_root: str = 'models/registry',
+    fallback_path: str = 'models/nba_predictor.joblib',
+    poll_interval: float = 5.0
+):
+    """
+    Predictor para procesos de larga duración.
+
+    Si el registro tiene una versión activa devuelve un `HotSwapPredictor`;
+    si no, carga el bundle clásico de `fallback_path` (sin cambio en caliente).
+    """
+    registry = ModelRegistry(registry_root)
+    if registry.current() is not None:
+        return HotSwapPredictor(registry, poll_interval=poll_interval)
+    return NBAPredictor.load_model(fallback_path)
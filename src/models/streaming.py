@@ -0,0 +1,248 @@
+"""Entrenamiento out-of-core de los modelos NBA sobre Parquet particionado."""
+
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import xgboost as xgb
+
+from src.models.nba_predictor import (
+    NBAPredictor,
+    BASE_FEATURES,
+    add_interaction_features,
+    compute_metrics,
+)
+
+
+TARGET_COLUMNS = ['HOME_WL', 'POINT_DIFF', 'TOTAL_PTS']
+
+
+class ParquetFeatureIter(xgb.DataIter):
+    """
+    Iterador de XGBoost que recorre un dataset Parquet por lotes.
+
+    Solo proyecta las columnas de features y targets, calcula las features de
+    interacción lote a lote, se queda con el subconjunto `features` (si lo
+    hay) y descarta las filas con NaN, igual que
+    `NBAPredictor.prepare_features`. Los targets de margen y total (un float
+    por partido) se acumulan en la primera pasada para poder cambiar la
+    etiqueta de la matriz sin volver a leer el Parquet.
+    """
+
+    def __init__(
+        self,
+        dataset: ds.Dataset,
+        base_features: List[str],
+        row_filter: Optional[ds.Expression] = None,
+        batch_size: int = 65536,
+        cache_prefix: Optional[str] = None,
+        features: Optional[List[str]] = None
+    ):
+        self._dataset = dataset
+        self._base_features = base_features
+        self._features = features
+        self._filter = row_filter
+        self._batch_size = batch_size
+        self._batches = None
+        self._first_pass_done = False
+
+        self.feature_columns = None
+        self.targets = {'margin': [], 'total': []}
+        self.n_rows = 0
+        self._sum = None
+        self._sum_sq = None
+
+        super().__init__(cache_prefix=cache_prefix)
+
+    def reset(self):
+        """Reinicia la lectura (XGBoost recorre los datos varias veces)."""
+        self._batches = None
+
+    def _next_frame(self) -> Optional[Tuple[pd.DataFrame, pd.DataFrame]]:
+        """Siguiente lote no vacío como (X, targets), o None al final."""
+        if self._batches is None:
+            self._batches = self._dataset.to_batches(
+                columns=self._base_features + TARGET_COLUMNS,
+                filter=self._filter,
+                batch_size=self._batch_size
+            )
+
+        for batch in self._batches:
+            frame = batch.to_pandas()
+            X = add_interaction_features(frame[self._base_features].copy())
+            if self._features is not None:
+                X = X[[col for col in X.columns if col in self._features]]
+            valid = ~X.isna().any(axis=1)
+            if valid.any():
+                return X[valid], frame.loc[valid, TARGET_COLUMNS]
+        return None
+
+    def next(self, input_data) -> int:
+        """Entrega un lote a XGBoost; devuelve 0 cuando no quedan lotes."""
+        item = self._next_frame()
+        if item is None:
+            self._first_pass_done = True
+            return 0
+
+        X, targets = item
+        values = X.values.astype(np.float32)
+        self.feature_columns = X.columns.tolist()
+
+        # Targets y estadísticas de features: solo en la primera pasada
+        if not self._first_pass_done:
+            self.targets['margin'].append(targets['POINT_DIFF'].values.astype(np.float32))
+            self.targets['total'].append(targets['TOTAL_PTS'].values.astype(np.float32))
+            self.n_rows += len(values)
+            batch_sum = values.sum(axis=0, dtype=np.float64)
+            batch_sum_sq = np.square(values, dtype=np.float64).sum(axis=0)
+            self._sum = batch_sum if self._sum is None else self._sum + batch_sum
+            self._sum_sq = batch_sum_sq if self._sum_sq is None else self._sum_sq + batch_sum_sq
+
+        input_data(
+            data=values,
+            label=targets['HOME_WL'].values.astype(np.float32),
+            feature_names=self.feature_columns
+        )
+        return 1
+
+    def feature_stats(self) -> Dict[str, List[float]]:
+        """Media y desviación típica de las features vistas en la primera pasada."""
+        mean = self._sum / self.n_rows
+        std = np.sqrt(np.maximum(self._sum_sq / self.n_rows - np.square(mean), 0.0))
+        return {'mean': mean.tolist(), 'std': std.tolist()}
+
+    def iter_frames(self):
+        """Recorre los lotes una vez fuera de XGBoost (para evaluación)."""
+        self._batches = None
+        while True:
+            item = self._next_frame()
+            if item is None:
+                return
+            yield item
+
+
+def _date_filter(dataset: ds.Dataset, cutoff: pd.Timestamp) -> Tuple[ds.Expression, ds.Expression]:
+    """Filtros (train, test) por fecha con el tipo de la columna GAME_DATE."""
+    date_type = dataset.schema.field('GAME_DATE').type
+    cutoff_scalar = pa.scalar(cutoff.to_pydatetime(), type=date_type)
+    return ds.field('GAME_DATE') < cutoff_scalar, ds.field('GAME_DATE') >= cutoff_scalar
+
+
+def train_streaming(
+    path: str,
+    predictor: Optional[NBAPredictor] = None,
+    test_size: float = 0.2,
+    batch_size: int = 65536,
+    external_memory: bool = False,
+    cache_dir: Optional[str] = None,
+    random_state: int = 42,
+    n_jobs: Optional[int] = None
+) -> Tuple[NBAPredictor, Dict[str, float]]:
+    """
+    Entrena los tres modelos leyendo el Parquet por lotes.
+
+    El split temporal se hace por fecha: solo se lee la columna GAME_DATE
+    para calcular el corte, y el resto de columnas se proyecta lote a lote.
+    Con `external_memory=True` la matriz de entrenamiento se pagina a disco
+    (DMatrix en memoria externa) y el pico de RSS queda acotado por el
+    tamaño de lote; si no, se construye un QuantileDMatrix, que guarda las
+    features ya cuantizadas (~1 byte por valor) en lugar de float64.
+
+    Si `predictor.features` está definido se usa ese subconjunto, como en
+    `NBAPredictor.train`.
+
+    Args:
+        path: Archivo Parquet o directorio con un dataset particionado
+        predictor: Predictor a entrenar (default: uno nuevo)
+        test_size: Proporción (por fecha) de partidos para test
+        batch_size: Filas por lote de lectura
+        external_memory: Usar DMatrix en memoria externa
+        cache_dir: Directorio de caché para memoria externa (default: uno
+            temporal que se borra al terminar)
+        random_state: Semilla aleatoria
+        n_jobs: Hilos de XGBoost (None = todos los núcleos)
+
+    Returns:
+        (predictor, métricas de test)
+    """
+    predictor = predictor or NBAPredictor()
+    dataset = ds.dataset(path, format='parquet')
+
+    available = [col for col in BASE_FEATURES if col in dataset.schema.names]
+    if len(available) < len(BASE_FEATURES):
+        print(f"⚠️  Features faltantes: {set(BASE_FEATURES) - set(available)}")
+
+    # Corte temporal leyendo solo las fechas
+    dates = dataset.to_table(columns=['GAME_DATE']).column('GAME_DATE').to_pandas()
+    cutoff = dates.sort_values().iloc[int(len(dates) * (1 - test_size))]
+    train_filter, test_filter = _date_filter(dataset, cutoff)
+    print(f"📅 Corte temporal: entrenamiento < {cutoff.date()} <= test")
+
+    cache_prefix = None
+    temporary_cache = None
+    if external_memory:
+        if cache_dir is None:
+            cache_dir = temporary_cache = tempfile.mkdtemp(prefix='nba_xgb_cache_')
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_prefix = os.path.join(cache_dir, 'train')
+
+    train_iter = ParquetFeatureIter(dataset, available, train_filter, batch_size, cache_prefix,
+                                    features=predictor.features)
+
+    print("🏋️  Entrenando modelos (out-of-core)...")
+    try:
+        if external_memory:
+            dtrain = xgb.DMatrix(train_iter, nthread=n_jobs or -1)
+        else:
+            dtrain = xgb.QuantileDMatrix(train_iter, nthread=n_jobs or -1)
+
+        predictor.feature_columns = train_iter.feature_columns
+        predictor.metadata['feature_stats'] = train_iter.feature_stats()
+        predictor.fit_matrix(
+            dtrain,
+            np.concatenate(train_iter.targets['margin']),
+            np.concatenate(train_iter.targets['total']),
+            random_state=random_state,
+            n_jobs=n_jobs
+        )
+        print(f"  ✓ {train_iter.n_rows} partidos de entrenamiento")
+        del dtrain
+    finally:
+        # La caché de páginas solo sirve para este entrenamiento
+        if temporary_cache is not None:
+            shutil.rmtree(temporary_cache, ignore_errors=True)
+
+    # Evaluación por lotes: solo se acumulan predicciones y targets
+    test_iter = ParquetFeatureIter(dataset, available, test_filter, batch_size, features=predictor.features)
+    collected = {key: [] for key in ('y_win', 'win', 'y_margin', 'margin', 'y_total', 'total')}
+    for X, targets in test_iter.iter_frames():
+        win_proba, margin_pred, total_pred = predictor._predict_arrays(X)
+        collected['y_win'].append(targets['HOME_WL'].values.astype(int))
+        collected['win'].append(win_proba)
+        collected['y_margin'].append(targets['POINT_DIFF'].values)
+        collected['margin'].append(margin_pred)
+        collected['y_total'].append(targets['TOTAL_PTS'].values)
+        collected['total'].append(total_pred)
+
+    collected = {key: np.concatenate(values) for key, values in collected.items()}
+    metrics = compute_metrics(
+        collected['y_win'], collected['win'],
+        collected['y_margin'], collected['margin'],
+        collected['y_total'], collected['total']
+    )
+
+    predictor.metadata['metrics'] = {k: float(v) for k, v in metrics.items()}
+    predictor.metadata['trained_until'] = str((cutoff - pd.Timedelta(days=1)).date())
+
+    print(f"\n📊 Test ({len(collected['y_win'])} partidos):")
+    print(f"  - Accuracy: {metrics['win_accuracy']:.3f}")
+    print(f"  - Log Loss: {metrics['win_log_loss']:.3f}")
+    print(f"  - MAE margen: {metrics['margin_mae']:.2f} puntos")
+    print(f"  - MAE total: {metrics['total_mae']:.2f} puntos")
+
+    return predictor, metrics
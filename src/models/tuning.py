@@ -0,0 +1,344 @@
+"""Búsqueda de hiperparámetros en paralelo para los modelos XGBoost NBA."""
+
+import hashlib
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import xgboost as xgb
+from sklearn.model_selection import TimeSeriesSplit
+
+
+STRATEGIES = ('random', 'halving')
+
+# Objetivo y métrica de validación de cada modelo (menor es mejor)
+TARGETS = {
+    'win': {'objective': 'binary:logistic', 'eval_metric': 'logloss'},
+    'margin': {'objective': 'reg:squarederror', 'eval_metric': 'mae'},
+    'total': {'objective': 'reg:squarederror', 'eval_metric': 'mae'},
+}
+
+# Espacio de búsqueda: (tipo, mínimo, máximo)
+SEARCH_SPACE = {
+    'max_depth': ('int', 3, 8),
+    'learning_rate': ('log', 0.01, 0.3),
+    'subsample': ('float', 0.6, 1.0),
+    'colsample_bytree': ('float', 0.5, 1.0),
+    'min_child_weight': ('log', 1.0, 20.0),
+    'reg_lambda': ('log', 0.1, 10.0),
+    'gamma': ('float', 0.0, 5.0),
+}
+
+# Datos compartidos por cada proceso del pool (se cargan una vez en el initializer)
+_WORKER_DATA = {}
+
+
+def sample_params(rng: np.random.Generator) -> Dict[str, float]:
+    """Muestrea una configuración del espacio de búsqueda."""
+    params = {}
+    for name, (kind, low, high) in SEARCH_SPACE.items():
+        if kind == 'int':
+            params[name] = int(rng.integers(low, high + 1))
+        elif kind == 'log':
+            params[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+        else:
+            params[name] = float(rng.uniform(low, high))
+    return params
+
+
+def _init_worker(X, targets: Dict[str, np.ndarray], n_folds: int):
+    """
+    Carga la matriz de features y los folds temporales en el proceso.
+
+    `X` puede ser la ruta de un .npy (matriz cacheada): se abre con mmap en
+    vez de copiarla a cada worker.
+    """
+    if isinstance(X, str):
+        X = np.load(X, mmap_mode='r')
+    _WORKER_DATA['X'] = X
+    _WORKER_DATA['targets'] = targets
+    _WORKER_DATA['folds'] = list(TimeSeriesSplit(n_splits=n_folds).split(X))
+
+
+def _evaluate_trial(task: Dict) -> Dict:
+    """
+    Evalúa una configuración con CV temporal y early stopping.
+
+    Returns:
+        La tarea con score medio, mejor iteración media y duración
+    """
+    X = _WORKER_DATA['X']
+    y = _WORKER_DATA['targets'][task['target']]
+    spec = TARGETS[task['target']]
+
+    params = {
+        **task['params'],
+        'objective': spec['objective'],
+        'eval_metric': spec['eval_metric'],
+        'tree_method': 'hist',
+        'nthread': task['nthread'],
+        'seed': task['seed'],
+        'verbosity': 0,
+    }
+
+    start = time.perf_counter()
+    scores, iterations = [], []
+    for train_idx, valid_idx in _WORKER_DATA['folds']:
+        dtrain = xgb.DMatrix(X[train_idx], label=y[train_idx], nthread=task['nthread'])
+        dvalid = xgb.DMatrix(X[valid_idx], label=y[valid_idx], nthread=task['nthread'])
+        booster = xgb.train(
+            params,
+            dtrain,
+            num_boost_round=task['budget'],
+            evals=[(dvalid, 'valid')],
+            early_stopping_rounds=task['early_stopping_rounds'],
+            verbose_eval=False
+        )
+        scores.append(booster.best_score)
+        iterations.append(booster.best_iteration + 1)
+
+    return {
+        **task,
+        'score': float(np.mean(scores)),
+        'best_iteration': int(np.mean(iterations)),
+        'seconds': time.perf_counter() - start,
+    }
+
+
+class HyperparameterSearch:
+    """
+    Búsqueda aleatoria o successive halving para los modelos win/margin/total.
+
+    Los trials se reparten en un pool de procesos y cada uno limita los hilos
+    de XGBoost para no sobresuscribir la CPU. Cada resultado se añade a un log
+    JSONL, de modo que una búsqueda interrumpida se reanuda saltando los
+    trials ya evaluados.
+    """
+
+    def __init__(
+        self,
+        strategy: str = 'random',
+        n_trials: int = 30,
+        n_folds: int = 4,
+        max_rounds: int = 600,
+        min_rounds: int = 50,
+        eta: int = 3,
+        early_stopping_rounds: int = 30,
+        n_workers: Optional[int] = None,
+        log_path: str = 'models/search/search_log.jsonl',
+        seed: int = 42,
+        data_version: Optional[str] = None
+    ):
+        """
+        Args:
+            strategy: 'random' o 'halving'
+            n_trials: Configuraciones muestreadas por modelo
+            n_folds: Folds de CV temporal (ventana expansiva)
+            max_rounds: Máximo de árboles por trial
+            min_rounds: Presupuesto del primer escalón de successive halving
+            eta: Factor de reducción de successive halving
+            early_stopping_rounds: Rondas sin mejora antes de parar
+            n_workers: Procesos del pool (None = todos los núcleos)
+            log_path: Log JSONL de resultados para reanudar
+            seed: Semilla del muestreo
+            data_version: Huella de los datos/features (p. ej. `MatrixCache.key`);
+                solo se reanudan trials evaluados con los mismos datos
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Estrategia no soportada: {strategy} (usa una de {STRATEGIES})")
+
+        self.strategy = strategy
+        self.n_trials = n_trials
+        self.n_folds = n_folds
+        self.max_rounds = max_rounds
+        self.min_rounds = min_rounds
+        self.eta = eta
+        self.early_stopping_rounds = early_stopping_rounds
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.log_path = Path(log_path)
+        self.seed = seed
+        # Todo lo que cambia el score de un trial: si difiere, el log no se reutiliza
+        self.setup = {
+            'data_version': data_version,
+            'n_folds': n_folds,
+            'early_stopping_rounds': early_stopping_rounds,
+            'max_rounds': max_rounds,
+            'min_rounds': min_rounds,
+            'eta': eta,
+        }
+        self.setup_id = hashlib.sha1(json.dumps(self.setup, sort_keys=True).encode()).hexdigest()[:12]
+
+    def _trial_key(self, target: str, config_id: int, budget: int) -> Tuple:
+        return (self.setup_id, self.strategy, self.seed, target, config_id, budget)
+
+    def _load_log(self) -> Dict[Tuple, Dict]:
+        """Lee los trials ya evaluados del log (solo los de la misma configuración de CV y datos)."""
+        done = {}
+        if not self.log_path.exists():
+            return done
+
+        stale = 0
+        with open(self.log_path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                # Entradas sin `setup_id` son de versiones anteriores: no se sabe con qué datos se midieron
+                if entry.get('setup_id') != self.setup_id:
+                    stale += 1
+                    continue
+                key = (entry['setup_id'], entry['strategy'], entry['seed'],
+                       entry['target'], entry['config_id'], entry['budget'])
+                done[key] = entry
+        if stale:
+            print(f"  ⚠️  {stale} trials del log con otros datos o CV: se ignoran")
+        return done
+
+    def _append_log(self, entry: Dict):
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+
+    def _budgets(self) -> List[int]:
+        """Presupuestos (árboles) de cada escalón."""
+        if self.strategy == 'random':
+            return [self.max_rounds]
+
+        budgets = []
+        budget = self.min_rounds
+        while budget < self.max_rounds:
+            budgets.append(int(budget))
+            budget *= self.eta
+        budgets.append(self.max_rounds)
+        return budgets
+
+    def _run_rung(self, executor, tasks: List[Dict], done: Dict[Tuple, Dict]) -> List[Dict]:
+        """Evalúa un escalón de trials, reutilizando los que ya están en el log."""
+        results, pending = [], []
+        for task in tasks:
+            key = self._trial_key(task['target'], task['config_id'], task['budget'])
+            if key in done:
+                results.append(done[key])
+            else:
+                pending.append(task)
+
+        if results:
+            print(f"  ↩️  {len(results)} trials recuperados del log")
+
+        futures = [executor.submit(_evaluate_trial, task) for task in pending]
+        for future in as_completed(futures):
+            result = future.result()
+            entry = {
+                'setup_id': self.setup_id,
+                'setup': self.setup,
+                'strategy': self.strategy,
+                'seed': self.seed,
+                'target': result['target'],
+                'config_id': result['config_id'],
+                'budget': result['budget'],
+                'params': result['params'],
+                'score': result['score'],
+                'best_iteration': result['best_iteration'],
+                'seconds': round(result['seconds'], 3),
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+            }
+            self._append_log(entry)
+            done[self._trial_key(entry['target'], entry['config_id'], entry['budget'])] = entry
+            results.append(entry)
+            print(f"  - {entry['target']} #{entry['config_id']} ({entry['budget']} árboles): "
+                  f"{entry['score']:.4f} en {entry['seconds']:.1f}s")
+
+        return results
+
+    def run(
+        self,
+        X: np.ndarray,
+        targets: Dict[str, np.ndarray],
+        models: Optional[List[str]] = None
+    ) -> Dict[str, Dict]:
+        """
+        Ejecuta la búsqueda para cada modelo.
+
+        Args:
+            X: Matriz de features en orden cronológico (array o memmap de
+                `TrainingMatrix`)
+            targets: Targets por modelo ('win', 'margin', 'total')
+            models: Modelos a optimizar (default: los tres)
+
+        Returns:
+            Mejor configuración por modelo, lista para `NBAPredictor(params=...)`
+        """
+        models = models or list(TARGETS)
+        done = self._load_log()
+        budgets = self._budgets()
+        nthread = max(1, (os.cpu_count() or 1) // self.n_workers)
+        # Matriz mapeada desde disco (float32): los workers la abren por ruta
+        # (un corte de un memmap conserva `filename`: se comprueba que sea el archivo entero)
+        if (isinstance(X, np.memmap) and X.dtype == np.float32 and X.filename
+                and np.load(X.filename, mmap_mode='r').shape == X.shape):
+            shared_X = str(X.filename)
+        else:
+            shared_X = np.ascontiguousarray(X, dtype=np.float32)
+
+        print(f"🔎 Búsqueda {self.strategy}: {self.n_trials} configuraciones por modelo, "
+              f"{self.n_folds} folds, {self.n_workers} procesos x {nthread} hilos")
+
+        best = {}
+        with ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            initializer=_init_worker,
+            initargs=(shared_X,
+                      {name: np.asarray(targets[name], dtype=np.float32) for name in models},
+                      self.n_folds)
+        ) as executor:
+            for target in models:
+                print(f"\n🎯 Modelo: {target}")
+                # Semilla por modelo: las configuraciones son reproducibles al reanudar
+                rng = np.random.default_rng([self.seed, list(TARGETS).index(target)])
+                configs = {config_id: sample_params(rng) for config_id in range(self.n_trials)}
+
+                survivors = list(configs)
+                for rung, budget in enumerate(budgets):
+                    tasks = [{
+                        'target': target,
+                        'config_id': config_id,
+                        'budget': budget,
+                        'params': configs[config_id],
+                        'early_stopping_rounds': self.early_stopping_rounds,
+                        'nthread': nthread,
+                        'seed': self.seed,
+                    } for config_id in survivors]
+
+                    results = sorted(self._run_rung(executor, tasks, done), key=lambda r: r['score'])
+
+                    if rung < len(budgets) - 1:
+                        keep = max(1, math.ceil(len(results) / self.eta))
+                        survivors = [r['config_id'] for r in results[:keep]]
+                        print(f"  ✂️  Escalón {rung + 1}: pasan {keep} de {len(results)}")
+
+                winner = results[0]
+                best[target] = {
+                    **winner['params'],
+                    'n_estimators': winner['best_iteration'],
+                    'score': winner['score'],
+                    'eval_metric': TARGETS[target]['eval_metric'],
+                    'config_id': winner['config_id'],
+                }
+                print(f"  🏆 Mejor {target}: {TARGETS[target]['eval_metric']}={winner['score']:.4f} "
+                      f"con {winner['best_iteration']} árboles")
+
+        return best
+
+    @staticmethod
+    def to_params(best: Dict[str, Dict]) -> Dict[str, Dict]:
+        """Quita los campos de reporte para pasar la configuración a NBAPredictor."""
+        return {
+            target: {k: v for k, v in config.items() if k not in ('score', 'eval_metric', 'config_id')}
+            for target, config in best.items()
+        }
@@ -20,6 +20,7 @@ from dotenv import load_dotenv
 # Importar loaders
 from src.data.football_data_loader import FootballDataLoader
 from src.data.tennis_data_loader import TennisDataLoader
+from src.models.registry import load_serving_predictor
 
 load_dotenv()
 
@@ -206,11 +207,17 @@ class LivePredictor:
     cada vez que los datos cambian
     """
     
-    def __init__(self):
+    def __init__(self, registry_root: str = 'models/registry'):
         # TODO: Cargar modelos pre-entrenados
         self.football_model = None
         self.tennis_model = None
-        self.nba_model = None
+        
+        # NBA: sigue la versión activa del registro (cambio en caliente)
+        try:
+            self.nba_model = load_serving_predictor(registry_root)
+        except Exception as e:
+            print(f"⚠️  Modelo NBA no disponible: {e}")
+            self.nba_model = None
     
     def predict_football_live(self, match_data: Dict) -> Dict:
         """
@@ -0,0 +1 @@
+"""Módulo de simulación Monte Carlo de temporada y playoffs."""
@@ -0,0 +1,345 @@
+"""Simulador Monte Carlo vectorizado de temporada regular, play-in y playoffs."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+NBA_CONFERENCES = {
+    'East': [
+        'Atlanta Hawks', 'Boston Celtics', 'Brooklyn Nets', 'Charlotte Hornets',
+        'Chicago Bulls', 'Cleveland Cavaliers', 'Detroit Pistons', 'Indiana Pacers',
+        'Miami Heat', 'Milwaukee Bucks', 'New York Knicks', 'Orlando Magic',
+        'Philadelphia 76ers', 'Toronto Raptors', 'Washington Wizards',
+    ],
+    'West': [
+        'Dallas Mavericks', 'Denver Nuggets', 'Golden State Warriors', 'Houston Rockets',
+        'LA Clippers', 'Los Angeles Lakers', 'Memphis Grizzlies', 'Minnesota Timberwolves',
+        'New Orleans Pelicans', 'Oklahoma City Thunder', 'Phoenix Suns',
+        'Portland Trail Blazers', 'Sacramento Kings', 'San Antonio Spurs', 'Utah Jazz',
+    ],
+}
+
+# Puntos de ELO -> logit (misma escala que la fórmula de ELO del feature engineering)
+ELO_SCALE = np.log(10) / 400
+
+# Local en los partidos 1, 2, 5 y 7 de una serie al mejor de 7 (2-2-1-1-1)
+SERIES_HOME_PATTERN = np.array([1, 1, 0, 0, 1, 0, 1], dtype=bool)
+
+# Cruces de primera ronda por posición (0 = 1º de conferencia)
+FIRST_ROUND = [(0, 7), (3, 4), (2, 5), (1, 6)]
+
+ROUNDS = ['p_conf_semis', 'p_conf_finals', 'p_finals', 'p_champion']
+
+
+def _logit(p: np.ndarray) -> np.ndarray:
+    p = np.clip(p, 1e-6, 1 - 1e-6)
+    return np.log(p / (1 - p))
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1 / (1 + np.exp(-x))
+
+
+def standings_from_results(
+    played: pd.DataFrame,
+    teams: List[str],
+    conference_of: Dict[str, str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Victorias totales y de conferencia a partir de los partidos ya jugados.
+
+    Args:
+        played: Partidos jugados (HOME_TEAM_NAME, AWAY_TEAM_NAME, HOME_WL)
+        teams: Orden de equipos del simulador
+        conference_of: Conferencia de cada equipo
+
+    Returns:
+        (victorias, victorias de conferencia) alineados con `teams`
+    """
+    played = played[played['HOME_TEAM_NAME'].isin(conference_of) & played['AWAY_TEAM_NAME'].isin(conference_of)]
+    winners = np.where(played['HOME_WL'].values == 1, played['HOME_TEAM_NAME'].values, played['AWAY_TEAM_NAME'].values)
+    same_conf = (played['HOME_TEAM_NAME'].map(conference_of).values
+                 == played['AWAY_TEAM_NAME'].map(conference_of).values)
+
+    wins = pd.Series(winners).value_counts()
+    conf_wins = pd.Series(winners[same_conf]).value_counts()
+    return (wins.reindex(teams, fill_value=0).values.astype(np.float32),
+            conf_wins.reindex(teams, fill_value=0).values.astype(np.float32))
+
+
+def _simulate_chunk(task: Dict) -> Dict[str, np.ndarray]:
+    """
+    Simula un bloque de temporadas completas y devuelve conteos por equipo.
+
+    Función de módulo para poder repartir bloques en un pool de procesos.
+    """
+    rng = np.random.default_rng(task['seed'])
+    n_sims = task['n_sims']
+    home_idx, away_idx = task['home_idx'], task['away_idx']
+    proba, pair_proba = task['proba'], task['pair_proba']
+    n_teams = pair_proba.shape[0]
+    n_games = len(home_idx)
+    rows = np.arange(n_sims)
+
+    # Temporada regular: matriz (simulaciones x partidos) de victorias locales
+    if task['update_elo'] and n_games:
+        # Layout partidos x simulaciones: cada paso del bucle lee filas contiguas
+        uniforms = rng.random((n_games, n_sims), dtype=np.float32)
+        outcomes = np.empty((n_games, n_sims), dtype=np.float32)
+        team_delta = np.zeros((n_teams, n_sims), dtype=np.float32)
+        base_logit = _logit(proba).astype(np.float32)
+        scale, k = np.float32(ELO_SCALE), np.float32(task['elo_k'])
+        for game in range(n_games):
+            home, away = home_idx[game], away_idx[game]
+            p_game = _sigmoid(base_logit[game] + (team_delta[home] - team_delta[away]) * scale)
+            home_won = uniforms[game] < p_game
+            outcomes[game] = home_won
+            change = k * (home_won - p_game)
+            team_delta[home] += change
+            team_delta[away] -= change
+        outcomes = outcomes.T
+        elo_delta = np.ascontiguousarray(team_delta.T)
+    else:
+        outcomes = (rng.random((n_sims, n_games), dtype=np.float32) < proba).astype(np.float32)
+        elo_delta = None
+
+    # Standings con matrices de incidencia (partidos x equipos)
+    home_inc = np.zeros((n_games, n_teams), dtype=np.float32)
+    away_inc = np.zeros((n_games, n_teams), dtype=np.float32)
+    home_inc[np.arange(n_games), home_idx] = 1
+    away_inc[np.arange(n_games), away_idx] = 1
+    conf_mask = task['same_conf'][:, None].astype(np.float32)
+
+    wins = task['wins'] + outcomes @ (home_inc - away_inc) + away_inc.sum(axis=0)
+    conf_wins = (task['conf_wins'] + outcomes @ ((home_inc - away_inc) * conf_mask)
+                 + (away_inc * conf_mask).sum(axis=0))
+
+    # Desempate: victorias, victorias de conferencia y sorteo
+    rank_key = wins * 1000 + conf_wins + rng.random((n_sims, n_teams), dtype=np.float32) * 0.5
+
+    def game_proba(home: np.ndarray, away: np.ndarray) -> np.ndarray:
+        p = pair_proba[home, away]
+        if elo_delta is not None:
+            p = _sigmoid(_logit(p) + (elo_delta[rows, home] - elo_delta[rows, away]) * ELO_SCALE)
+        return p
+
+    def play_game(home: np.ndarray, away: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        home_won = rng.random(n_sims) < game_proba(home, away)
+        return np.where(home_won, home, away), np.where(home_won, away, home)
+
+    def play_series(team_a: np.ndarray, team_b: np.ndarray) -> np.ndarray:
+        # Factor cancha para el mejor récord; ganar 4 de 7 equivale a ganar
+        # la mayoría de los 7 partidos jugados todos
+        a_high = rank_key[rows, team_a] >= rank_key[rows, team_b]
+        high, low = np.where(a_high, team_a, team_b), np.where(a_high, team_b, team_a)
+        p_high_home = game_proba(high, low)
+        p_high_away = 1 - game_proba(low, high)
+        p_games = np.where(SERIES_HOME_PATTERN, p_high_home[:, None], p_high_away[:, None])
+        high_won = (rng.random((n_sims, 7)) < p_games).sum(axis=1) >= 4
+        return np.where(high_won, high, low)
+
+    seed_counts = np.zeros((n_teams, task['max_seeds']), dtype=np.int64)
+    playoffs = np.zeros(n_teams, dtype=np.int64)
+    play_in = np.zeros(n_teams, dtype=np.int64)
+    round_counts = {name: np.zeros(n_teams, dtype=np.int64) for name in ROUNDS}
+
+    def count(target: np.ndarray, teams: np.ndarray):
+        target += np.bincount(teams.ravel(), minlength=n_teams)
+
+    conf_champions = []
+    for conf_idx in task['conference_indices']:
+        order = np.argsort(-rank_key[:, conf_idx], axis=1)
+        seeds = conf_idx[order]
+        for position in range(seeds.shape[1]):
+            seed_counts[:, position] += np.bincount(seeds[:, position], minlength=n_teams)
+
+        bracket = seeds[:, :8].copy()
+        if task['play_in']:
+            count(play_in, seeds[:, 6:10])
+            winner_a, loser_a = play_game(seeds[:, 6], seeds[:, 7])
+            winner_b, _ = play_game(seeds[:, 8], seeds[:, 9])
+            winner_c, _ = play_game(loser_a, winner_b)
+            bracket[:, 6], bracket[:, 7] = winner_a, winner_c
+        count(playoffs, bracket)
+
+        alive = [play_series(bracket[:, a], bracket[:, b]) for a, b in FIRST_ROUND]
+        count(round_counts['p_conf_semis'], np.stack(alive, axis=1))
+        alive = [play_series(alive[0], alive[1]), play_series(alive[2], alive[3])]
+        count(round_counts['p_conf_finals'], np.stack(alive, axis=1))
+        champion = play_series(alive[0], alive[1])
+        count(round_counts['p_finals'], champion)
+        conf_champions.append(champion)
+
+    if len(conf_champions) == 2:
+        count(round_counts['p_champion'], play_series(*conf_champions))
+
+    return {
+        'wins_sum': wins.sum(axis=0, dtype=np.float64),
+        'seed_counts': seed_counts,
+        'playoffs': playoffs,
+        'play_in': play_in,
+        **round_counts,
+    }
+
+
+class SeasonSimulator:
+    """
+    Simulador Monte Carlo del resto de temporada, play-in y playoffs.
+
+    Los resultados de la temporada regular se muestrean de una vez como una
+    matriz (simulaciones x partidos) a partir de las probabilidades del
+    modelo. Opcionalmente, cada camino actualiza su propio ELO y ajusta el
+    logit de los partidos siguientes. Las clasificaciones salen de productos
+    con matrices de incidencia y las series de playoffs se resuelven en
+    bloque para todas las simulaciones.
+    """
+
+    def __init__(
+        self,
+        conferences: Optional[Dict[str, List[str]]] = None,
+        n_simulations: int = 10000,
+        chunk_size: int = 10000,
+        update_elo: bool = False,
+        elo_k: float = 20.0,
+        play_in: bool = True,
+        n_workers: int = 1,
+        seed: int = 42
+    ):
+        """
+        Args:
+            conferences: Equipos por conferencia (default: NBA_CONFERENCES)
+            n_simulations: Número de temporadas simuladas
+            chunk_size: Simulaciones por bloque (acota la memoria)
+            update_elo: Actualizar el ELO dentro de cada simulación
+            elo_k: Factor K de la actualización de ELO
+            play_in: Jugar el torneo play-in (puestos 7-10)
+            n_workers: Procesos para repartir bloques (1 = secuencial)
+            seed: Semilla aleatoria
+        """
+        self.conferences = conferences or NBA_CONFERENCES
+        self.teams = [team for teams in self.conferences.values() for team in teams]
+        self.conference_of = {team: conf for conf, teams in self.conferences.items() for team in teams}
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        self.n_simulations = n_simulations
+        self.chunk_size = chunk_size
+        self.update_elo = update_elo
+        self.elo_k = elo_k
+        self.play_in = play_in
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.seed = seed
+
+        min_teams = 10 if play_in else 8
+        for conf, teams in self.conferences.items():
+            if len(teams) < min_teams:
+                raise ValueError(f"La conferencia {conf} necesita al menos {min_teams} equipos")
+
+    def pair_matrix(self, pair_predictions: pd.DataFrame) -> np.ndarray:
+        """
+        Matriz (equipos x equipos) de probabilidad de victoria del local.
+
+        Args:
+            pair_predictions: Salida de `NBAPredictor.predict_matchups` para
+                todos los pares (home_team, away_team, home_win_probability)
+        """
+        matrix = np.full((len(self.teams), len(self.teams)), 0.5)
+        home = pair_predictions['home_team'].map(self.team_index)
+        away = pair_predictions['away_team'].map(self.team_index)
+        valid = home.notna() & away.notna()
+        matrix[home[valid].astype(int), away[valid].astype(int)] = \
+            pair_predictions.loc[valid, 'home_win_probability'].values
+        return matrix
+
+    def run(
+        self,
+        schedule: pd.DataFrame,
+        win_proba: np.ndarray,
+        pair_proba: np.ndarray,
+        played: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        Simula el resto de la temporada y los playoffs.
+
+        Args:
+            schedule: Partidos pendientes en orden cronológico
+                (HOME_TEAM_NAME, AWAY_TEAM_NAME)
+            win_proba: Probabilidad de victoria local de cada partido pendiente
+            pair_proba: Matriz de `pair_matrix` para play-in y playoffs
+            played: Partidos ya jugados de la temporada (para el récord actual)
+
+        Returns:
+            DataFrame con probabilidades por equipo
+        """
+        win_proba = np.asarray(win_proba, dtype=np.float32)
+        in_league = (schedule['HOME_TEAM_NAME'].isin(self.team_index)
+                     & schedule['AWAY_TEAM_NAME'].isin(self.team_index)).values
+        if not in_league.all():
+            print(f"⚠️  {(~in_league).sum()} partidos con equipos fuera de las conferencias (ignorados)")
+        schedule, win_proba = schedule[in_league], win_proba[in_league]
+
+        home_idx = schedule['HOME_TEAM_NAME'].map(self.team_index).values.astype(np.int64)
+        away_idx = schedule['AWAY_TEAM_NAME'].map(self.team_index).values.astype(np.int64)
+
+        if played is not None and len(played):
+            wins, conf_wins = standings_from_results(played, self.teams, self.conference_of)
+        else:
+            wins = conf_wins = np.zeros(len(self.teams), dtype=np.float32)
+
+        base_task = {
+            'home_idx': home_idx,
+            'away_idx': away_idx,
+            'proba': win_proba,
+            'pair_proba': np.asarray(pair_proba, dtype=np.float64),
+            'same_conf': np.array([self.conference_of[h] == self.conference_of[a]
+                                   for h, a in zip(schedule['HOME_TEAM_NAME'], schedule['AWAY_TEAM_NAME'])],
+                                  dtype=bool),
+            'wins': wins,
+            'conf_wins': conf_wins,
+            'conference_indices': [np.array([self.team_index[t] for t in teams])
+                                   for teams in self.conferences.values()],
+            'max_seeds': max(len(teams) for teams in self.conferences.values()),
+            'update_elo': self.update_elo,
+            'elo_k': self.elo_k,
+            'play_in': self.play_in,
+        }
+
+        # Un bloque por semilla hija: resultados idénticos con o sin pool
+        sizes = [self.chunk_size] * (self.n_simulations // self.chunk_size)
+        if self.n_simulations % self.chunk_size:
+            sizes.append(self.n_simulations % self.chunk_size)
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        tasks = [{**base_task, 'n_sims': size, 'seed': seed} for size, seed in zip(sizes, seeds)]
+
+        print(f"🎲 Simulando {self.n_simulations:,} temporadas ({len(schedule)} partidos pendientes, "
+              f"{len(tasks)} bloques, {min(self.n_workers, len(tasks))} procesos)")
+
+        if self.n_workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.n_workers, len(tasks))) as executor:
+                results = list(executor.map(_simulate_chunk, tasks))
+        else:
+            results = [_simulate_chunk(task) for task in tasks]
+
+        totals = {key: sum(result[key] for result in results) for key in results[0]}
+        return self._summarize(totals, wins)
+
+    def _summarize(self, totals: Dict[str, np.ndarray], current_wins: np.ndarray) -> pd.DataFrame:
+        """Convierte los conteos agregados en probabilidades por equipo."""
+        n = self.n_simulations
+        summary = pd.DataFrame({
+            'team': self.teams,
+            'conference': [self.conference_of[team] for team in self.teams],
+            'current_wins': current_wins.astype(int),
+            'mean_wins': totals['wins_sum'] / n,
+            'p_top6': totals['seed_counts'][:, :6].sum(axis=1) / n,
+            'p_play_in': totals['play_in'] / n,
+            'p_playoffs': totals['playoffs'] / n,
+        })
+        for name in ROUNDS:
+            summary[name] = totals[name] / n
+        for position in range(totals['seed_counts'].shape[1]):
+            summary[f'seed_{position + 1}'] = totals['seed_counts'][:, position] / n
+
+        return summary.sort_values(['conference', 'mean_wins'], ascending=[True, False]).reset_index(drop=True)
@@ -3,19 +3,27 @@ import sys
 sys.path.insert(0, '.')
 
 from src.models.nba_predictor import NBAPredictor
+from src.models.streaming import train_streaming
 import pandas as pd
 
+DATA_PATH = 'data/processed/games_with_features.parquet'
+
 print("=" * 70)
 print("🚀 ENTRENAMIENTO MEJORADO - XGBoost + Features Avanzadas")
 print("=" * 70)
 
-# Cargar datos
-df = pd.read_parquet('data/processed/games_with_features.parquet')
-print(f"\n📊 Datos cargados: {len(df)} partidos con {df.shape[1]} features")
+if '--streaming' in sys.argv:
+    # Lectura por lotes: la memoria no crece con el histórico
+    print(f"\n📊 Leyendo por lotes: {DATA_PATH}")
+    predictor, metrics = train_streaming(DATA_PATH, test_size=0.2, random_state=42)
+else:
+    # Cargar datos
+    df = pd.read_parquet(DATA_PATH)
+    print(f"\n📊 Datos cargados: {len(df)} partidos con {df.shape[1]} features")
 
-# Entrenar
-predictor = NBAPredictor()
-metrics = predictor.train(df, test_size=0.2, random_state=42)
+    # Entrenar
+    predictor = NBAPredictor()
+    metrics = predictor.train(df, test_size=0.2, random_state=42)
 
 # Mostrar resultados
 print("\n" + "=" * 70)